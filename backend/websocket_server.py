@@ -1,14 +1,26 @@
 # JARVIS WebSocket Server - State Broadcaster
 # Sends visual states to Three.js frontend
+#
+# Modes:
+#   python backend/websocket_server.py                       -> demo state cycle
+#   python backend/websocket_server.py --replay brain_events.log [--speed 4] [--loop]
+#       Re-broadcasts a recorded event log to any number of clients, at original
+#       timing or N x speed (--speed 0 = as fast as possible), and reports send
+#       throughput and per-client lag.
 
+import argparse
 import asyncio
 import websockets # type: ignore
 import json
 import time
+from collections import deque
 
 # Connected clients
 connected_clients = set()
 
+# Replay mode: client -> ReplayClient
+replay_clients = {}
+
 async def handler(websocket):
     """Handle WebSocket connection"""
     # 💎 Extra Professional Improvement: Enforce Single Client
@@ -77,14 +89,158 @@ async def demo_state_cycle():
             await broadcast_state("RESPONDING", audio)
             await asyncio.sleep(0.1)
 
-async def main():
+# ====================================================================
+# REPLAY MODE
+# ====================================================================
+
+def load_event_log(path):
+    """
+    Read a brain_events.log (one JSON event per line).
+    Returns [(timestamp, message)] with the original line as the wire message,
+    so replayed traffic is byte-identical to what the brain sent.
+    """
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(event, dict) and "timestamp" in event:
+                events.append((float(event["timestamp"]), line))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+class ReplayClient:
+    """Per-client send queue, so one slow renderer never delays the others."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.queue = asyncio.Queue()
+        self.sent = 0
+        self.bytes_sent = 0
+        self.lag_ms = deque(maxlen=2000)  # send completion - scheduled time
+        self.task = asyncio.create_task(self._sender())
+
+    def enqueue(self, due, message):
+        self.queue.put_nowait((due, message))
+
+    async def _sender(self):
+        while True:
+            due, message = await self.queue.get()
+            await self.websocket.send(message)
+            self.lag_ms.append((time.perf_counter() - due) * 1000.0)
+            self.sent += 1
+            self.bytes_sent += len(message)
+
+
+async def replay_handler(websocket):
+    """Replay mode accepts any number of clients."""
+    client = ReplayClient(websocket)
+    replay_clients[websocket] = client
+    print(f"Client connected. Total clients: {len(replay_clients)}")
+    try:
+        async for _ in websocket:
+            pass  # Control messages are ignored during replay
+    except Exception:
+        pass
+    finally:
+        client.task.cancel()
+        replay_clients.pop(websocket, None)
+        print(f"Client disconnected. Total clients: {len(replay_clients)}")
+
+
+async def replay_events(events, speed=1.0, loop=False):
+    """Schedule every event at its original offset (divided by speed) for all clients."""
+    if not events:
+        print("[Replay] Event log is empty.")
+        return
+
+    span = events[-1][0] - events[0][0]
+    print(f"[Replay] {len(events)} events spanning {span:.1f}s at "
+          f"{'max' if speed <= 0 else f'{speed:g}x'} speed")
+
+    while True:
+        while not replay_clients:
+            await asyncio.sleep(0.1)
+
+        start = time.perf_counter()
+        t0 = events[0][0]
+        for timestamp, message in events:
+            due = start + ((timestamp - t0) / speed if speed > 0 else 0.0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif speed <= 0:
+                await asyncio.sleep(0)  # Let senders run
+            for client in list(replay_clients.values()):
+                client.enqueue(due, message)
+
+        elapsed = time.perf_counter() - start
+        print(f"[Replay] Pass complete: {len(events)} events in {elapsed:.2f}s "
+              f"({len(events) / max(elapsed, 1e-9):.0f} events/s scheduled)")
+        if not loop:
+            return
+
+
+async def report_replay_stats(interval=1.0):
+    """Print send throughput and per-client lag once per interval."""
+    last = {}
+    while True:
+        await asyncio.sleep(interval)
+        for websocket, client in list(replay_clients.items()):
+            prev_sent, prev_bytes = last.get(websocket, (0, 0))
+            rate = (client.sent - prev_sent) / interval
+            kbps = (client.bytes_sent - prev_bytes) / interval / 1024.0
+            last[websocket] = (client.sent, client.bytes_sent)
+            lags = list(client.lag_ms)
+            print(f"[Replay] client {id(websocket) & 0xffff:04x}: {rate:7.0f} msg/s "
+                  f"{kbps:8.1f} KiB/s | lag p50 {_percentile(lags, 50):6.2f}ms "
+                  f"p99 {_percentile(lags, 99):6.2f}ms max {max(lags, default=0.0):6.2f}ms "
+                  f"| backlog {client.queue.qsize()}")
+
+
+async def main_replay(path, speed, loop, host="localhost", port=8765):
+    events = load_event_log(path)
+    server = await websockets.serve(replay_handler, host, port)
+    print("=" * 60)
+    print("JARVIS WebSocket Replay Server Running")
+    print("=" * 60)
+    print(f"Server: ws://{host}:{port}")
+    print(f"Log: {path}")
+    print("=" * 60)
+
+    stats_task = asyncio.create_task(report_replay_stats())
+    await replay_events(events, speed=speed, loop=loop)
+
+    # Let queued messages drain, then print a final report
+    while any(c.queue.qsize() for c in replay_clients.values()):
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(1.1)
+    stats_task.cancel()
+    server.close()
+    await server.wait_closed()
+
+
+async def main(host="localhost", port=8765):
     """Start WebSocket server and demo"""
     # Start server
-    server = await websockets.serve(handler, "localhost", 8765)
+    server = await websockets.serve(handler, host, port)
     print("=" * 60)
     print("JARVIS WebSocket Server Running")
     print("=" * 60)
-    print(f"Server: ws://localhost:8765")
+    print(f"Server: ws://{host}:{port}")
     print("Waiting for visual frontend to connect...")
     print("=" * 60)
     
@@ -95,8 +251,19 @@ async def main():
     await asyncio.Future()  # Run forever
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JARVIS visual WebSocket server")
+    parser.add_argument("--replay", metavar="LOG", help="Replay a recorded brain_events.log")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed multiplier (0 = as fast as possible)")
+    parser.add_argument("--loop", action="store_true", help="Repeat the replay forever")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
     try:
-        asyncio.run(main())
+        if args.replay:
+            asyncio.run(main_replay(args.replay, args.speed, args.loop, port=args.port))
+        else:
+            asyncio.run(main(port=args.port))
     except KeyboardInterrupt:
         print("\n\nShutting down JARVIS server...")
         print("Goodbye.")
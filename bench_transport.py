@@ -0,0 +1,81 @@
+"""
+Benchmark brain -> UI delivery: WebSocket (localhost TCP) vs local transport
+(Unix domain socket / named pipe). Reports events/s and p50/p99 delivery latency.
+
+Usage: python bench_transport.py [events] [payload_bytes]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import websockets  # type: ignore
+from brain.event_bus import EventBus  # type: ignore
+from brain.ws_publisher import WebSocketPublisher  # type: ignore
+from brain.local_transport import open_local_connection, IS_WINDOWS  # type: ignore
+
+PORT = 8797
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+async def receive(client, count, latencies):
+    received = 0
+    async for message in client:
+        data = json.loads(message)
+        if data.get("type") != "BENCH":
+            continue
+        latencies.append((time.perf_counter() - data["payload"]["sent"]) * 1000.0)
+        received += 1
+        if received >= count:
+            return
+
+
+async def run_case(name, connect, bus, count, payload):
+    client = await connect()
+    await asyncio.sleep(0.1)  # Let the server register the client
+    latencies = []
+    receiver = asyncio.create_task(receive(client, count, latencies))
+
+    start = time.perf_counter()
+    for i in range(count):
+        await bus.emit("BENCH", {"sent": time.perf_counter(), "seq": i, "data": payload})
+    await receiver
+    elapsed = time.perf_counter() - start
+    await client.close()
+    await asyncio.sleep(0.1)  # Let the server see the disconnect
+
+    print(f"{name:<10} {count / elapsed:10.0f} events/s | "
+          f"p50 {percentile(latencies, 50):6.3f}ms  p99 {percentile(latencies, 99):6.3f}ms  "
+          f"max {max(latencies):6.3f}ms")
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    payload = "x" * (int(sys.argv[2]) if len(sys.argv) > 2 else 200)
+
+    address = r"\\.\pipe\jarvis_bench" if IS_WINDOWS else os.path.join(tempfile.gettempdir(), "jarvis_bench.sock")
+    publisher = WebSocketPublisher(port=PORT, transport="both", local_address=address)
+    await publisher.start_server()
+    bus = EventBus()
+    bus.subscribe(publisher.subscriber)
+
+    print(f"\n{count} events, {len(payload)}-byte payload")
+    print("-" * 72)
+    await run_case("websocket", lambda: websockets.connect(f"ws://localhost:{PORT}"), bus, count, payload)
+    await run_case("local", lambda: open_local_connection(address), bus, count, payload)
+
+    publisher.local_server.close()  # type: ignore
+    publisher.server.close()  # type: ignore
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark wake-word CPU cost: the offline template backend (MFCC + streaming DTW)
+vs Porcupine, each with the energy pre-gate on and off. Reports CPU seconds per
+hour of audio (process time, single thread) and detections; on the synthetic
+stream, detections are split into hits (planted keywords found) and false accepts
+(also per hour, against the enrollment target).
+
+Usage: python bench_wake.py [audio.wav] [--templates wake_templates.npz]
+                            [--access-key KEY] [--keyword JARVIS.ppn] [--seconds 120]
+
+Without a WAV, a synthetic stream (harmonic "speech" bursts over a noise floor,
+~40% speech) is used, and without --templates a synthetic keyword is enrolled,
+calibrated against random non-keyword words (drawn separately from the stream).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np  # type: ignore
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from brain.input.wake_word import WakeWordEngine, pvporcupine  # type: ignore
+from brain.input.template_wake import MAX_FALSE_WAKES_PER_HOUR, enroll  # type: ignore
+from brain.input.session_recorder import load_wav  # type: ignore
+
+SAMPLE_RATE = 16000
+CHUNK = 480  # The stream handler's 30ms blocks
+KEYWORD = [300, 900, 500, 1200, 400]
+
+
+def synth_word(rng, contour, dur=0.6, noise=300):
+    n = int(dur * SAMPLE_RATE)
+    f0 = np.interp(np.linspace(0, 1, n), np.linspace(0, 1, len(contour)), contour)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    x = sum(np.sin(k * phase) / k for k in range(1, 8)) * np.hanning(n) * 8000
+    return (x + rng.normal(0, noise, n)).astype(np.int16)
+
+
+def synth_other_word(rng):
+    """A non-keyword word: random pitch contour and length."""
+    return synth_word(rng, list(rng.uniform(150, 1300, 5)), dur=rng.uniform(0.4, 1.0))
+
+
+def synth_stream(rng, seconds):
+    """Returns (audio, [(start, end)] sample spans of the planted keywords)."""
+    parts, total, planted = [], 0, []
+    while total < seconds * SAMPLE_RATE:
+        gap = rng.normal(0, 40, int(rng.uniform(0.5, 2.0) * SAMPLE_RATE)).astype(np.int16)
+        keyword = rng.random() < 0.1
+        parts += [gap, synth_word(rng, KEYWORD, dur=rng.uniform(0.4, 1.0)) if keyword else synth_other_word(rng)]
+        total += len(gap)
+        if keyword and total + len(parts[-1]) <= seconds * SAMPLE_RATE:
+            planted.append((total, total + len(parts[-1])))
+        total += len(parts[-1])
+    return np.concatenate(parts)[:seconds * SAMPLE_RATE], planted
+
+
+def score(detections, planted, late=int(0.5 * SAMPLE_RATE)):
+    """(hits, false accepts): a detection inside a keyword (or up to `late` after it) is a hit."""
+    found = set()
+    false_accepts = 0
+    for at in detections:
+        match = [k for k, (start, end) in enumerate(planted) if start <= at <= end + late]
+        if match:
+            found.add(match[0])
+        else:
+            false_accepts += 1
+    return len(found), false_accepts
+
+
+def run(engine, audio):
+    detections = []  # Sample position of the block that fired
+    started = time.process_time()
+    for i in range(0, len(audio) - CHUNK + 1, CHUNK):
+        if engine.detect(audio[i:i + CHUNK]) >= 0:
+            detections.append(i + CHUNK)
+    cpu = time.process_time() - started
+    stats = engine.stats()
+    engine.close()
+    return cpu, detections, stats["gated_ratio"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("wav", nargs="?", help="16-bit WAV to run the detectors over")
+    parser.add_argument("--templates", help="enrolled template file (default: synthetic keyword)")
+    parser.add_argument("--access-key", default=os.environ.get("PICOVOICE_ACCESS_KEY"))
+    parser.add_argument("--keyword", default="brain/input/wake_word/JARVIS_en_windows_v4_0_0.ppn")
+    parser.add_argument("--seconds", type=int, default=120, help="length of the synthetic stream")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    audio, planted = (load_wav(args.wav, SAMPLE_RATE), None) if args.wav else synth_stream(rng, args.seconds)
+    hours = len(audio) / SAMPLE_RATE / 3600.0
+
+    templates = args.templates
+    if not templates:
+        templates = os.path.join(tempfile.mkdtemp(), "wake_templates.npz")
+        enroll_rng = np.random.default_rng(1)
+        enroll([synth_word(enroll_rng, KEYWORD, dur=d) for d in (0.55, 0.6, 0.65)], templates,
+               negatives=[synth_other_word(enroll_rng) for _ in range(100)])
+    os.environ["JARVIS_WAKE_TEMPLATES"] = templates
+
+    backends = ["template"]
+    if pvporcupine is not None and args.access_key and os.path.exists(args.keyword):
+        backends.append("porcupine")
+    else:
+        print("[WARN] Porcupine skipped (needs pvporcupine, --access-key and the keyword file)")
+
+    print(f"\nAudio: {len(audio) / SAMPLE_RATE:.0f}s" + (f", {len(planted)} keywords planted" if planted is not None else ""))
+    print(f"{'backend':<10} {'gate':<5} {'cpu s/hour':>11} {'% core':>7} {'gated':>6} {'detections':>11}"
+          + (f" {'hits':>7} {'false acc':>10} {'false/h':>8}" if planted is not None else ""))
+    for backend in backends:
+        for gate in (True, False):
+            engine = WakeWordEngine(args.access_key, [args.keyword], sensitivity=0.5,
+                                    backend=backend, gate_rms=0.004 if gate else 0.0)
+            if not engine.backends:
+                continue
+            cpu, detections, gated = run(engine, audio)
+            line = (f"{backend:<10} {'on' if gate else 'off':<5} {cpu / hours:>11.1f} "
+                    f"{cpu / hours / 36.0:>6.2f}% {gated:>6.0%} {len(detections):>11}")
+            if planted is not None:
+                hits, false_accepts = score(detections, planted)
+                line += f" {f'{hits}/{len(planted)}':>7} {false_accepts:>10} {false_accepts / hours:>8.0f}"
+            print(line)
+    if planted is not None:
+        print(f"(enrollment target: <= {MAX_FALSE_WAKES_PER_HOUR:.0f} false wakes/hour)")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ class ArbitrationEngine:
         self.context_scorer = ContextScorer(skill_registry)
         self.llm_interpreter = LLMSkillInterpreter()
 
-    def evaluate(self, text: str, context: dict) -> Decision:
+    def evaluate(self, text: str, context: dict, verbose: bool = True) -> Decision:
         # Collect real scores
         scores = self._collect_scores(text, context)
 
@@ -70,7 +70,8 @@ class ArbitrationEngine:
 
         else:
             # Low confidence -> Route to Groq conversation engine (LLM_FALLBACK)
-            print("[INFO] Deterministic score low. Routing to Groq Conversation Mode...")
+            if verbose:
+                print("[INFO] Deterministic score low. Routing to Groq Conversation Mode...")
             action = "LLM_FALLBACK"
             reason = "Deterministic score below threshold — routing to Groq"
 
@@ -1,24 +1,29 @@
+from brain.events import Event  # type: ignore
+
+
 class EventBus:
     def __init__(self):
         self._subscribers = []
 
     def subscribe(self, handler):
         """
-        Register an async callback function that accepts a single event dict.
+        Register an async callback function that accepts a single Event.
         """
         self._subscribers.append(handler)
 
-    async def emit(self, event_type: str, payload: dict):
+    async def emit(self, event_type, payload: dict = None):
         """
         Broadcast an event to all subscribers.
+        Accepts an event type + payload, or a ready-made Event (e.g. DecisionEvent).
         """
-        event = {
-            "type": event_type,
-            "payload": payload
-        }
-        
+        if isinstance(event_type, Event):
+            event = event_type
+        else:
+            event = Event(event_type, payload)
+
         for handler in self._subscribers:
             try:
                 await handler(event)
             except Exception as e:
                 print(f"Error in subscriber {handler}: {e}")
+        return event
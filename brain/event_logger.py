@@ -1,5 +1,3 @@
-import json
-import time
 from pathlib import Path
 
 class EventLogger:
@@ -7,21 +5,19 @@ class EventLogger:
     def __init__(self, log_file="brain_events.log"):
         # Ensure log file is in the project root or relative to execution
         self.log_path = Path(log_file)
+        self._file = None
 
-    async def handle_event(self, event: dict):
-        event["timestamp"] = time.time() # Ensure timestamp matches emission time if not present? 
-        # Actually orchestration doesn't add timestamp in emit payload usually.
-        # Let's add it here if missing, or better, EventBus could add it?
-        # User prompt says: 
-        # event = { "type": event_type, "payload": payload } in EventBus
-        # And Logger writes: json.dumps(event)
-        
-        # Let's add timestamp here for consistency with previous logger
-        if "timestamp" not in event:
-             event["timestamp"] = time.time()
-
+    async def handle_event(self, event):
+        # Events arrive stamped and serialized once; the WebSocket reuses the same bytes
         try:
-            with self.log_path.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(event) + "\n")
+            if self._file is None:
+                self._file = self.log_path.open("ab")
+            self._file.write(event.to_bytes() + b"\n")
+            self._file.flush()
         except Exception as e:
             print(f"Failed to log event: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,111 @@
+import heapq
+import json
+import time
+import uuid
+from contextvars import ContextVar
+from operator import itemgetter
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# DECISION events carry only the strongest skills unless asked otherwise
+DEFAULT_TOP_K = 5
+
+_interaction_id = ContextVar("interaction_id", default=None)
+
+
+def new_interaction_id():
+    return uuid.uuid4().hex[:12]
+
+
+def current_interaction_id():
+    return _interaction_id.get()
+
+
+def set_interaction_id(interaction_id):
+    """Bind an interaction id to the current task. Returns a token for reset_interaction_id."""
+    return _interaction_id.set(interaction_id)
+
+
+def reset_interaction_id(token):
+    _interaction_id.reset(token)
+
+
+def dumps(obj) -> bytes:
+    """Compact JSON bytes; orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass  # Exotic payload value — let json stringify it
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def top_scores(scores, k=DEFAULT_TOP_K):
+    """Trim a skill -> score map to its k highest entries (None keeps everything)."""
+    if k is None or len(scores) <= k:
+        return dict(scores)
+    return dict(heapq.nlargest(k, scores.items(), key=itemgetter(1)))
+
+
+class Event:
+    """
+    A bus event. Stamped once at creation and serialized at most once;
+    the logger and every WebSocket client share the cached bytes.
+    """
+    __slots__ = ("type", "payload", "timestamp", "monotonic", "interaction_id", "_bytes", "_text")
+
+    def __init__(self, event_type, payload=None, interaction_id=None):
+        self.type = event_type
+        self.payload = payload if payload is not None else {}
+        self.timestamp = time.time()
+        self.monotonic = time.monotonic()
+        self.interaction_id = interaction_id if interaction_id is not None else _interaction_id.get()
+        self._bytes = None
+        self._text = None
+
+    def to_dict(self):
+        return {
+            "type": self.type,
+            "payload": self.payload,
+            "timestamp": self.timestamp,
+            "t_mono": self.monotonic,
+            "interaction_id": self.interaction_id,
+        }
+
+    def to_bytes(self) -> bytes:
+        if self._bytes is None:
+            self._bytes = dumps(self.to_dict())
+        return self._bytes
+
+    def to_text(self) -> str:
+        if self._text is None:
+            self._text = self.to_bytes().decode("utf-8")
+        return self._text
+
+    def __getitem__(self, key):
+        """Dict-style access for subscribers written against the old event dicts."""
+        if key == "t_mono":
+            return self.monotonic
+        if key in ("type", "payload", "timestamp", "interaction_id"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __repr__(self):
+        return f"Event({self.type!r}, interaction={self.interaction_id})"
+
+
+class DecisionEvent(Event):
+    """DECISION event built from an arbitration Decision, with scores trimmed to top-k."""
+    __slots__ = ()
+
+    def __init__(self, text, decision, top_k=DEFAULT_TOP_K, interaction_id=None):
+        super().__init__("DECISION", {
+            "input": text,
+            "action": decision.action,
+            "skill": decision.skill,
+            "confidence": decision.confidence,
+            "margin": top_scores(decision.scores, top_k),
+        }, interaction_id)
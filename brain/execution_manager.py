@@ -1,6 +1,8 @@
 import asyncio
 import time
 
+from .tracing import tracer  # type: ignore
+
 class ExecutionResult:
     def __init__(self, success, output=None, error=None, duration=None):
         self.success = success
@@ -22,10 +24,11 @@ class ExecutionManager:
 
         try:
             # skills are async
-            result = await asyncio.wait_for(
-                skill.execute(text, context),
-                timeout=self.timeout
-            )
+            with tracer.span("execute", skill=getattr(skill, "name", None)):
+                result = await asyncio.wait_for(
+                    skill.execute(text, context),
+                    timeout=self.timeout
+                )
 
             duration = time.time() - start_time
 
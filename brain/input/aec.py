@@ -0,0 +1,172 @@
+import numpy as np  # type: ignore
+
+from brain.input.audio_bus import AudioBus  # type: ignore
+
+
+class EchoReference:
+    """
+    Playback reference for the echo canceller.
+
+    The TTS player pushes every block it hands to the sound card; the mic
+    callback pulls the same number of samples per captured block. Pull returns
+    zeros for a short tail after playback ends (the room is still ringing and
+    the filter's history must keep running), then None so idle capture skips
+    echo cancellation entirely.
+    """
+
+    def __init__(self, sample_rate=16000, block_size=480, seconds=2.0, tail_ms=300, max_lag_ms=120):
+        self.sample_rate = sample_rate
+        self.bus = AudioBus(sample_rate, block_size, seconds)
+        self.reader = self.bus.reader("aec")
+        self.tail_samples = int(tail_ms * sample_rate / 1000)
+        self.max_lag = int(max_lag_ms * sample_rate / 1000)
+        self._tail = 0
+        self._zeros = np.zeros(block_size, dtype=np.int16)
+
+    def push(self, block):
+        """Player side: int16 samples just written to the output device."""
+        if self._tail <= 0 and self.reader.available() == 0:
+            self.reader.seek_to_now()  # Playback (re)starting: align with the mic
+        self.bus.write(block)
+        self._tail = self.tail_samples
+
+    def pull(self, n):
+        """Mic side: the next n reference samples, zeros during the tail, or None when idle."""
+        available = self.reader.available()
+        if available > self.max_lag + n:
+            # The player ran ahead (device buffer filling): keep the delay bounded
+            self.reader.seek(self.bus.write_pos - self.max_lag)
+        block = self.reader.read_block(n)
+        if block is not None:
+            return block
+        if self._tail <= 0:
+            return None
+        self._tail -= n
+        if len(self._zeros) < n:
+            self._zeros = np.zeros(n, dtype=np.int16)
+        return self._zeros[:n]
+
+    @property
+    def active(self):
+        return self._tail > 0 or self.reader.available() > 0
+
+
+class EchoCanceller:
+    """
+    Partitioned-block frequency-domain adaptive filter (overlap-save MDF).
+
+    The reference (what the speaker played) is filtered by an adaptive estimate
+    of the speaker -> room -> mic path and subtracted from the mic signal. The
+    filter is split into `block`-sized partitions so a 250ms echo path costs a
+    handful of vectorised FFTs per 30ms block.
+
+    Double talk (the user speaking over the assistant) would make the filter
+    diverge, so two filters run side by side: a background filter that always
+    adapts and a foreground filter that produces the output. The foreground
+    takes the background's weights only while they cancel better, and a
+    background that has clearly diverged is reset from the foreground. A
+    Geigel detector additionally freezes adaptation on loud near-end speech.
+    """
+
+    def __init__(self, block=480, filter_ms=250, sample_rate=16000, mu=0.8, power_alpha=0.9,
+                 geigel=0.6, erle_alpha=0.05):
+        self.block = block
+        self.fft_size = 2 * block
+        self.bins = block + 1
+        self.partitions = max(1, -(-int(filter_ms * sample_rate / 1000) // block))
+        self.mu = mu
+        self.power_alpha = power_alpha
+        self.geigel = geigel
+        self.erle_alpha = erle_alpha
+
+        self.W = np.zeros((self.partitions, self.bins), dtype=np.complex64)  # Background (adapting) filter
+        self.Wf = np.zeros((self.partitions, self.bins), dtype=np.complex64)  # Foreground (output) filter
+        self._energy_b = 0.0  # Smoothed error energies of both filters
+        self._energy_f = 0.0
+        self.X = np.zeros((self.partitions, self.bins), dtype=np.complex64)  # Reference spectra, newest first
+        self.power = np.full(self.bins, 1e-6, dtype=np.float32)
+        self._ref = np.zeros(self.fft_size, dtype=np.float32)  # [previous block | current block]
+        self._err = np.zeros(self.fft_size, dtype=np.float32)  # [zeros | error]
+        self._ref_peak = np.zeros(self.partitions, dtype=np.float32)  # Per-block |ref| max over the filter span
+        self._out = np.zeros(block, dtype=np.int16)
+
+        # Diagnostics
+        self.blocks = 0
+        self.frozen_blocks = 0
+        self.near_end_block = -1  # Last block the Geigel detector flagged as near-end speech
+        self.erle_db = 0.0
+
+    def reset(self):
+        self.W[:] = 0
+        self.Wf[:] = 0
+        self.X[:] = 0
+        self._ref[:] = 0
+        self._ref_peak[:] = 0
+
+    def process(self, mic, ref):
+        """Cancel echo of `ref` in `mic` (int16 blocks of `block` samples). Returns int16."""
+        n = self.block
+        d = mic.astype(np.float32) * np.float32(1.0 / 32768.0)
+
+        # Slide the reference window and push its spectrum into the history
+        self._ref[:n] = self._ref[n:]
+        np.multiply(ref, np.float32(1.0 / 32768.0), out=self._ref[n:], casting="unsafe")
+        self.X[1:] = self.X[:-1]
+        self.X[0] = np.fft.rfft(self._ref)
+        self._ref_peak[1:] = self._ref_peak[:-1]
+        self._ref_peak[0] = np.max(np.abs(self._ref[n:]))
+
+        # Echo estimates: last n samples of the circular convolution (overlap-save)
+        Y = np.stack((np.einsum("pk,pk->k", self.W, self.X), np.einsum("pk,pk->k", self.Wf, self.X)))
+        y = np.fft.irfft(Y, self.fft_size, axis=1)[:, n:]
+        e_b = d - y[0]
+        e = d - y[1]
+
+        # Foreground / background arbitration on smoothed error energy
+        self._energy_b = 0.5 * self._energy_b + 0.5 * float(np.dot(e_b, e_b))
+        self._energy_f = 0.5 * self._energy_f + 0.5 * float(np.dot(e, e))
+        if self._energy_b < 0.8 * self._energy_f:
+            self.Wf[:] = self.W
+            e = e_b
+            self._energy_f = self._energy_b
+        elif self._energy_b > 4.0 * self._energy_f + 1e-6:
+            self.W[:] = self.Wf  # Background diverged (double talk): restart from foreground
+            self._energy_b = self._energy_f
+
+        # Adapt unless the near end is talking (Geigel: mic louder than any recent reference)
+        self.blocks += 1
+        if np.max(np.abs(d)) > self.geigel * np.max(self._ref_peak) + 1e-4 and self.blocks > self.partitions:
+            self.frozen_blocks += 1
+            self.near_end_block = self.blocks
+        else:
+            self._err[n:] = e_b
+            E = np.fft.rfft(self._err)
+            x0 = self.X[0]
+            self.power = self.power_alpha * self.power + (1.0 - self.power_alpha) * (x0.real ** 2 + x0.imag ** 2)
+            step = (self.mu / (self.partitions * self.power + 1e-6)).astype(np.float32)
+            G = np.conj(self.X) * (step * E)
+            # Gradient constraint: keep each partition a causal, block-length filter
+            g = np.fft.irfft(G, self.fft_size, axis=1)
+            g[:, n:] = 0
+            self.W += np.fft.rfft(g, axis=1).astype(np.complex64)
+
+        # Echo return loss enhancement (smoothed, for diagnostics)
+        ed = float(np.dot(d, d)) + 1e-10
+        ee = float(np.dot(e, e)) + 1e-10
+        self.erle_db += self.erle_alpha * (10.0 * np.log10(ed / ee) - self.erle_db)
+
+        np.clip(e * 32768.0, -32768, 32767, out=e)
+        self._out[:] = e
+        return self._out
+
+    def near_end_recent(self, blocks=3):
+        """Near-end speech (louder than the echo could be) within the last `blocks` blocks."""
+        return self.near_end_block >= 0 and self.blocks - self.near_end_block < blocks
+
+    def stats(self):
+        return {
+            "partitions": self.partitions,
+            "blocks": self.blocks,
+            "frozen_ratio": self.frozen_blocks / self.blocks if self.blocks else 0.0,
+            "erle_db": round(self.erle_db, 1),
+        }
@@ -0,0 +1,75 @@
+import numpy as np  # type: ignore
+
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+class AudioAccumulator:
+    """
+    Preallocated, growable float32 buffer for one utterance.
+
+    int16 blocks are scaled straight into the buffer (no per-block temporaries),
+    capacity doubles when needed (O(n) total copying) up to `max_seconds`, and
+    view() returns a zero-copy slice for partial and final decoding.
+    """
+
+    def __init__(self, sample_rate=16000, initial_seconds=4.0, max_seconds=12.0):
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_seconds * sample_rate)
+        self._initial = min(int(initial_seconds * sample_rate), self.max_samples)
+        self._buf = np.empty(self._initial, dtype=np.float32)
+        self._len = 0
+        self._exported = False  # A view is (possibly) still in use by a decoder
+        self.blocks = 0  # Blocks actually written (not dropped at the cap)
+        self.dropped = 0  # Samples discarded past max_seconds
+        self._appended = 0  # Samples written by the last append
+
+    def __len__(self):
+        return self._len
+
+    def append_int16(self, chunk):
+        """Append an int16 block, converting to float32 [-1, 1) in place."""
+        n = len(chunk)
+        end = self._len + n
+        if end > len(self._buf):
+            self._grow(end)
+            if end > len(self._buf):
+                n = len(self._buf) - self._len
+                self.dropped += end - len(self._buf)
+                end = len(self._buf)
+        n = max(0, n)
+        if n > 0:
+            np.multiply(chunk[:n], _INT16_SCALE, out=self._buf[self._len:end], casting="unsafe")
+            self.blocks += 1
+        self._len = end
+        self._appended = n
+
+    def _grow(self, needed):
+        capacity = min(max(needed, 2 * len(self._buf)), self.max_samples)
+        if capacity <= len(self._buf):
+            return
+        grown = np.empty(capacity, dtype=np.float32)
+        grown[:self._len] = self._buf[:self._len]
+        self._buf = grown
+
+    def view(self):
+        """Zero-copy view of the utterance so far. Valid until the next reset()."""
+        self._exported = True
+        return self._buf[:self._len]
+
+    def tail(self, n):
+        """
+        Zero-copy view of the last n samples written by the latest append (the block
+        just appended); empty when that append was dropped at max_seconds.
+        """
+        return self._buf[self._len - min(n, self._appended):self._len]
+
+    def reset(self):
+        """Start a new utterance, reusing the allocation when no view is outstanding."""
+        if self._exported or len(self._buf) > self._initial:
+            # Decodes may still hold views of the old buffer; never overwrite them
+            self._buf = np.empty(self._initial, dtype=np.float32)
+        self._exported = False
+        self._len = 0
+        self.blocks = 0
+        self.dropped = 0
+        self._appended = 0
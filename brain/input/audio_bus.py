@@ -0,0 +1,130 @@
+import numpy as np  # type: ignore
+
+
+class AudioBus:
+    """
+    Single-writer, multi-reader ring of int16 samples.
+
+    The audio callback copies each block into a preallocated ring and then
+    publishes the running sample counter (`write_pos`). Each consumer (wake word,
+    VAD, STT, recorder, visualizer) owns a BusReader with its own cursor, so
+    readers never contend with each other or with the writer. A reader that falls
+    more than `capacity` samples behind has lost audio; it is detected on read,
+    counted, and skipped forward instead of the bus growing without limit.
+    """
+
+    def __init__(self, sample_rate=16000, block_size=480, seconds=4.0):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        blocks = max(2, int(seconds * sample_rate) // block_size)
+        self.capacity = blocks * block_size  # Block-aligned: aligned reads never wrap
+        self._ring = np.zeros(self.capacity, dtype=np.int16)
+        self.write_pos = 0  # Total samples ever written (monotonic)
+        self.readers = {}
+
+    def write(self, block):
+        """Writer side (audio thread). Copies one (frames,) or (frames, 1) int16 block."""
+        n = len(block)
+        start = self.write_pos % self.capacity
+        end = start + n
+        if block.ndim > 1:
+            block = block[:, 0]
+        if end <= self.capacity:
+            self._ring[start:end] = block
+        else:
+            split = self.capacity - start
+            self._ring[start:] = block[:split]
+            self._ring[:end - self.capacity] = block[split:]
+        # Publish only after the samples are in place
+        self.write_pos += n
+
+    def reader(self, name, from_now=True):
+        """Create (or return) the named consumer cursor."""
+        reader = self.readers.get(name)
+        if reader is None:
+            reader = BusReader(self, name, from_now)
+            self.readers[name] = reader
+        return reader
+
+    def stats(self):
+        return {name: r.stats() for name, r in self.readers.items()}
+
+
+class BusReader:
+    """One consumer's cursor into an AudioBus."""
+
+    def __init__(self, bus, name, from_now=True):
+        self.bus = bus
+        self.name = name
+        self.cursor = bus.write_pos if from_now else max(0, bus.write_pos - bus.capacity + bus.block_size)
+        self.overruns = 0
+        self.lost_samples = 0
+        self._scratch = np.empty(bus.block_size, dtype=np.int16)
+
+    def available(self):
+        return self.bus.write_pos - self.cursor
+
+    def seek_to_now(self):
+        """Drop everything buffered; the next read returns only fresh audio."""
+        self.cursor = self.bus.write_pos
+
+    def seek(self, position):
+        """Move to an absolute sample position, clamped to what the ring still holds."""
+        oldest = max(0, self.bus.write_pos - self.bus.capacity + self.bus.block_size)
+        self.cursor = min(max(position, oldest), self.bus.write_pos)
+
+    def _check_overrun(self, write_pos):
+        # The block after write_pos may be mid-write, so only capacity - 1 block is safe
+        limit = self.bus.capacity - self.bus.block_size
+        behind = write_pos - self.cursor
+        if behind > limit:
+            lost = behind - limit + self.bus.block_size  # Keep one block of headroom
+            self.cursor += lost
+            self.overruns += 1
+            self.lost_samples += lost
+            print(f"[AUDIO] Reader '{self.name}' overrun: dropped {lost} samples")
+
+    def read_block(self, n=None):
+        """
+        Return the next `n` samples (default: one block), or None if not yet written.
+        Aligned reads are zero-copy views into the ring, valid until the writer laps
+        them (`capacity` samples later); consumers copy what they keep.
+        """
+        n = n or self.bus.block_size
+        write_pos = self.bus.write_pos
+        self._check_overrun(write_pos)
+        if write_pos - self.cursor < n:
+            return None
+
+        start = self.cursor % self.bus.capacity
+        end = start + n
+        if end <= self.bus.capacity:
+            block = self.bus._ring[start:end]
+        else:
+            if len(self._scratch) < n:
+                self._scratch = np.empty(n, dtype=np.int16)
+            split = self.bus.capacity - start
+            block = self._scratch[:n]
+            block[:split] = self.bus._ring[start:]
+            block[split:] = self.bus._ring[:end - self.bus.capacity]
+        self.cursor += n
+        return block
+
+    def read_available(self):
+        """Copy out everything buffered (possibly empty) as one contiguous array."""
+        write_pos = self.bus.write_pos
+        self._check_overrun(write_pos)
+        n = write_pos - self.cursor
+        if n <= 0:
+            return self.bus._ring[:0]
+        start = self.cursor % self.bus.capacity
+        end = start + n
+        if end <= self.bus.capacity:
+            data = self.bus._ring[start:end].copy()
+        else:
+            data = np.concatenate((self.bus._ring[start:], self.bus._ring[:end - self.bus.capacity]))
+        self.cursor = write_pos
+        return data
+
+    def stats(self):
+        return {"lag": self.available(), "overruns": self.overruns, "lost_samples": self.lost_samples}
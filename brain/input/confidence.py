@@ -0,0 +1,141 @@
+import math
+import time
+
+from brain.tracing import tracer  # type: ignore
+
+ESCALATION_BEAM = 5
+MIN_AVG_LOGPROB = -0.6   # Below this the greedy decode is likely wrong
+MIN_WORD_PROB = 0.3      # One very unsure word is enough to misroute a short command
+MAX_NO_SPEECH = 0.6      # Above this the "speech" is probably noise: a wider beam won't help
+
+
+class TranscriptResult:
+    """
+    A transcript plus the decoder's confidence in it.
+
+    `avg_logprob` is Whisper's per-token average (token-weighted across segments),
+    `no_speech_prob` the highest segment value and `min_word_prob` the least
+    certain word. None means "not measured" (e.g. words committed by streaming
+    agreement, which two decodes already agreed on) and counts as confident.
+    """
+    __slots__ = ("text", "words", "avg_logprob", "no_speech_prob", "min_word_prob", "beam_size")
+
+    def __init__(self, text="", words=None, avg_logprob=None, no_speech_prob=None,
+                 min_word_prob=None, beam_size=1):
+        self.text = text
+        self.words = words or []  # [(start_sec, end_sec, word)]
+        self.avg_logprob = avg_logprob
+        self.no_speech_prob = no_speech_prob
+        self.min_word_prob = min_word_prob
+        self.beam_size = beam_size
+
+    @classmethod
+    def from_segments(cls, segments, text, beam_size=1):
+        """Aggregate faster-whisper segments (already consumed into a list)."""
+        words, probs = [], []
+        logprob_sum, tokens = 0.0, 0
+        no_speech = None
+        for s in segments:
+            n = max(1, len(getattr(s, "tokens", None) or ()))
+            logprob_sum += s.avg_logprob * n
+            tokens += n
+            no_speech = s.no_speech_prob if no_speech is None else max(no_speech, s.no_speech_prob)
+            for w in s.words or []:
+                words.append((w.start, w.end, w.word))
+                probs.append(w.probability)
+        return cls(text, words,
+                   avg_logprob=logprob_sum / tokens if tokens else None,
+                   no_speech_prob=no_speech,
+                   min_word_prob=min(probs) if probs else None,
+                   beam_size=beam_size)
+
+    def to_wire(self):
+        """Every field as plain JSON-able values (STT server messages)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_wire(cls, data):
+        result = cls(**data)
+        result.words = [tuple(w) for w in result.words]
+        return result
+
+    @property
+    def confidence(self):
+        """0..1 summary (exp of the average token log-probability); 1.0 when unmeasured."""
+        return 1.0 if self.avg_logprob is None else math.exp(self.avg_logprob)
+
+    def is_low_confidence(self, min_avg_logprob=MIN_AVG_LOGPROB, min_word_prob=MIN_WORD_PROB,
+                          max_no_speech=MAX_NO_SPEECH):
+        if not self.text.strip():
+            return False
+        if self.no_speech_prob is not None and self.no_speech_prob > max_no_speech:
+            return False
+        if self.avg_logprob is not None and self.avg_logprob < min_avg_logprob:
+            return True
+        return self.min_word_prob is not None and self.min_word_prob < min_word_prob
+
+    def to_dict(self):
+        return {
+            "confidence": round(self.confidence, 3),
+            "avg_logprob": None if self.avg_logprob is None else round(self.avg_logprob, 3),
+            "no_speech_prob": None if self.no_speech_prob is None else round(self.no_speech_prob, 3),
+            "min_word_prob": None if self.min_word_prob is None else round(self.min_word_prob, 3),
+            "beam_size": self.beam_size,
+        }
+
+
+class BeamEscalator:
+    """
+    Second opinion for the final transcript.
+
+    The greedy (beam 1) decode stays the fast path. When it comes back unsure,
+    or its text lands in arbitration's CLARIFY band, the same utterance buffer
+    is decoded again with a wider beam on the STT scheduler, and the better of
+    the two transcripts is kept. Counters show how often that happens.
+    """
+
+    def __init__(self, whisper, stt, arbitration=None, beam_size=ESCALATION_BEAM):
+        self.whisper = whisper
+        self.stt = stt
+        self.arbitration = arbitration
+        self.beam_size = beam_size
+        self.stats = {"finals": 0, "escalated": 0, "low_confidence": 0, "clarify": 0,
+                      "adopted": 0, "escalation_ms": 0.0}
+
+    def _clarifies(self, text):
+        if self.arbitration is None or not text.strip():
+            return False
+        try:
+            return self.arbitration.evaluate(text, {}, verbose=False).action == "CLARIFY"
+        except Exception:
+            return False
+
+    async def refine(self, result, audio):
+        """Return `result`, or a wider-beam re-decode of `audio` when that is more trustworthy."""
+        self.stats["finals"] += 1
+        if result.is_low_confidence():
+            reason = "low_confidence"
+        elif self._clarifies(result.text):
+            reason = "clarify"
+        else:
+            return result
+
+        self.stats["escalated"] += 1
+        self.stats[reason] += 1
+        started = time.perf_counter()
+        with tracer.span("stt.escalate", reason=reason, beam_size=self.beam_size):
+            better = await self.stt.final(self.whisper.transcribe_detailed, audio, None, self.beam_size)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.stats["escalation_ms"] += elapsed_ms
+
+        adopt = better is not None and bool(better.text.strip()) and (
+            better.confidence > result.confidence
+            or (reason == "clarify" and not self._clarifies(better.text))
+        )
+        if adopt:
+            self.stats["adopted"] += 1
+        print(f"[STT] Escalated ({reason}) to beam {self.beam_size} in {elapsed_ms:.0f}ms: "
+              f"'{result.text}' ({result.confidence:.2f}) -> '{better.text if better else ''}' "
+              f"({better.confidence if better else 0.0:.2f}), {'adopted' if adopt else 'kept greedy'} "
+              f"[{self.stats['escalated']}/{self.stats['finals']} finals escalated]")
+        return better if adopt else result
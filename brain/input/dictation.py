@@ -0,0 +1,219 @@
+import asyncio
+import time
+from collections import deque
+
+import numpy as np  # type: ignore
+
+from brain.input.audio_buffer import AudioAccumulator  # type: ignore
+from brain.input.vad import VoiceActivityDetector, SPEECH_START, SPEECH_END  # type: ignore
+from brain.tracing import tracer  # type: ignore
+
+STOP_PHRASES = ("stop dictation", "end dictation", "finish dictation", "stop dictating")
+
+
+def is_stop_phrase(text):
+    lower = " ".join(text.lower().replace(".", " ").replace(",", " ").split())
+    return any(lower == p or lower.endswith(p) for p in STOP_PHRASES)
+
+
+class DictationSession:
+    """
+    Long-form dictation without the single-utterance limits.
+
+    A dedicated VAD (with a longer hangover, so sentence pauses end a segment but
+    word gaps don't) cuts continuous speech into segments of at most
+    `max_segment_sec`. Closed segments queue up while the decoder is busy and are
+    then decoded together in one batched Whisper pass, so a slow decode makes the
+    next batch bigger instead of building a backlog. Each segment's text goes to
+    `on_text` in order as soon as its batch finishes; audio is released once
+    decoded, so memory is bounded by one open segment plus `max_pending_sec`.
+    """
+
+    PREROLL_BLOCKS = 10  # Audio kept from before the VAD confirmed speech (~300ms)
+
+    def __init__(self, whisper, stt, on_text, sample_rate=16000, segment_silence_ms=700,
+                 max_segment_sec=25.0, min_segment_sec=0.4, batch_size=8, max_pending_sec=120.0):
+        self.whisper = whisper
+        self.stt = stt
+        self.on_text = on_text  # async callable(text)
+        self.sample_rate = sample_rate
+        self.min_segment = int(min_segment_sec * sample_rate)
+        self.batch_size = batch_size
+        self.max_pending = int(max_pending_sec * sample_rate)
+
+        self.vad = VoiceActivityDetector(sample_rate=sample_rate, hangover_ms=segment_silence_ms)
+        self.segment = AudioAccumulator(sample_rate, initial_seconds=4.0, max_seconds=max_segment_sec)
+        self._preroll = deque(maxlen=self.PREROLL_BLOCKS)
+        self.pending = deque()  # Closed segments (float32) waiting for a decode
+        self._pending_samples = 0
+        self._decoding = None  # Task of the batch in flight
+
+        self.stopped = False  # Stop phrase heard
+        self.last_speech = time.time()
+        self.stats = {"segments": 0, "batches": 0, "max_batch": 0, "dropped_sec": 0.0,
+                      "audio_sec": 0.0, "decode_sec": 0.0, "words": 0}
+
+    def feed(self, chunk):
+        """Consume one int16 block from the bus (event loop)."""
+        events = self.vad.process(chunk)
+        if SPEECH_START in events:
+            for block in self._preroll:
+                self.segment.append_int16(block)
+            self._preroll.clear()
+        if self.vad.in_speech or SPEECH_END in events:
+            self.segment.append_int16(chunk)
+            self.last_speech = time.time()
+            if SPEECH_END in events or len(self.segment) >= self.segment.max_samples:
+                self._close_segment()  # Sentence pause, or the decoder's 30s window is near
+        else:
+            self._preroll.append(chunk.copy())
+        self.pump()
+
+    def _close_segment(self):
+        if len(self.segment) >= self.min_segment:
+            audio = self.segment.view()  # reset() allocates anew: this view stays valid
+            self.pending.append(audio)
+            self._pending_samples += len(audio)
+            self.stats["segments"] += 1
+            while self._pending_samples > self.max_pending:
+                dropped = self.pending.popleft()
+                self._pending_samples -= len(dropped)
+                self.stats["dropped_sec"] += len(dropped) / self.sample_rate
+                print(f"[DICTATION] Decoder behind: dropped a {len(dropped) / self.sample_rate:.1f}s segment")
+        self.segment.reset()
+
+    def pump(self):
+        """Start a batched decode of the queued segments if the decoder is free."""
+        if self._decoding is None and self.pending:
+            batch = [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+            self._pending_samples -= sum(len(a) for a in batch)
+            self._decoding = asyncio.ensure_future(self._decode(batch))
+
+    async def _decode(self, batch):
+        try:
+            # One buffer, one clip per segment: the batched pipeline decodes them in parallel
+            audio = np.concatenate(batch)
+            clips, start = [], 0
+            for segment in batch:
+                clips.append((start / self.sample_rate, (start + len(segment)) / self.sample_rate))
+                start += len(segment)
+            started = time.perf_counter()
+            with tracer.span("dictation.batch", segments=len(batch), audio_sec=round(len(audio) / self.sample_rate, 2)):
+                texts = await self.stt.final(self.whisper.transcribe_batch, audio, clips, self.batch_size) or []
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            self.stats["audio_sec"] += len(audio) / self.sample_rate
+            self.stats["decode_sec"] += time.perf_counter() - started
+
+            for text in texts:
+                text = text.strip()
+                if not text or self.stopped:
+                    continue
+                if is_stop_phrase(text):
+                    self.stopped = True
+                    continue
+                self.stats["words"] += len(text.split())
+                await self.on_text(text)
+        except Exception as e:
+            print(f"[DICTATION] Decode error: {e}")
+        finally:
+            self._decoding = None
+            self.pump()
+
+    async def finish(self):
+        """Close the open segment and wait until everything queued is decoded and emitted."""
+        if len(self.segment):
+            self._close_segment()
+        self.pump()
+        while self._decoding is not None:
+            await self._decoding
+        return self.stats
+
+
+class LiveDictationSession(DictationSession):
+    """
+    Dictation that types while the user is still speaking.
+
+    Each segment streams through a StreamingTranscript; every partial hypothesis
+    is handed to `typer` (a LiveDictationTyper), which edits the screen text by
+    the minimal suffix diff. When the segment closes, the final pass settles its
+    text and the typer commits it. Segments are finalised one at a time (their
+    audio is mostly decoded already), and the next segment's partials wait until
+    the previous one is committed so edits never reach into settled text.
+    """
+
+    MIN_PARTIAL_SEC = 0.5
+
+    def __init__(self, whisper, stt, typer, on_text, **kwargs):
+        super().__init__(whisper, stt, on_text, **kwargs)
+        self.typer = typer
+        self.transcript = whisper.start_stream()
+        self._separator = ""  # A space before every segment but the first
+        self._typing = asyncio.Lock()  # Typer calls run in an executor: keep them ordered
+        self._partial_tasks = set()  # In-flight partial decodes (kept referenced until done)
+        self.stats.update(partials=0, keystrokes=0)
+
+    def feed(self, chunk):
+        super().feed(chunk)
+        if (self.vad.in_speech and not self.stopped and self._decoding is None and not self.pending
+                and len(self.segment) >= self.MIN_PARTIAL_SEC * self.sample_rate and self.stt.partial_due()):
+            task = asyncio.ensure_future(self._partial(self.transcript, self.segment.view()))
+            self._partial_tasks.add(task)
+            task.add_done_callback(self._partial_done)
+
+    def _partial_done(self, task):
+        self._partial_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[DICTATION] Partial failed: {task.exception()!r}")
+
+    async def _partial(self, transcript, audio):
+        text = await self.stt.partial(transcript.update, audio)
+        # Superseded, or the segment closed while decoding (its final pass takes over)
+        if not text or transcript is not self.transcript or self.stopped:
+            return
+        self.stats["partials"] += 1
+        await self._show(self._separator + text)
+
+    async def _show(self, text):
+        async with self._typing:
+            sent = await asyncio.get_running_loop().run_in_executor(None, self.typer.update, text)
+            self.stats["keystrokes"] += sent
+
+    def _close_segment(self):
+        if len(self.segment) >= self.min_segment:
+            self.pending.append((self.segment.view(), self.transcript))
+            self.stats["segments"] += 1
+        self.transcript = self.whisper.start_stream()
+        self.segment.reset()
+
+    def pump(self):
+        if self._decoding is None and self.pending:
+            audio, transcript = self.pending.popleft()
+            self._decoding = asyncio.ensure_future(self._finalize(audio, transcript))
+
+    async def _finalize(self, audio, transcript):
+        try:
+            started = time.perf_counter()
+            with tracer.span("dictation.segment", audio_sec=round(len(audio) / self.sample_rate, 2)):
+                text = (await self.stt.final(transcript.finish, audio) or "").strip()
+            self.stats["batches"] += 1
+            self.stats["audio_sec"] += len(audio) / self.sample_rate
+            self.stats["decode_sec"] += time.perf_counter() - started
+
+            if self.stopped or is_stop_phrase(text):
+                self.stopped = True
+                await self._show("")  # Erase a stop phrase typed by the partials
+            elif text:
+                await self._show(self._separator + text)
+                self._separator = " "
+                self.stats["words"] += len(text.split())
+                await self.on_text(text)
+            else:
+                await self._show("")  # Partials typed noise the final pass dropped
+            async with self._typing:
+                self.typer.commit()
+        except Exception as e:
+            print(f"[DICTATION] Decode error: {e}")
+        finally:
+            self._decoding = None
+            self.pump()
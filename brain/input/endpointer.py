@@ -0,0 +1,96 @@
+import re
+
+from brain.thresholds import DANGEROUS_SKILLS  # type: ignore
+
+COMPLETE = "complete"
+INCOMPLETE = "incomplete"
+NEUTRAL = "neutral"
+
+# A command can't end on these: articles, prepositions, conjunctions, possessives
+TRAILING_WORDS = {
+    "the", "a", "an", "to", "and", "or", "but", "of", "for", "in", "on", "at",
+    "with", "from", "into", "about", "like", "than", "as", "by", "my", "your", "some",
+    "um", "uh",
+}
+
+# Command verbs that still need an object ("open", "search for", "type")
+OPEN_VERBS = {
+    "open", "close", "launch", "start", "quit", "exit", "switch", "search",
+    "type", "dictate", "spell", "select", "play", "press", "click", "scroll", "move",
+    "turn", "set", "find", "look", "go", "show", "tell", "what's", "whats", "what",
+}
+
+_WORD = re.compile(r"[\w']+")
+
+
+class Endpointer:
+    """
+    Per-utterance end-of-turn policy on top of the VAD hangover.
+
+    Every partial transcript is classified:
+      - complete:   arbitration already resolves it to a (non-dangerous) skill
+                    → end the turn after `fast_ms` of silence
+      - incomplete: it ends on a function word or a bare command verb
+                    ("open the…") → wait up to `extended_ms`
+      - neutral:    anything else → `base_ms` (the old fixed window)
+    """
+
+    def __init__(self, arbitration=None, base_ms=300, fast_ms=150, extended_ms=800):
+        self.arbitration = arbitration
+        self.base_ms = base_ms
+        self.fast_ms = fast_ms
+        self.extended_ms = extended_ms
+        self.state = NEUTRAL
+        self.reason = ""
+        self.counts = {COMPLETE: 0, INCOMPLETE: 0, NEUTRAL: 0}  # Endpoints by class
+
+    def reset(self):
+        """New utterance: back to the fixed window."""
+        self.state = NEUTRAL
+        self.reason = ""
+        return self.base_ms
+
+    def hangover_ms(self):
+        if self.state == COMPLETE:
+            return self.fast_ms
+        if self.state == INCOMPLETE:
+            return self.extended_ms
+        return self.base_ms
+
+    def update(self, text):
+        """Classify the latest partial. Returns the silence window (ms) to apply."""
+        self.state, self.reason = self.classify(text)
+        return self.hangover_ms()
+
+    def classify(self, text):
+        words = _WORD.findall(text.lower())
+        if not words:
+            return NEUTRAL, "no words"
+
+        if text.rstrip().endswith((",", "-", "...", "…")):
+            return INCOMPLETE, "trailing punctuation"
+        if words[-1] in TRAILING_WORDS:
+            return INCOMPLETE, f"ends on '{words[-1]}'"
+        if words[-1] in OPEN_VERBS:
+            return INCOMPLETE, f"verb '{words[-1]}' without object"
+
+        if self.arbitration is not None:
+            try:
+                decision = self.arbitration.evaluate(text, {}, verbose=False)
+            except Exception:
+                return NEUTRAL, "arbitration error"
+            if decision.action == "EXECUTE_SKILL" and not self._is_dangerous(decision.skill):
+                return COMPLETE, f"resolves to {decision.skill}"
+
+        return NEUTRAL, "open-ended"
+
+    def _is_dangerous(self, skill_name):
+        # Never rush a destructive command: it keeps the normal window
+        if skill_name in DANGEROUS_SKILLS:
+            return True
+        skill = self.arbitration.skill_registry.get_skill(skill_name)
+        return bool(getattr(skill, "dangerous", False))
+
+    def record_endpoint(self):
+        """Count which class ended the turn (for tuning)."""
+        self.counts[self.state] += 1
@@ -0,0 +1,97 @@
+import numpy as np  # type: ignore
+
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def mel_filterbank(sample_rate, n_fft, n_mels, fmin=20.0, fmax=None):
+    """Triangular mel filters as an (n_fft // 2 + 1, n_mels) matrix."""
+    fmax = fmax or sample_rate / 2.0
+    mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)  # noqa: E731
+    hz = lambda m: 700.0 * (10.0 ** (m / 2595.0) - 1.0)  # noqa: E731
+    edges = hz(np.linspace(mel(fmin), mel(fmax), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, centre, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins[None, :] - lower) / (centre - lower)
+    falling = (upper - bins[None, :]) / (upper - centre)
+    return np.maximum(0.0, np.minimum(rising, falling)).T.astype(np.float32)
+
+
+def dct_matrix(n_mels, n_mfcc):
+    """Orthonormal DCT-II basis as an (n_mels, n_mfcc) matrix."""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)
+    basis = np.cos(np.pi / n_mels * (n[:, None] + 0.5) * k[None, :]) * np.sqrt(2.0 / n_mels)
+    basis[:, 0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+class MfccExtractor:
+    """
+    Streaming log-mel / MFCC features (25ms window, 10ms hop by default).
+
+    Blocks of any size are accepted; the < 1 window remainder is carried over, and
+    every complete hop in a block is computed in one vectorised pass (strided
+    framing -> window -> rfft -> mel matmul -> log -> DCT matmul).
+    """
+
+    def __init__(self, sample_rate=16000, win_ms=25, hop_ms=10, n_fft=512, n_mels=26, n_mfcc=13,
+                 preemphasis=0.97):
+        self.sample_rate = sample_rate
+        self.win = sample_rate * win_ms // 1000
+        self.hop = sample_rate * hop_ms // 1000
+        self.n_fft = n_fft
+        self.n_mfcc = n_mfcc
+        self.preemphasis = np.float32(preemphasis)
+        self.window = np.hamming(self.win).astype(np.float32)
+        self.mel = mel_filterbank(sample_rate, n_fft, n_mels)
+        self.dct = dct_matrix(n_mels, n_mfcc)
+        self._buf = np.zeros(self.win + sample_rate, dtype=np.float32)
+        self._fill = 0
+        self._last = np.float32(0.0)  # Pre-emphasis state across blocks
+
+    def reset(self):
+        self._fill = 0
+        self._last = np.float32(0.0)
+
+    def _stage(self, block):
+        x = block.astype(np.float32) * _INT16_SCALE if block.dtype == np.int16 else block.astype(np.float32)
+        if self.preemphasis:
+            shifted = np.empty_like(x)
+            shifted[0] = self._last
+            shifted[1:] = x[:-1]
+            self._last = x[-1] if len(x) else self._last
+            x = x - self.preemphasis * shifted
+        end = self._fill + len(x)
+        if end > len(self._buf):
+            grown = np.zeros(end + self.sample_rate, dtype=np.float32)
+            grown[:self._fill] = self._buf[:self._fill]
+            self._buf = grown
+        self._buf[self._fill:end] = x
+        self._fill = end
+
+    def log_mel(self, block):
+        """Feed int16/float samples; returns (frames, n_mels) log-mel energies for completed hops."""
+        self._stage(block)
+        count = 0 if self._fill < self.win else 1 + (self._fill - self.win) // self.hop
+        if count == 0:
+            return np.zeros((0, self.mel.shape[1]), dtype=np.float32)
+        frames = np.lib.stride_tricks.as_strided(
+            self._buf, shape=(count, self.win), strides=(self.hop * 4, 4), writeable=False)
+        spectrum = np.fft.rfft(frames * self.window, self.n_fft)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        features = np.log(power @ self.mel + 1e-8)
+        # Keep the samples the next window still needs
+        consumed = count * self.hop
+        remainder = self._fill - consumed
+        self._buf[:remainder] = self._buf[consumed:self._fill]
+        self._fill = remainder
+        return features
+
+    def process(self, block):
+        """Feed samples; returns (frames, n_mfcc) MFCCs for completed hops."""
+        return self.log_mel(block) @ self.dct
+
+
+def mfcc(samples, sample_rate=16000, **kwargs):
+    """MFCCs of a whole clip (int16 or float32)."""
+    return MfccExtractor(sample_rate, **kwargs).process(samples)
@@ -0,0 +1,189 @@
+"""
+Whisper device detection and model selection by latency budget.
+
+The device comes from CTranslate2 itself (no torch import). On first start the
+candidate models are benchmarked smallest-first on a short clip, and the
+largest one whose real-time factor (decode time / audio time) fits the budget
+is chosen. The choice is cached per machine so later starts load it directly.
+"""
+import json
+import os
+import platform
+import sys
+import time
+import wave
+
+import numpy as np  # type: ignore
+
+MODEL_CANDIDATES = ("tiny.en", "base.en", "small.en", "medium.en")
+DEFAULT_RTF_BUDGET = 0.25  # A 4s command must decode in ~1s on the final pass
+SAMPLE_RATE = 16000
+BENCHMARK_CLIP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stt_benchmark.wav")
+
+
+def detect_device():
+    """Returns (device, compute_type): CUDA float16 when CTranslate2 sees a GPU, else CPU int8."""
+    forced = os.environ.get("JARVIS_STT_DEVICE", "auto").lower()
+    if forced in ("cuda", "cpu"):
+        return forced, "float16" if forced == "cuda" else "int8"
+    try:
+        import ctranslate2  # type: ignore
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda", "float16"
+    except Exception:
+        pass
+    return "cpu", "int8"
+
+
+def cpu_threads():
+    """Physical cores: int8 GEMMs don't gain from hyper-threads."""
+    try:
+        import psutil  # type: ignore
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    except ImportError:
+        pass
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def model_kwargs(device, compute_type):
+    kwargs = {"device": device, "compute_type": compute_type}
+    if device == "cpu":
+        kwargs["cpu_threads"] = cpu_threads()
+        # Decodes are serialised by the STT scheduler, so one worker is enough
+        kwargs["num_workers"] = 1
+    return kwargs
+
+
+def load_benchmark_clip(seconds=4.0):
+    """The bundled clip if present (16kHz mono int16 WAV), else a synthetic voiced signal."""
+    if os.path.exists(BENCHMARK_CLIP):
+        with wave.open(BENCHMARK_CLIP, "rb") as wav:
+            frames = wav.readframes(wav.getnframes())
+        return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+    # Speech-like stand-in: a jittering 120Hz glottal buzz shaped by two moving
+    # formants and gated into ~4 syllables per second
+    rng = np.random.default_rng(7)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 120.0 + 15.0 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    f1 = 500.0 + 250.0 * np.sin(2 * np.pi * 1.3 * t)
+    f2 = 1500.0 + 600.0 * np.sin(2 * np.pi * 0.9 * t + 1.0)
+    clip = np.zeros_like(t)
+    for k in range(1, 30):
+        freq = k * f0
+        gain = np.exp(-((freq - f1) / 150.0) ** 2) + 0.5 * np.exp(-((freq - f2) / 250.0) ** 2)
+        clip += gain * np.sin(k * phase)
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t), 0.0, None) ** 0.5
+    clip = clip * syllables + 0.01 * rng.standard_normal(len(t))
+    return (0.3 * clip / np.max(np.abs(clip))).astype(np.float32)
+
+
+def measure_rtf(model, clip, runs=2):
+    """Best-of-N real-time factor for a full decode of the clip."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        segments, _ = model.transcribe(clip, beam_size=1, language="en", condition_on_previous_text=False)
+        for _ in segments:  # Generator: decoding happens while consuming
+            pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (len(clip) / SAMPLE_RATE)
+
+
+def cache_path():
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "JARVIS", "stt_model.json")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "jarvis", "stt_model.json")
+
+
+def machine_key(device, compute_type):
+    try:
+        import ctranslate2  # type: ignore
+        ct2 = ctranslate2.__version__
+    except Exception:
+        ct2 = "?"
+    return "|".join([platform.node(), platform.machine(), platform.processor() or "",
+                     str(os.cpu_count()), device, compute_type, ct2])
+
+
+def load_cached_choice(key, budget):
+    try:
+        with open(cache_path(), "r", encoding="utf-8") as f:
+            entry = json.load(f).get(key)
+    except (OSError, ValueError):
+        return None
+    if entry and entry.get("budget") == budget and entry.get("model") in MODEL_CANDIDATES:
+        return entry
+    return None
+
+
+def save_choice(key, entry):
+    path = cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data[key] = entry
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    except OSError as e:
+        print(f"[WARN] Could not cache STT model choice: {e}")
+
+
+def select_model(model_factory, device, compute_type, budget=None):
+    """
+    Returns (model_name, loaded_model_or_None). `model_factory(name)` loads a model.
+    Benchmarks smallest-first and stops at the first candidate over budget.
+    """
+    forced = os.environ.get("JARVIS_WHISPER_MODEL")
+    if forced:
+        return forced, None
+
+    if budget is None:
+        budget = float(os.environ.get("JARVIS_STT_RTF_BUDGET", DEFAULT_RTF_BUDGET))
+    key = machine_key(device, compute_type)
+    cached = load_cached_choice(key, budget)
+    if cached:
+        print(f"[OK] STT model (cached for this machine): {cached['model']} (RTF {cached['rtf']:.2f})")
+        return cached["model"], None
+
+    print(f"[STT] Benchmarking Whisper models on {device} ({compute_type}), RTF budget {budget}...")
+    clip = load_benchmark_clip()
+    chosen, chosen_model, chosen_rtf = None, None, None
+    results = {}
+    for name in MODEL_CANDIDATES:
+        try:
+            model = model_factory(name)
+            model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="en")  # Warm-up
+            rtf = measure_rtf(model, clip)
+        except Exception as e:
+            print(f"   [WARN] {name}: {e}")
+            break
+        results[name] = round(rtf, 3)
+        print(f"   {name:<10} RTF {rtf:.3f} {'OK' if rtf <= budget else 'over budget'}")
+        if rtf > budget:
+            break
+        chosen, chosen_model, chosen_rtf = name, model, rtf
+
+    if not results:
+        # Nothing could even be measured (offline first run, download error, OOM):
+        # use the smallest model now, but don't pin it - benchmark again next start
+        print(f"[WARN] No STT model could be benchmarked; using {MODEL_CANDIDATES[0]} without caching.")
+        return MODEL_CANDIDATES[0], None
+
+    if chosen is None:
+        # Nothing fits: the smallest model is still the fastest option
+        chosen, chosen_model, chosen_rtf = MODEL_CANDIDATES[0], None, results[MODEL_CANDIDATES[0]]
+
+    save_choice(key, {"model": chosen, "rtf": chosen_rtf, "budget": budget,
+                      "results": results, "measured_at": time.strftime("%Y-%m-%d %H:%M:%S")})
+    return chosen, chosen_model
@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+
+import numpy as np  # type: ignore
+
+from brain.input.stream_handler import StreamHandler  # type: ignore
+from brain.input.session_recorder import read_session, load_wav, load_labels  # type: ignore
+
+
+class ReplayStreamHandler(StreamHandler):
+    """
+    Drop-in StreamHandler that plays recorded sessions / WAV files instead of a mic.
+
+    Sources are concatenated (with `gap_sec` of silence between them) and written
+    into the same AudioBus the live callback feeds, block by block. `speed` is a
+    multiple of real time; 0 feeds as fast as the pipeline consumes. The feeder
+    never laps the reader the pipeline is currently draining, so faster-than-real-
+    time replays are lossless and deterministic. Wake labels are exposed as bus
+    positions in `wake_positions` for a LabelledWakeEngine.
+    """
+
+    def __init__(self, sources, speed=1.0, gap_sec=1.0, tail_sec=2.0,
+                 sample_rate=16000, chunk_size=480):
+        super().__init__(sample_rate=sample_rate, chunk_size=chunk_size, echo_cancel=False)
+        self.speed = speed
+        self.labels = []
+        blocks = []
+        offset = 0
+        gap = np.zeros(int(gap_sec * sample_rate), dtype=np.int16)
+        for path in sources:
+            if path.endswith(".wav"):
+                audio = load_wav(path, sample_rate)
+                labels = load_labels(path, sample_rate)
+            else:
+                rate, audio, labels = read_session(path)
+                if rate != sample_rate:
+                    raise ValueError(f"{path}: recorded at {rate}Hz, expected {sample_rate}Hz")
+            for label in labels:
+                label["position"] += offset
+                label["source"] = os.path.basename(path)
+                self.labels.append(label)
+            blocks += [audio, gap]
+            offset += len(audio) + len(gap)
+        blocks.append(np.zeros(int(tail_sec * sample_rate), dtype=np.int16))  # Lets the last utterance end
+        audio = np.concatenate(blocks)
+        pad = -len(audio) % chunk_size
+        self.audio = np.concatenate((audio, np.zeros(pad, dtype=np.int16)))
+        self.wake_positions = [l["position"] for l in self.labels if l.get("label") == "wake"]
+
+        self.finished = threading.Event()  # Set once every sample has been fed
+        self._thread = None
+
+    @property
+    def duration(self):
+        return len(self.audio) / self.sample_rate
+
+    def start_stream(self):
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._feed, daemon=True, name="replay-feeder")
+        self._thread.start()
+        pace = "max speed" if self.speed <= 0 else f"{self.speed:g}x real time"
+        print(f"[REPLAY] Feeding {self.duration:.1f}s of audio ({pace}), "
+              f"{len(self.wake_positions)} wake label(s)")
+
+    def _feed(self):
+        n = self.chunk_size
+        limit = self.bus.capacity - 2 * n  # Keep clear of the overrun margin
+        started = time.perf_counter()
+        for start in range(0, len(self.audio), n):
+            if not self.running:
+                return
+            if self.speed > 0:
+                due = started + start / (self.sample_rate * self.speed)
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            # Back-pressure: never overwrite audio the pipeline has not consumed yet
+            while self.running and self._active_reader().available() + n > limit:
+                time.sleep(0.001)
+            self.bus.write(self.audio[start:start + n])
+            if self._loop is not None and not self._wakeup_pending:
+                self._wakeup_pending = True
+                self._loop.call_soon_threadsafe(self._audio_ready.set)  # type: ignore
+        self.finished.set()
+
+    def _active_reader(self):
+        return self.stt_reader if self.is_listening_for_stt else self.wake_reader
+
+    def stop_stream(self):
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def stats(self):
+        stats = super().stats()
+        stats["replayed_sec"] = self.bus.write_pos / self.sample_rate
+        return stats
+
+
+class LabelledWakeEngine:
+    """
+    Wake-word stand-in for replays: "detects" the keyword when the wake reader
+    passes a labelled bus position, with the same `detection_lag` contract as
+    WakeWordEngine. Labels the pipeline wasn't reading over (e.g. while it was
+    listening) are skipped and counted as missed, as a live detector would be deaf.
+    """
+
+    def __init__(self, positions, reader, keyword_index=0):
+        self.positions = sorted(positions)
+        self.reader = reader
+        self.keyword_index = keyword_index
+        self.frame_length = 512
+        self.detection_lag = 0
+        self.detections = 0
+        self.missed = 0
+        self._next = 0
+
+    def detect(self, audio_chunk):
+        end = self.reader.cursor  # The chunk was just read: it ends here
+        begin = end - len(audio_chunk)
+        while self._next < len(self.positions) and self.positions[self._next] < begin:
+            self._next += 1
+            self.missed += 1
+        if self._next < len(self.positions) and self.positions[self._next] <= end:
+            self.detection_lag = end - self.positions[self._next]
+            self._next += 1
+            self.detections += 1
+            print(f"[!] Wake Word Detected (Index: {self.keyword_index}, labelled)")
+            return self.keyword_index
+        return -1
+
+    def stats(self):
+        return {"detections": self.detections, "missed": self.missed,
+                "remaining": len(self.positions) - self._next}
+
+    def cleanup(self):
+        pass
@@ -0,0 +1,166 @@
+import gzip
+import json
+import os
+import struct
+import threading
+import time
+import wave
+
+import numpy as np  # type: ignore
+
+FORMAT = "jarvis-session"
+VERSION = 1
+
+# Record tags: audio block / label (e.g. a live wake-word detection)
+AUDIO = b"A"
+LABEL = b"L"
+_AUDIO_HEADER = struct.Struct("<qdI")  # bus position, wall-clock time, sample count
+_LABEL_HEADER = struct.Struct("<qdI")  # bus position, wall-clock time, JSON length
+
+
+class SessionRecorder:
+    """
+    Tees the raw microphone audio into a gzip session file.
+
+    Reads the StreamHandler's AudioBus through its own cursor on a background
+    thread, so the audio callback is untouched and a slow disk only ever costs
+    this reader (overruns are counted like any other consumer's). Each block is
+    stored with its bus position and capture time; `mark()` adds labels such as
+    wake-word detections at the current position for later replay.
+    """
+
+    def __init__(self, stream, directory="recordings", poll_ms=100):
+        self.stream = stream
+        self.directory = directory
+        self.poll_sec = poll_ms / 1000.0
+        self.reader = stream.bus.reader("recorder")
+        self.path = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+        self.samples_written = 0
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, time.strftime("session_%Y%m%d_%H%M%S.jsess.gz"))
+        self._file = gzip.open(self.path, "wb", compresslevel=4)
+        header = {"format": FORMAT, "version": VERSION, "sample_rate": self.stream.sample_rate,
+                  "started": time.time()}
+        self._file.write(json.dumps(header).encode("utf-8") + b"\n")
+        self.reader.seek_to_now()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="session-recorder")
+        self._thread.start()
+        print(f"[RECORD] Recording microphone session to {self.path}")
+
+    def _run(self):
+        while self._running:
+            time.sleep(self.poll_sec)
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        samples = self.reader.read_available()
+        if len(samples) == 0:
+            return
+        # After the read: an overrun moves the cursor forward inside read_available
+        position = self.reader.cursor - len(samples)
+        with self._lock:
+            self._file.write(AUDIO + _AUDIO_HEADER.pack(position, time.time(), len(samples)))  # type: ignore
+            self._file.write(samples.astype("<i2", copy=False).tobytes())  # type: ignore
+        self.samples_written += len(samples)
+
+    def mark(self, label, position=None, **data):
+        """Label the audio at bus `position` (default: the newest captured sample)."""
+        if self._file is None:
+            return
+        if position is None:
+            position = self.stream.bus.write_pos
+        payload = json.dumps({"label": label, **data}).encode("utf-8")
+        with self._lock:
+            self._file.write(LABEL + _LABEL_HEADER.pack(position, time.time(), len(payload)))
+            self._file.write(payload)
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join(timeout=2.0)  # type: ignore
+        with self._lock:
+            self._file.close()  # type: ignore
+            self._file = None
+        seconds = self.samples_written / self.stream.sample_rate
+        print(f"[RECORD] Saved {seconds:.1f}s of audio to {self.path}")
+
+
+def read_session(path):
+    """
+    Load a session file. Returns (sample_rate, int16 samples, labels) where labels
+    are dicts with a "position" relative to the first recorded sample.
+    Gaps (e.g. a recorder overrun) are filled with silence so positions stay exact.
+    """
+    with gzip.open(path, "rb") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} file")
+        blocks, labels = [], []
+        origin = None
+        end = 0
+        while True:
+            tag = f.read(1)
+            if not tag:
+                break
+            position, stamp, length = _AUDIO_HEADER.unpack(f.read(_AUDIO_HEADER.size))
+            if origin is None:
+                origin = position
+            if tag == AUDIO:
+                samples = np.frombuffer(f.read(length * 2), dtype="<i2").astype(np.int16)
+                gap = position - origin - end
+                if gap > 0:
+                    blocks.append(np.zeros(gap, dtype=np.int16))
+                    end += gap
+                blocks.append(samples)
+                end += len(samples)
+            elif tag == LABEL:
+                label = json.loads(f.read(length))
+                label["position"] = position - origin
+                label["time"] = stamp
+                labels.append(label)
+            else:
+                raise ValueError(f"{path}: corrupt record tag {tag!r}")
+    audio = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int16)
+    return header["sample_rate"], audio, labels
+
+
+def load_wav(path, sample_rate=16000):
+    """Mono int16 samples at `sample_rate` from a 16-bit WAV file."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2").astype(np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)[:, 0]
+    if rate != sample_rate and len(samples):
+        positions = np.arange(0, len(samples), rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    return samples
+
+
+def load_labels(path, sample_rate=16000):
+    """
+    Labels for a WAV file from its `<name>.labels.json` sidecar, if present:
+    {"wake": [seconds, ...], "text": [expected transcripts]} -> label dicts.
+    """
+    sidecar = os.path.splitext(path)[0] + ".labels.json"
+    if not os.path.exists(sidecar):
+        return []
+    with open(sidecar, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    labels = [{"label": "wake", "position": int(t * sample_rate)} for t in data.get("wake", [])]
+    expected = data.get("text", [])
+    for label, text in zip(labels, expected):
+        label["text"] = text
+    return labels
@@ -0,0 +1,176 @@
+"""
+Speaker verification from MFCC statistics, cheap enough to run before Whisper.
+
+A speaker's voice profile is the distribution of a short-window embedding: the
+mean and standard deviation of the voiced frames' MFCCs (c1..c19) over
+VERIFY_SEC of speech, summarised by its centre and (shrunk) covariance.
+Verification embeds the first VERIFY_SEC of an utterance and measures its
+whitened (Mahalanobis) distance to the profile, a 38x38 matrix-vector product.
+
+Enroll (a minute or so of normal speech, one or more 16-bit WAVs):
+    python -m brain.input.speaker_verify enroll me1.wav me2.wav
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np  # type: ignore
+
+from brain.input.mfcc import MfccExtractor  # type: ignore
+from brain.input.model_selector import cache_path  # type: ignore
+
+SAMPLE_RATE = 16000
+VERIFY_SEC = 0.5
+N_MFCC = 20
+VOICED_DB = 30.0         # Frames within this of the loudest one count as voiced
+MIN_VOICED_FRAMES = 15   # 150ms of voicing before a score means anything
+MIN_WINDOWS = 20         # ~5s of voiced enrollment speech for a usable covariance
+SHRINKAGE = 0.1          # Covariance pulled towards its diagonal (few windows vs 38 dims)
+MIN_THRESHOLD = 1.0      # RMS whitened distance; held-out windows of the enrolled speaker sit below ~1
+
+
+def default_profile_path():
+    """JARVIS_VOICE_PROFILE, else next to the per-machine STT cache."""
+    return os.environ.get("JARVIS_VOICE_PROFILE") or \
+        os.path.join(os.path.dirname(cache_path()), "voice_profile.npz")
+
+
+def embed(samples, sample_rate=SAMPLE_RATE):
+    """Mean and std of the voiced frames' c1..c19, or None with too little voicing."""
+    extractor = MfccExtractor(sample_rate, n_mfcc=N_MFCC)
+    feats = extractor.process(samples)
+    if len(feats) < MIN_VOICED_FRAMES:
+        return None
+    # c0 is the log-energy summed over the mel bands / sqrt(n_mels): convert the dB range to it
+    energy = feats[:, 0]
+    span = VOICED_DB / 10.0 * np.log(10.0) * np.sqrt(extractor.mel.shape[1])
+    voiced = feats[energy >= energy.max() - span, 1:]
+    if len(voiced) < MIN_VOICED_FRAMES:
+        return None
+    return np.concatenate((voiced.mean(axis=0), voiced.std(axis=0)))
+
+
+def _windows(samples, sample_rate=SAMPLE_RATE):
+    """Embeddings of VERIFY_SEC windows (half overlapping) across a clip."""
+    size = int(VERIFY_SEC * sample_rate)
+    out = []
+    for start in range(0, max(1, len(samples) - size + 1), size // 2):
+        e = embed(samples[start:start + size], sample_rate)
+        if e is not None:
+            out.append(e)
+    return out
+
+
+class SpeakerProfile:
+    """Enrolled window-embedding distribution (centre + whitening matrix) plus threshold."""
+
+    def __init__(self, centre, whitening, threshold=MIN_THRESHOLD):
+        self.centre = centre
+        self.whitening = whitening
+        self.threshold = threshold
+
+    @classmethod
+    def from_embeddings(cls, embeddings, threshold=MIN_THRESHOLD):
+        stack = np.array(embeddings)
+        cov = np.cov(stack.T)
+        cov = (1.0 - SHRINKAGE) * cov + SHRINKAGE * np.diag(np.diag(cov))
+        values, vectors = np.linalg.eigh(cov)
+        # Inverse square root; near-zero directions (too little enrollment data) are capped
+        values = np.maximum(values, values.max() * 1e-6)
+        whitening = (vectors / np.sqrt(values)) @ vectors.T
+        return cls(stack.mean(axis=0), whitening.astype(np.float32), threshold)
+
+    @classmethod
+    def load(cls, path=None):
+        data = np.load(path or default_profile_path())
+        return cls(data["centre"], data["whitening"], float(data["threshold"]))
+
+    def save(self, path=None):
+        path = path or default_profile_path()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, centre=self.centre, whitening=self.whitening, threshold=np.float32(self.threshold))
+        return path
+
+    def distance(self, embedding):
+        z = self.whitening @ (embedding - self.centre)
+        return float(np.sqrt(np.mean(z ** 2)))
+
+
+class SpeakerVerifier:
+    """
+    Scores the start of an utterance against the enrolled profile.
+    check() returns (accepted, distance); too little voicing to judge counts as
+    accepted (distance None), so a short command is never dropped for lack of audio.
+    """
+
+    def __init__(self, profile, sample_rate=SAMPLE_RATE, verify_sec=VERIFY_SEC):
+        self.profile = profile
+        self.sample_rate = sample_rate
+        self.verify_samples = int(verify_sec * sample_rate)
+        self.stats = {"checked": 0, "rejected": 0, "undecided": 0, "verify_ms": 0.0}
+
+    def check(self, audio):
+        started = time.perf_counter()
+        embedding = embed(audio[:self.verify_samples], self.sample_rate)
+        self.stats["verify_ms"] += (time.perf_counter() - started) * 1000.0
+        if embedding is None:
+            self.stats["undecided"] += 1
+            return True, None
+        self.stats["checked"] += 1
+        distance = self.profile.distance(embedding)
+        accepted = distance <= self.profile.threshold
+        if not accepted:
+            self.stats["rejected"] += 1
+        return accepted, distance
+
+
+def enroll(clips, path=None, margin=1.25):
+    """
+    Build a profile from recordings of the user (int16 arrays). The threshold is
+    the 95th percentile of held-out window distances (each clip scored against a
+    profile built from the others, when there are several) times `margin`.
+    """
+    per_clip = [_windows(c) for c in clips]
+    embeddings = [e for windows in per_clip for e in windows]
+    if len(embeddings) < MIN_WINDOWS:
+        raise ValueError(f"Only {len(embeddings)} usable windows; record more speech (at least ~10s).")
+    held_out = []
+    for i, windows in enumerate(per_clip):
+        others = [e for j, w in enumerate(per_clip) if j != i for e in w]
+        if len(others) >= MIN_WINDOWS:
+            reference = SpeakerProfile.from_embeddings(others)
+            held_out += [reference.distance(e) for e in windows]
+    profile = SpeakerProfile.from_embeddings(embeddings)
+    scores = held_out or [profile.distance(e) for e in embeddings]
+    profile.threshold = max(MIN_THRESHOLD, float(np.percentile(scores, 95)) * margin)
+    path = profile.save(path)
+    print(f"[OK] Enrolled voice profile from {len(embeddings)} windows "
+          f"(threshold {profile.threshold:.2f}) -> {path}")
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enroll or test the speaker-verification voice profile.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enroll_cmd = sub.add_parser("enroll")
+    enroll_cmd.add_argument("wavs", nargs="+", help="16-bit WAV recordings of your voice")
+    enroll_cmd.add_argument("--out", default=None, help="profile file (default: per-machine cache)")
+    test_cmd = sub.add_parser("test", help="score the first VERIFY_SEC of each WAV")
+    test_cmd.add_argument("wavs", nargs="+")
+    test_cmd.add_argument("--profile", default=None)
+    args = parser.parse_args()
+
+    from brain.input.session_recorder import load_wav  # type: ignore
+    if args.command == "enroll":
+        enroll([load_wav(p, SAMPLE_RATE) for p in args.wavs], args.out)
+    else:
+        verifier = SpeakerVerifier(SpeakerProfile.load(args.profile))
+        for p in args.wavs:
+            accepted, distance = verifier.check(load_wav(p, SAMPLE_RATE))
+            shown = "n/a" if distance is None else f"{distance:.2f}"
+            print(f"{'ACCEPT' if accepted else 'REJECT'}  {shown:>6}  {p}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,61 +3,107 @@ import numpy as np # type: ignore
 import queue
 import threading
 import logging
+import asyncio
+import time
+from brain.input.audio_bus import AudioBus  # type: ignore
+from brain.input.aec import EchoCanceller  # type: ignore
 
 class StreamHandler:
     """
     Manages a single audio stream from the microphone.
-    Feeds two consumers:
+    The callback writes every block into an AudioBus (single writer); each
+    consumer reads through its own cursor:
     1. Wake Word Engine (Always active or as needed)
     2. STT Engine (Active only when listening)
+    3. Visualizer (mic envelope for the UI)
+    Further consumers (VAD, recorder) attach with `self.bus.reader(name)`.
     """
     def __init__(self, 
                  sample_rate=16000, 
-                 chunk_size=480): # 30ms chunk for WebRTC VAD (16000 * 0.03)
+                 chunk_size=480, # 30ms chunk for WebRTC VAD (16000 * 0.03)
+                 bus_seconds=4.0,
+                 echo_cancel=True):
         
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
-        
-        # Queues
-        # Wake Word Queue: Dropping old frames if full isn't great, but we must prevent lag.
-        # With a dedicated consumer, it should stay empty.
-        self.wake_word_queue = queue.Queue()
-        
-        # STT Queue: Unbounded or large maxsize to prevent packet loss during processing spikes
-        self.stt_queue = queue.Queue()
+
+        # Bounded ring instead of unbounded queues: a stalled consumer loses the
+        # oldest audio (counted per reader) rather than growing memory.
+        self.bus = AudioBus(sample_rate, chunk_size, bus_seconds)
+        self.wake_reader = self.bus.reader("wake_word")
+        self.stt_reader = self.bus.reader("stt")
+        self.visual_reader = self.bus.reader("visualizer")
         
         self.stream = None
         self.running = False
-        self.is_listening_for_stt = False  # Gate for STT queue
+        self.is_listening_for_stt = False  # Gate for STT reads
+        self.status_errors = 0  # PortAudio over/underflow flags seen by the callback
+
+        # Echo cancellation against the TTS playback reference (see brain.utils.tts)
+        self.aec = EchoCanceller(block=chunk_size, sample_rate=sample_rate) if echo_cancel else None
+
+        # Event-driven hand-off to the asyncio side (see attach_loop / wait_for_audio):
+        # the audio thread sets an asyncio.Event at most once per wake-up.
+        self._loop = None
+        self._audio_ready = None
+        self._wakeup_pending = False
+
+    def attach_loop(self, loop):
+        """Deliver audio wake-ups to `loop`. Call from the loop before start_stream()."""
+        self._loop = loop
+        self._audio_ready = asyncio.Event()
+        self._wakeup_pending = False
+
+    async def wait_for_audio(self, timeout=None):
+        """
+        Sleep until the audio thread delivers new blocks, or until `timeout` seconds.
+        Returns False on timeout. Callers should drain the queues afterwards.
+        """
+        if self._audio_ready is None:
+            self.attach_loop(asyncio.get_running_loop())
+        try:
+            await asyncio.wait_for(self._audio_ready.wait(), timeout)  # type: ignore
+            ready = True
+        except asyncio.TimeoutError:
+            ready = False
+        self._audio_ready.clear()  # type: ignore
+        self._wakeup_pending = False
+        return ready
 
     def start_stream(self):
         if self.running: return
 
+        try:
+            from brain.utils import tts  # type: ignore
+        except ImportError:
+            tts = None
+
+        bus = self.bus
+        aec = self.aec
+        reference = getattr(tts, "echo_reference", None) if aec is not None else None
+
+        # Runs on the PortAudio thread: no imports, no locks. Idle capture allocates
+        # nothing; only blocks captured during playback go through the echo canceller.
         def callback(indata, frames, time, status):
-            from brain.utils import tts # type: ignore
-            if getattr(tts, 'is_speaking', False):
-                return
+            if tts is not None and tts.is_speaking and not (reference is not None and tts.echo_cancelled):
+                return  # Playback without a reference: stay deaf as before
 
             if status:
-                print(f"Stream Status: {status}")
-            
-            # indata is numpy array (frames, channels)
-            # Make sure it's int16 flattened to 1D array
-            data_int16 = indata.flatten().astype(np.int16)
-            
-            # 1. Feed Wake Word (Always, or controllable? Always for now)
-            self.wake_word_queue.put(data_int16)
-            
-            # 2. Feed STT (If enabled)
-            if self.is_listening_for_stt:
-                # Whisper works with float32 usually, but faster-whisper can take int16 or float32.
-                # Converting to float32 here saves compute in the engine loop?
-                # Actually, sending int16 bytes or array is fine.
-                # Let's send the numpy array, let engine decide.
-                # To be safe for VAD/Whisper, let's normalize to float32 -1.0 to 1.0 here?
-                # Or just send raw int16.
-                # Standard practice: Send int16 to queue, let consumer normalize if needed.
-                self.stt_queue.put(data_int16)
+                self.status_errors += 1
+
+            block = indata
+            if reference is not None and frames == aec.block:  # type: ignore
+                ref = reference.pull(frames)
+                if ref is not None:
+                    block = aec.process(indata[:, 0], ref)  # type: ignore
+
+            # int16 (frames, 1) or (frames,); copied straight into the ring
+            bus.write(block)
+
+            # Wake the consumer (once, until it drains the bus)
+            if self._loop is not None and not self._wakeup_pending:
+                self._wakeup_pending = True
+                self._loop.call_soon_threadsafe(self._audio_ready.set)  # type: ignore
 
         try:
             # Create input stream
@@ -92,28 +138,15 @@ class StreamHandler:
                 self.stream = None
         self.running = False
 
-    def pause_stream(self):
-        """Pause mic input so TTS can use audio device."""
-        if self.stream and self.running:
-            try:
-                self.stream.stop()  # type: ignore
-                print("[AUDIO] Mic paused for TTS")
-            except Exception as e:
-                print(f"[AUDIO] Pause error: {e}")
-
-    def resume_stream(self):
-        """Resume mic input after TTS finishes."""
-        if self.stream and self.running:
-            try:
-                self.stream.start()  # type: ignore
-                print("[AUDIO] Mic resumed")
-            except Exception as e:
-                print(f"[AUDIO] Resume error: {e}")
-
-    def enable_stt(self):
-        """Start buffering audio for STT"""
-        with self.stt_queue.mutex:
-            self.stt_queue.queue.clear()
+    def enable_stt(self, start=None):
+        """
+        Start buffering audio for STT. By default only fresh audio; `start` is an
+        absolute bus sample position to replay from (pre-roll), clamped to the ring.
+        """
+        if start is None:
+            self.stt_reader.seek_to_now()
+        else:
+            self.stt_reader.seek(start)
         self.is_listening_for_stt = True
 
     def disable_stt(self):
@@ -122,11 +155,27 @@ class StreamHandler:
 
     def clear_wake_word_queue(self):
         """Flush the wake word buffer completely so we only process fresh audio"""
-        with self.wake_word_queue.mutex:
-            self.wake_word_queue.queue.clear()
+        self.wake_reader.seek_to_now()
 
     def get_wake_word_chunk(self, block=True):
-        return self.wake_word_queue.get(block=block)
-    
+        return self._read(self.wake_reader, block)
+
     def get_stt_chunk(self, block=True):
-        return self.stt_queue.get(block=block)
+        if not self.is_listening_for_stt:
+            raise queue.Empty
+        return self._read(self.stt_reader, block)
+
+    def _read(self, reader, block):
+        """Next block from `reader`; raises queue.Empty like the old queue API."""
+        chunk = reader.read_block(self.chunk_size)
+        while chunk is None and block and self.running:
+            time.sleep(self.chunk_size / self.sample_rate)
+            chunk = reader.read_block(self.chunk_size)
+        if chunk is None:
+            raise queue.Empty
+        return chunk
+
+    def stats(self):
+        """Per-reader lag / overrun counters plus callback status errors."""
+        return {"readers": self.bus.stats(), "status_errors": self.status_errors,
+                "aec": self.aec.stats() if self.aec else None}
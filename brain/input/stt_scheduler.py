@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextvars import copy_context
+
+from brain.tracing import tracer  # type: ignore
+
+PARTIAL = "partial"
+FINAL = "final"
+
+
+class _Job:
+    __slots__ = ("kind", "fn", "args", "future", "loop", "submitted", "context")
+
+    def __init__(self, kind, fn, args, future, loop):
+        self.kind = kind
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.loop = loop
+        self.submitted = time.perf_counter()
+        self.context = copy_context()  # Decode spans belong to the submitting interaction
+
+
+def _resolve(future, result, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class SttScheduler:
+    """
+    Dedicated single-thread executor for Whisper decodes.
+
+    - At most one partial is queued behind the one in flight; a newer partial
+      supersedes it (the stale one resolves to None).
+    - Finals always run before queued partials and drop them.
+    - The partial interval follows the measured partial decode time, so a slow
+      GPU/CPU gets fewer partials instead of a growing backlog.
+    """
+
+    def __init__(self, initial_interval_ms=300, min_interval_ms=150, max_interval_ms=1500,
+                 interval_factor=1.5, alpha=0.3):
+        self.min_interval = min_interval_ms / 1000.0
+        self.max_interval = max_interval_ms / 1000.0
+        self.interval_factor = interval_factor
+        self.alpha = alpha
+        self.partial_interval = initial_interval_ms / 1000.0
+        self.partial_decode_sec = None  # EMA of partial decode time
+
+        self._cond = threading.Condition()
+        self._finals = deque()
+        self._partial = None
+        self._running = None  # Kind of the job currently decoding
+        self._thread = None
+        self._closed = False
+        self._last_partial = 0.0
+
+        # Counters
+        self.partials_run = 0
+        self.partials_dropped = 0
+        self.finals_run = 0
+        self.final_wait_ms = 0.0  # Time the last final spent queued
+
+    # ---- submission (event loop side) ----
+
+    def restart_partials(self):
+        """Start the partial clock for a new utterance."""
+        self._last_partial = time.time()
+
+    def partial_due(self, force=False):
+        """True when the decoder is idle and the adaptive interval has elapsed (or `force`)."""
+        with self._cond:
+            if self._running is not None or self._partial is not None or self._finals:
+                return False
+        return force or time.time() - self._last_partial >= self.partial_interval
+
+    async def partial(self, fn, *args):
+        """Run a partial decode. Returns its result, or None if superseded/pre-empted."""
+        self._last_partial = time.time()
+        return await self._submit(PARTIAL, fn, args)
+
+    async def final(self, fn, *args):
+        """Run a final decode ahead of any queued partials."""
+        return await self._submit(FINAL, fn, args)
+
+    def _submit(self, kind, fn, args):
+        loop = asyncio.get_running_loop()
+        job = _Job(kind, fn, args, loop.create_future(), loop)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SttScheduler is closed")
+            if kind == FINAL:
+                self._drop_partial()
+                self._finals.append(job)
+            else:
+                self._drop_partial()
+                self._partial = job
+            self._ensure_worker()
+            self._cond.notify()
+        return job.future
+
+    def _drop_partial(self):
+        # Caller holds the lock
+        if self._partial is not None:
+            stale = self._partial
+            self._partial = None
+            self.partials_dropped += 1
+            stale.loop.call_soon_threadsafe(_resolve, stale.future, None, None)
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="stt-scheduler", daemon=True)
+            self._thread.start()
+
+    # ---- worker thread ----
+
+    def _next_job(self):
+        with self._cond:
+            while not self._closed and not self._finals and self._partial is None:
+                self._cond.wait()
+            if self._closed:
+                return None
+            if self._finals:
+                job = self._finals.popleft()
+            else:
+                job, self._partial = self._partial, None
+            self._running = job.kind
+            return job
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            started = time.perf_counter()
+            result, error = None, None
+            try:
+                result = job.context.run(self._run, job)
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - started
+
+            with self._cond:
+                self._running = None
+                if job.kind == FINAL:
+                    self.finals_run += 1
+                    self.final_wait_ms = (started - job.submitted) * 1000.0
+                else:
+                    self.partials_run += 1
+                    self._observe_partial(elapsed)
+            job.loop.call_soon_threadsafe(_resolve, job.future, result, error)
+
+    @staticmethod
+    def _run(job):
+        with tracer.span(f"stt.{job.kind}_decode"):
+            return job.fn(*job.args)
+
+    def _observe_partial(self, elapsed):
+        if self.partial_decode_sec is None:
+            self.partial_decode_sec = elapsed
+        else:
+            self.partial_decode_sec += self.alpha * (elapsed - self.partial_decode_sec)
+        interval = self.partial_decode_sec * self.interval_factor
+        self.partial_interval = min(self.max_interval, max(self.min_interval, interval))
+
+    # ---- lifecycle ----
+
+    def stats(self):
+        return {
+            "partials_run": self.partials_run,
+            "partials_dropped": self.partials_dropped,
+            "finals_run": self.finals_run,
+            "partial_interval_ms": round(self.partial_interval * 1000.0, 1),
+            "partial_decode_ms": round((self.partial_decode_sec or 0.0) * 1000.0, 1),
+            "final_wait_ms": round(self.final_wait_ms, 1),
+        }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._drop_partial()
+            for job in self._finals:
+                job.loop.call_soon_threadsafe(_resolve, job.future, None, None)
+            self._finals.clear()
+            self._cond.notify_all()
@@ -0,0 +1,403 @@
+"""
+Out-of-process STT: a long-lived server hosting the Whisper model, and the
+RemoteWhisperEngine client the brain uses in its place.
+
+Audio is handed over through a shared-memory segment owned by the client; only
+small JSON control messages (method, segment name, sample count, kwargs) and the
+results cross the multiprocessing connection (never pickle). The socket lives in
+a per-user 0700 runtime directory and connections are authenticated with a random
+per-install key kept in a 0600 file next to the STT cache. The server outlives
+brain restarts, so the model stays loaded and warm; a crash in the native decoder
+only takes the server down, and the client respawns it in the background.
+
+Run standalone:  python -m brain.input.stt_server [--address ADDR]
+"""
+import argparse
+import getpass
+import json
+import os
+import secrets
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError, shared_memory
+from multiprocessing.connection import Client, Listener
+
+import numpy as np  # type: ignore
+
+from brain.input.model_selector import cache_path  # type: ignore
+
+IS_WINDOWS = sys.platform == "win32"
+METHODS = ("transcribe", "transcribe_partial", "transcribe_words", "transcribe_detailed", "transcribe_batch")
+SAMPLE_RATE = 16000
+
+
+def _runtime_dir():
+    """Per-user directory for the socket: $XDG_RUNTIME_DIR/jarvis, else <tmp>/jarvis-<uid>, mode 0700."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    path = os.path.join(base, "jarvis") if base else os.path.join(tempfile.gettempdir(), f"jarvis-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)  # lstat: a planted symlink is not a directory
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(f"{path} must be a directory owned by you with mode 0700")
+    return path
+
+
+def default_address():
+    """Per-user named pipe on Windows, Unix domain socket in the per-user runtime dir elsewhere."""
+    address = os.environ.get("JARVIS_STT_SOCKET")
+    if address:
+        return address
+    if IS_WINDOWS:
+        user = "".join(c for c in getpass.getuser() if c.isalnum()) or "user"
+        return rf"\\.\pipe\jarvis_stt_{user}"
+    return os.path.join(_runtime_dir(), "jarvis_stt.sock")
+
+
+def authkey_path():
+    return os.path.join(os.path.dirname(cache_path()), "stt_authkey")
+
+
+def load_authkey():
+    """JARVIS_STT_AUTHKEY, else the per-install random key (created 0600 on first use)."""
+    key = os.environ.get("JARVIS_STT_AUTHKEY")
+    if key:
+        return key.encode("utf-8")
+    path = authkey_path()
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written to a private temp file, then linked into place: a concurrent
+        # starter either wins the link or reads the complete winner
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+            try:
+                os.link(tmp, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(tmp)
+    if not IS_WINDOWS and os.stat(path).st_mode & 0o077:
+        raise RuntimeError(f"{path} is readable by other users; chmod 600 it")
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip().encode("utf-8")
+
+
+def _send(conn, message):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def _recv(conn):
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+def _encode_result(method, result):
+    if hasattr(result, "to_wire"):  # TranscriptResult (transcribe_detailed, or detailed=True)
+        return result.to_wire()
+    return result
+
+
+def _decode_result(method, result):
+    if result is None:
+        return None
+    if method == "transcribe_detailed":
+        from brain.input.confidence import TranscriptResult  # type: ignore
+        return TranscriptResult.from_wire(result)
+    if method == "transcribe_words":
+        return [tuple(w) for w in result]
+    return result
+
+
+def _attach(name):
+    """Attach to a client-owned segment without letting this process unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if not IS_WINDOWS:
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+            except Exception:
+                pass
+        return shm
+
+
+# ---------------- Server ----------------
+
+class SttServer:
+    def __init__(self, engine, address=None):
+        self.engine = engine
+        self.address = address or default_address()
+        self.authkey = load_authkey()
+        self.segments = {}  # name -> SharedMemory (clients reuse one segment)
+
+    def _claim_address(self):
+        """Remove a stale socket left by a dead server. False if a live one is listening."""
+        if IS_WINDOWS or not os.path.lexists(self.address):
+            return True
+        if not stat.S_ISSOCK(os.lstat(self.address).st_mode):
+            raise RuntimeError(f"{self.address} exists and is not a socket; refusing to replace it")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.address)
+            return False
+        except OSError:
+            os.unlink(self.address)  # Nobody is listening: stale from a previous run
+            return True
+        finally:
+            probe.close()
+
+    def serve_forever(self):
+        if not self._claim_address():
+            print(f"[STT] A server is already listening on {self.address}; exiting.")
+            return
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"[OK] STT server listening on {self.address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"[WARN] STT server accept failed: {e}")
+                    continue
+                if not self._serve_client(conn):
+                    break
+        self._detach_all()
+        print("[STT] Server stopped.")
+
+    def _serve_client(self, conn):
+        """Handle one brain connection. Returns False on a shutdown request."""
+        print("[STT] Client connected.")
+        try:
+            while True:
+                message = _recv(conn)
+                op = message.get("op")
+                if op == "ping":
+                    _send(conn, {"status": "ok", "result": "pong"})
+                elif op == "call":
+                    _send(conn, self._call(message["method"], message["segment"], message["count"],
+                                           message.get("kwargs") or {}))
+                elif op == "shutdown":
+                    _send(conn, {"status": "ok", "result": None})
+                    return False
+                else:
+                    _send(conn, {"status": "error", "result": f"Unknown op: {op}"})
+        except (EOFError, ConnectionError, OSError, ValueError, KeyError):
+            print("[STT] Client disconnected.")
+            return True
+        finally:
+            conn.close()
+            self._detach_all()
+
+    def _call(self, method, segment, count, kwargs):
+        if method not in METHODS:
+            return {"status": "error", "result": f"Unknown method: {method}"}
+        try:
+            shm = self.segments.get(segment)
+            if shm is None:
+                # The client replaced its segment (grown): the old one is no longer used
+                self._detach_all()
+                shm = _attach(segment)
+                self.segments[segment] = shm
+            audio = np.ndarray((count,), dtype=np.float32, buffer=shm.buf)
+            return {"status": "ok", "result": _encode_result(method, getattr(self.engine, method)(audio, **kwargs))}
+        except Exception as e:
+            return {"status": "error", "result": f"{type(e).__name__}: {e}"}
+
+    def _detach_all(self):
+        for shm in self.segments.values():
+            try:
+                shm.close()
+            except Exception:
+                pass
+        self.segments = {}
+
+
+# ---------------- Client ----------------
+
+class RemoteWhisperEngine:
+    """
+    Drop-in for WhisperEngine that forwards decodes to the STT server.
+    Spawns the server if it isn't running (waiting for the model only at
+    startup). A lost server never blocks the STT thread: the failing call and
+    any made while it restarts return empty results, and each later call makes
+    one quick reconnect attempt (respawning the server in the background).
+    """
+
+    MAX_SECONDS = 30.0
+    RECONNECT_INTERVAL = 1.0  # Seconds between reconnect attempts while the server is down
+
+    def __init__(self, address=None, spawn=True, connect_timeout=180.0):
+        self.address = address or default_address()
+        self.authkey = load_authkey()
+        self.spawn = spawn
+        self.connect_timeout = connect_timeout
+        self.conn = None
+        self.shm = None
+        self.process = None
+        self._lock = threading.Lock()
+        self.failures = 0
+        self._next_attempt = 0.0
+        self._connect()
+
+    def start_stream(self):
+        from brain.input.whisper_engine import StreamingTranscript  # type: ignore
+        return StreamingTranscript(self)
+
+    def transcribe(self, audio_data, detailed=False):
+        return self._plain_or_detailed("transcribe", audio_data, detailed)
+
+    def transcribe_partial(self, audio_data, detailed=False):
+        return self._plain_or_detailed("transcribe_partial", audio_data, detailed)
+
+    def _plain_or_detailed(self, method, audio_data, detailed):
+        if not detailed:
+            return self._call(method, audio_data, {}) or ""
+        from brain.input.confidence import TranscriptResult  # type: ignore
+        result = self._call(method, audio_data, {"detailed": True})
+        return TranscriptResult.from_wire(result) if result else TranscriptResult()
+
+    def transcribe_words(self, audio_data, prompt=None, final=False):
+        kwargs = {"final": final}
+        if prompt is not None:
+            kwargs["prompt"] = prompt
+        return self._call("transcribe_words", audio_data, kwargs) or []
+
+    def transcribe_detailed(self, audio_data, prompt=None, beam_size=1, final=True):
+        from brain.input.confidence import TranscriptResult  # type: ignore
+        result = self._call("transcribe_detailed", audio_data,
+                            {"prompt": prompt, "beam_size": beam_size, "final": final})
+        return result or TranscriptResult(beam_size=beam_size)
+
+    def transcribe_batch(self, audio_data, clips, batch_size=8):
+        result = self._call("transcribe_batch", audio_data, {"clips": list(clips), "batch_size": batch_size})
+        return result or [""] * len(clips)
+
+    def _connect(self):
+        """Startup: connect, spawning the server and waiting for its model if needed."""
+        try:
+            self.conn = Client(self.address, authkey=self.authkey)
+            return
+        except (FileNotFoundError, ConnectionError, OSError):
+            if not self.spawn:
+                raise
+
+        self._spawn_server()
+        deadline = time.time() + self.connect_timeout
+        while True:
+            try:
+                self.conn = Client(self.address, authkey=self.authkey)
+                print(f"[OK] Connected to STT server at {self.address}")
+                return
+            except (FileNotFoundError, ConnectionError, OSError):
+                if time.time() > deadline or (self.process and self.process.poll() is not None):
+                    raise RuntimeError("STT server did not come up")
+                time.sleep(0.25)
+
+    def _reconnect(self):
+        """One quick attempt (no waiting); starts a server in the background if none is up."""
+        now = time.time()
+        if now < self._next_attempt:
+            return False
+        self._next_attempt = now + self.RECONNECT_INTERVAL
+        try:
+            self.conn = Client(self.address, authkey=self.authkey)
+            print(f"[OK] Reconnected to STT server at {self.address}")
+            return True
+        except (FileNotFoundError, ConnectionError, OSError, AuthenticationError):
+            pass
+        if self.spawn and (self.process is None or self.process.poll() is not None):
+            self._spawn_server()
+        return False
+
+    def _spawn_server(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        print("[STT] Starting STT server process (model loads once, stays warm)...")
+        kwargs = {"cwd": root}
+        if IS_WINDOWS:
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP  # type: ignore
+        else:
+            kwargs["start_new_session"] = True  # Survives brain restarts
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "brain.input.stt_server", "--address", self.address], **kwargs)
+
+    def _segment_for(self, count):
+        size = count * 4
+        if self.shm is None or self.shm.size < size:
+            self._release_segment()
+            capacity = max(size, int(self.MAX_SECONDS * SAMPLE_RATE) * 4)
+            self.shm = shared_memory.SharedMemory(create=True, size=capacity)
+        return self.shm
+
+    def _call(self, method, audio_data, kwargs):
+        with self._lock:
+            if self.conn is None and not self._reconnect():
+                return None
+            try:
+                count = len(audio_data)
+                shm = self._segment_for(count)
+                np.ndarray((count,), dtype=np.float32, buffer=shm.buf)[:] = audio_data
+                _send(self.conn, {"op": "call", "method": method, "segment": shm.name,
+                                  "count": count, "kwargs": kwargs})
+                reply = _recv(self.conn)
+                if reply.get("status") == "ok":
+                    return _decode_result(method, reply.get("result"))
+                print(f"[ERROR] STT server: {reply.get('result')}")
+                return None
+            except (EOFError, ConnectionError, OSError, ValueError) as e:
+                self.failures += 1
+                print(f"[WARN] STT server connection lost ({e}); returning empty, reconnecting in the background")
+                self._disconnect()
+                self._release_segment()  # The server's attachment died with it
+                return None
+
+    def _disconnect(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+    def _release_segment(self):
+        if self.shm is not None:
+            try:
+                self.shm.close()
+                self.shm.unlink()
+            except Exception:
+                pass
+            self.shm = None
+
+    def shutdown_server(self):
+        """Stop the server process (normally it is left running to stay warm)."""
+        with self._lock:
+            try:
+                if self.conn is not None:
+                    _send(self.conn, {"op": "shutdown"})
+                    _recv(self.conn)
+            except Exception:
+                pass
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+            self._release_segment()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JARVIS out-of-process Whisper STT server")
+    parser.add_argument("--address", default=None, help="Unix socket path / named pipe")
+    args = parser.parse_args()
+
+    from brain.input.whisper_engine import WhisperEngine  # type: ignore
+    SttServer(WhisperEngine(), args.address).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
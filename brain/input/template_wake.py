@@ -0,0 +1,248 @@
+"""
+Dependency-free wake word: MFCC features matched against a few enrolled
+recordings of the keyword with streaming subsequence DTW.
+
+Enroll (3-5 clean recordings of "Jarvis", 16-bit WAV, plus a minute or more of
+other speech without the keyword to calibrate false wakes against):
+    python -m brain.input.template_wake enroll jarvis1.wav jarvis2.wav jarvis3.wav --negatives talk.wav
+"""
+import argparse
+import os
+import sys
+
+import numpy as np  # type: ignore
+
+from brain.input.mfcc import MfccExtractor  # type: ignore
+from brain.input.model_selector import cache_path  # type: ignore
+
+SAMPLE_RATE = 16000
+DEFAULT_THRESHOLD = 0.35  # Cosine distance per aligned frame when only one template is enrolled
+MAX_FALSE_WAKES_PER_HOUR = 2.0  # Enrollment target on the non-keyword speech it is given
+
+
+def default_template_path():
+    """JARVIS_WAKE_TEMPLATES, else next to the per-machine STT cache."""
+    return os.environ.get("JARVIS_WAKE_TEMPLATES") or \
+        os.path.join(os.path.dirname(cache_path()), "wake_templates.npz")
+
+
+def _features(extractor, samples):
+    """c1..c12 (level-invariant), unit-normalised per frame for cosine distance."""
+    feats = extractor.process(samples)[:, 1:]
+    norms = np.linalg.norm(feats, axis=1, keepdims=True)
+    return (feats / np.maximum(norms, 1e-6)).astype(np.float32)
+
+
+class StreamingDtw:
+    """
+    Subsequence DTW of a query stream against several templates at once.
+
+    All templates live in one flattened cost column, so each query frame costs a
+    single matrix-vector product plus a few vectorised element-wise ops. Steps
+    advance the template by 0, 1 or 2 frames (a slope constraint that keeps the
+    recursion free of horizontal moves, hence vectorisable), the path is free to
+    start at any query frame, and candidates are compared by average cost.
+    """
+
+    def __init__(self, templates):
+        self.templates = templates
+        self.lengths = np.array([len(t) for t in templates])
+        self.stack = np.concatenate(templates)  # (sum M, d)
+        self.starts = np.concatenate(([0], np.cumsum(self.lengths)[:-1]))
+        self.ends = self.starts + self.lengths - 1
+        size = len(self.stack)
+        self._no_step1 = np.zeros(size, dtype=bool)
+        self._no_step1[self.starts] = True
+        self._no_step2 = self._no_step1.copy()
+        self._no_step2[np.minimum(self.starts + 1, size - 1)] = True
+        self.reset()
+
+    def reset(self):
+        size = len(self.stack)
+        self.cost = np.full(size, np.inf, dtype=np.float32)
+        self.steps = np.ones(size, dtype=np.float32)
+
+    def step(self, frame):
+        """Advance by one query frame. Returns (per-template average cost, path lengths) at template ends."""
+        d = 1.0 - self.stack @ frame
+        c0, l0 = self.cost, self.steps
+        c1 = np.roll(c0, 1)
+        l1 = np.roll(l0, 1)
+        c2 = np.roll(c0, 2)
+        l2 = np.roll(l0, 2)
+        c1[self._no_step1] = np.inf
+        c2[self._no_step2] = np.inf
+
+        best_c, best_l = c0, l0
+        take = c1 / l1 < best_c / best_l
+        best_c = np.where(take, c1, best_c)
+        best_l = np.where(take, l1, best_l)
+        take = c2 / l2 < best_c / best_l
+        best_c = np.where(take, c2, best_c)
+        best_l = np.where(take, l2, best_l)
+
+        self.cost = (d + best_c).astype(np.float32)
+        self.steps = best_l + 1.0
+        self.cost[self.starts] = d[self.starts]  # Free start: a match may begin at any frame
+        self.steps[self.starts] = 1.0
+        ends = self.ends
+        return self.cost[ends] / self.steps[ends], self.steps[ends]
+
+
+class TemplateWakeBackend:
+    """
+    Wake-word backend (same interface as PorcupineBackend) matching enrolled
+    keyword templates. Fires when any template aligns with an average cosine
+    distance below the calibrated threshold and a plausible duration (0.6x -
+    1.8x the template), then stays quiet briefly. Porcupine's sensitivity has no
+    meaning for a DTW distance; `threshold_scale` (JARVIS_WAKE_TEMPLATE_SCALE)
+    is this backend's own knob: > 1 accepts more, < 1 fewer false wakes.
+    """
+
+    def __init__(self, templates, threshold=DEFAULT_THRESHOLD, threshold_scale=None,
+                 frame_length=512, refractory_ms=1000):
+        if threshold_scale is None:
+            threshold_scale = float(os.environ.get("JARVIS_WAKE_TEMPLATE_SCALE", "1.0"))
+        self.frame_length = frame_length
+        self.keyword_count = 1
+        self.threshold = threshold * threshold_scale
+        self.extractor = MfccExtractor(SAMPLE_RATE)
+        self.dtw = StreamingDtw(templates)
+        self.min_steps = 0.6 * self.dtw.lengths
+        self.max_steps = 1.8 * self.dtw.lengths
+        self.refractory = int(refractory_ms / 10)  # In 10ms feature hops
+        self._quiet = 0
+        self.best_score = np.inf  # Lowest score since the last detection (for tuning)
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        path = path or default_template_path()
+        data = np.load(path)
+        templates = np.split(data["features"], np.cumsum(data["lengths"])[:-1])
+        return cls(templates, threshold=float(data["threshold"]), **kwargs)
+
+    def process(self, frame):
+        for feature in _features(self.extractor, frame):
+            scores, steps = self.dtw.step(feature)
+            if self._quiet > 0:
+                self._quiet -= 1
+                continue
+            valid = (steps >= self.min_steps) & (steps <= self.max_steps)
+            if not valid.any():
+                continue
+            score = float(np.min(scores[valid]))
+            self.best_score = min(self.best_score, score)
+            if score < self.threshold:
+                self.dtw.reset()
+                self._quiet = self.refractory
+                self.best_score = np.inf
+                return 0
+        return -1
+
+    def reset(self):
+        """Skipped audio (energy gate closed): no features or alignments span the gap."""
+        self.extractor.reset()
+        self.dtw.reset()
+        self._quiet = 0
+
+    def delete(self):
+        pass
+
+
+def _trim(samples, ratio=0.1, pad_ms=50):
+    """Cut leading/trailing silence from an enrollment clip (10ms RMS frames)."""
+    hop = SAMPLE_RATE // 100
+    n = len(samples) // hop
+    if n == 0:
+        return samples
+    rms = np.sqrt(np.mean(samples[:n * hop].astype(np.float32).reshape(n, hop) ** 2, axis=1))
+    loud = np.nonzero(rms > ratio * rms.max())[0]
+    pad = pad_ms * SAMPLE_RATE // 1000
+    return samples[max(0, loud[0] * hop - pad):min(len(samples), (loud[-1] + 1) * hop + pad)]
+
+
+def best_alignment(template, samples):
+    """Lowest average DTW cost of `template` anywhere in `samples` (int16)."""
+    dtw = StreamingDtw([template])
+    best = np.inf
+    for feature in _features(MfccExtractor(SAMPLE_RATE), samples):
+        score, steps = dtw.step(feature)
+        if 0.6 * len(template) <= steps[0] <= 1.8 * len(template):
+            best = min(best, float(score[0]))
+    return best
+
+
+def false_wakes(templates, threshold, samples):
+    """Detections of a backend at `threshold` over `samples` (int16 speech without the keyword)."""
+    backend = TemplateWakeBackend(templates, threshold, threshold_scale=1.0)
+    n = backend.frame_length
+    return sum(backend.process(samples[i:i + n]) >= 0 for i in range(0, len(samples) - n + 1, n))
+
+
+def enroll(clips, path=None, position=0.4, negatives=None):
+    """
+    Build templates from keyword recordings (int16 arrays) and calibrate the
+    threshold between the worst cross-match of the enrollment clips (positives)
+    and the best match on negatives: non-keyword speech (`negatives`, int16
+    arrays, streamed back to back so cross-word alignments count too), plus the
+    clips time-reversed (same spectra, wrong order) and noise. `position` places
+    it between the two. Warns when the negatives would still cause more than
+    MAX_FALSE_WAKES_PER_HOUR false wakes.
+    """
+    clips = [_trim(c) for c in clips]
+    templates = [_features(MfccExtractor(SAMPLE_RATE), c) for c in clips]
+    rng = np.random.default_rng(0)
+    pad = lambda x: np.concatenate((np.zeros(SAMPLE_RATE // 4, dtype=np.int16), x,  # noqa: E731
+                                    np.zeros(SAMPLE_RATE // 4, dtype=np.int16)))
+    cross = [best_alignment(t, pad(c)) for i, t in enumerate(templates) for j, c in enumerate(clips) if i != j]
+    noise = (rng.normal(0, 1, SAMPLE_RATE) * np.std(np.concatenate(clips))).astype(np.int16)
+    speech = np.concatenate([pad(c) for c in negatives]) if negatives else None
+    hard = [best_alignment(t, pad(c[::-1].copy())) for t in templates for c in clips]
+    hard += [best_alignment(t, noise) for t in templates]
+    if speech is not None:
+        hard += [best_alignment(t, speech) for t in templates]
+    if cross:
+        positive, negative = max(cross), min(hard)
+        if negative <= positive:
+            print("[WARN] Enrollment clips match their negatives as well as each other; "
+                  "re-record them more clearly.")
+            threshold = positive
+        else:
+            threshold = positive + position * (negative - positive)
+    else:
+        threshold = DEFAULT_THRESHOLD
+
+    if speech is None:
+        print("[WARN] No negative speech given (--negatives): false wakes on other words are uncalibrated.")
+    else:
+        hours = len(speech) / SAMPLE_RATE / 3600.0
+        rate = false_wakes(templates, threshold, speech) / hours
+        if rate > MAX_FALSE_WAKES_PER_HOUR:
+            print(f"[WARN] {rate:.0f} false wakes/hour on the negatives "
+                  f"(target <= {MAX_FALSE_WAKES_PER_HOUR:.0f}); record clearer or more distinct keyword clips.")
+
+    path = path or default_template_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez(path, features=np.concatenate(templates), lengths=np.array([len(t) for t in templates]),
+             threshold=np.float32(threshold))
+    print(f"[OK] Enrolled {len(templates)} wake templates (threshold {threshold:.3f}) -> {path}")
+    return threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enroll wake-word templates for the template backend.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enroll_cmd = sub.add_parser("enroll")
+    enroll_cmd.add_argument("wavs", nargs="+", help="16-bit WAV recordings of the wake word")
+    enroll_cmd.add_argument("--out", default=None, help="template file (default: per-machine cache)")
+    enroll_cmd.add_argument("--negatives", nargs="+", default=[],
+                            help="16-bit WAVs of other speech (no wake word) to calibrate false wakes against")
+    args = parser.parse_args()
+
+    from brain.input.session_recorder import load_wav  # type: ignore
+    enroll([load_wav(p, SAMPLE_RATE) for p in args.wavs], args.out,
+           negatives=[load_wav(p, SAMPLE_RATE) for p in args.negatives])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import numpy as np  # type: ignore
+
+SPEECH_START = "speech_start"
+SPEECH_END = "speech_end"
+
+
+class VoiceActivityDetector:
+    """
+    Frame-aligned voice activity detection shared by every pipeline state.
+
+    Incoming int16 blocks of any size are framed into 10/20/30ms frames and
+    classified by webrtcvad when installed, or by a vectorised energy detector
+    against an adaptive noise floor otherwise. Onset/hangover hysteresis turns
+    the per-frame decisions into SPEECH_START / SPEECH_END events, each emitted
+    exactly once per transition.
+    """
+
+    def __init__(self,
+                 sample_rate=16000,
+                 frame_ms=30,
+                 aggressiveness=2,
+                 onset_ms=90,
+                 hangover_ms=300,
+                 min_rms=0.005,
+                 floor_ratio=3.0,
+                 floor_alpha=0.05,
+                 use_webrtc=True):
+
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_length = sample_rate * frame_ms // 1000
+
+        self.webrtc = None
+        if use_webrtc:
+            try:
+                import webrtcvad  # type: ignore
+                self.webrtc = webrtcvad.Vad(aggressiveness)  # Level 2 = Balance of fast/accurate
+                print("[OK] WebRTC VAD Loaded.")
+            except ImportError:
+                print("[WARN] WebRTC VAD not found, falling back to energy VAD.")
+
+        # Hysteresis
+        self.onset_frames = max(1, -(-onset_ms // frame_ms))
+        self.hangover_frames = max(1, -(-hangover_ms // frame_ms))
+
+        # Energy detector / noise floor (normalised RMS)
+        self.min_rms = min_rms
+        self.floor_ratio = floor_ratio
+        self.floor_alpha = floor_alpha
+        self.noise_floor = min_rms / floor_ratio
+
+        self._staging = np.zeros(self.frame_length * 8, dtype=np.int16)
+        self._fill = 0
+
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self.last_rms = 0.0
+        self.frames = 0  # Frames classified since construction
+
+    @property
+    def hangover_ms(self):
+        return self.hangover_frames * self.frame_ms
+
+    def set_hangover(self, ms):
+        """Change how much trailing silence ends speech (takes effect immediately)."""
+        self.hangover_frames = max(1, -(-int(ms) // self.frame_ms))
+
+    @property
+    def pending_samples(self):
+        """Samples fed but not yet classified (less than one frame)."""
+        return self._fill
+
+    @property
+    def silence_ms(self):
+        """Trailing non-speech duration seen so far."""
+        return self._silence_run * self.frame_ms
+
+    def reset(self, in_speech=False):
+        """
+        Restart hysteresis (noise floor is kept). `in_speech=True` makes the next
+        `hangover` of silence emit SPEECH_END even if no onset is seen first.
+        """
+        self._fill = 0
+        self.in_speech = in_speech
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def process(self, chunk):
+        """Feed an int16 block. Returns the list of events it caused (usually empty)."""
+        n = len(chunk)
+        if self._fill + n > len(self._staging):
+            grown = np.zeros(self._fill + n + self.frame_length, dtype=np.int16)
+            grown[:self._fill] = self._staging[:self._fill]
+            self._staging = grown
+        self._staging[self._fill:self._fill + n] = chunk
+        self._fill += n
+
+        count = self._fill // self.frame_length
+        if count == 0:
+            return []
+
+        frames = self._staging[:count * self.frame_length].reshape(count, self.frame_length)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)) / np.float32(32768.0)
+
+        events = []
+        for i in range(count):
+            event = self._update(self._classify(frames[i], float(rms[i])))
+            if event:
+                events.append(event)
+
+        remainder = self._fill - count * self.frame_length
+        self._staging[:remainder] = self._staging[count * self.frame_length:self._fill]
+        self._fill = remainder
+        return events
+
+    def _classify(self, frame, rms):
+        self.frames += 1
+        self.last_rms = rms
+        threshold = max(self.min_rms, self.noise_floor * self.floor_ratio)
+
+        if self.webrtc is not None:
+            try:
+                speech = self.webrtc.is_speech(frame.tobytes(), self.sample_rate)
+            except Exception:
+                speech = rms >= threshold
+        else:
+            speech = rms >= threshold
+
+        if not speech:
+            # Track the background level only while nobody is talking
+            self.noise_floor += self.floor_alpha * (rms - self.noise_floor)
+        return speech
+
+    def _update(self, speech):
+        if speech:
+            self._speech_run += 1
+            self._silence_run = 0
+            if not self.in_speech and self._speech_run >= self.onset_frames:
+                self.in_speech = True
+                return SPEECH_START
+        else:
+            self._silence_run += 1
+            self._speech_run = 0
+            if self.in_speech and self._silence_run >= self.hangover_frames:
+                self.in_speech = False
+                return SPEECH_END
+        return None
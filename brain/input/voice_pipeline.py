@@ -1,13 +1,59 @@
 from brain.input.stream_handler import StreamHandler  # type: ignore
 from brain.input.wake_word import WakeWordEngine  # type: ignore
-from brain.input.whisper_engine import WhisperEngine  # type: ignore
+from brain.input.audio_buffer import AudioAccumulator  # type: ignore
+from brain.input.stt_scheduler import SttScheduler  # type: ignore
+from brain.input.endpointer import Endpointer, INCOMPLETE  # type: ignore
+from brain.input.vad import VoiceActivityDetector, SPEECH_START, SPEECH_END  # type: ignore
+from brain.input.confidence import BeamEscalator, TranscriptResult, ESCALATION_BEAM  # type: ignore
+from brain.input.dictation import DictationSession, LiveDictationSession  # type: ignore
+from brain.input.speaker_verify import SpeakerProfile, SpeakerVerifier, default_profile_path  # type: ignore
+from brain.utils.audio_envelope import SOURCE_MIC, SOURCE_TTS, compute_envelope  # type: ignore
+from brain.ws_publisher import ENVELOPE_TOPIC  # type: ignore
+from brain.events import new_interaction_id, set_interaction_id  # type: ignore
+from brain.tracing import tracer  # type: ignore
 import asyncio
+import json
 import numpy as np  # type: ignore
 import time
 import sys
 import os
 import queue
 
+try:
+    from brain.utils import tts  # type: ignore
+except ImportError:
+    tts = None
+
+_INTERRUPT_PHRASES = ("enough jarvis", "shut up")
+_DICTATION_PHRASES = ("start dictation", "begin dictation", "dictation mode", "take a note", "take a long note")
+_LIVE_DICTATION_PHRASES = ("live dictation", "type as i speak", "type as i talk")
+
+
+def _is_interrupt(text):
+    """'stop' near the end, or an explicit interrupt phrase."""
+    lower = text.lower()
+    return "stop" in lower.split()[-2:] or any(p in lower for p in _INTERRUPT_PHRASES)
+
+
+def _dictation_mode(text):
+    """'live', 'batch', or None when `text` doesn't ask for dictation."""
+    lower = " ".join(text.lower().replace(".", " ").replace(",", " ").split())
+    if any(p in lower for p in _LIVE_DICTATION_PHRASES):
+        return "live"
+    if any(lower.startswith(p) or lower.endswith(p) for p in _DICTATION_PHRASES):
+        return "batch"
+    return None
+
+
+def _echo_overlap(text, spoken):
+    """Fraction of the words in `text` that also occur in what TTS is saying."""
+    words = [w.strip(".,!?'\"") for w in text.lower().split()]
+    words = [w for w in words if w]
+    if not words or not spoken:
+        return 0.0
+    said = {w.strip(".,!?'\"") for w in spoken.lower().split()}
+    return sum(w in said for w in words) / len(words)
+
 
 def _resolve_path(relative_path):
     """Resolve a relative path for both normal and PyInstaller frozen mode."""
@@ -25,52 +71,48 @@ WAKE_DETECTED = "WAKE_DETECTED"
 LISTENING_STREAMING = "LISTENING_STREAMING"
 PROCESSING_FINAL = "PROCESSING_FINAL"
 EXECUTING = "EXECUTING"
+DICTATING = "DICTATING"
 
 
 class VoicePipeline:
-    def __init__(self, orchestrator):
+    def __init__(self, orchestrator, stream=None, wake_detector=None, whisper=None):
+        """`stream`, `wake_detector` and `whisper` default to the live devices/models;
+        the replay harness injects ReplayStreamHandler / LabelledWakeEngine instead."""
         self.orchestrator = orchestrator
         self.state = IDLE
 
-        # GPU detection
-        try:
-            import torch  # type: ignore
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            compute_type = "float16" if device == "cuda" else "int8"
-        except Exception:
-            device = "cpu"
-            compute_type = "int8"
-
-        self.stream = StreamHandler()
-
-        # WebRTC VAD
-        try:
-            import webrtcvad # type: ignore
-            self.vad = webrtcvad.Vad(2)  # Level 2 = Balance of fast/accurate
-            self.use_webrtc = True
-            print("[OK] WebRTC VAD Loaded.")
-        except ImportError:
-            self.use_webrtc = False
-            print("[WARN] WebRTC VAD not found, falling back to RMS.")
-
-        self.vad_buffer = bytearray()
+        self.stream = stream or StreamHandler()
+        self._publisher = None  # UI publisher for mic envelopes (set in run)
 
         # Wake Word — sensitivity raised to 0.8 for better low-voice detection
-        self.wake_detector = WakeWordEngine(
+        self.wake_detector = wake_detector or WakeWordEngine(
             access_key="KL0iKRnxM2/KEs6Vd/ajFwp6kyHoIWi4BeT6i1dyjG8t58TvgMDVUg==",
             keyword_paths=[_resolve_path("brain/input/wake_word/JARVIS_en_windows_v4_0_0.ppn")],
             sensitivity=0.85
         )
-        self.whisper = WhisperEngine()
-
-        self.audio_buffer = []
-        self.silence_start_time = 0.0
-        self.last_partial_time = 0.0
+        self.whisper = whisper or self._create_whisper()
+
+        # Optional raw-audio session recording for replay (JARVIS_RECORD_DIR=<dir>)
+        self.recorder = None
+        record_dir = os.environ.get("JARVIS_RECORD_DIR")
+        if record_dir:
+            from brain.input.session_recorder import SessionRecorder  # type: ignore
+            self.recorder = SessionRecorder(self.stream, record_dir)
+
+        # Utterance audio: preallocated float32, zero-copy views for decoding
+        self.audio_buffer = AudioAccumulator(sample_rate=self.stream.sample_rate)
+        self.transcript = None  # Incremental (stable-prefix) transcript of the current utterance
         self.wake_time = 0.0
         self.WAKE_GRACE_PERIOD_SEC = 0.0  # Removed to eliminate delays
         self.SILENCE_THRESHOLD_MS = 300  # 300ms instant reaction to pause
-        self.SILENCE_RMS = 0.005  # Lowered from 0.015 to properly detect silence (mic idle is 0.000015)
-        self.PARTIAL_INTERVAL_MS = 300  # Fast partial updates
+        self.FAST_ENDPOINT_MS = 150  # Partial already resolves to a skill
+        self.EXTENDED_ENDPOINT_MS = 800  # Partial looks unfinished ("open the...")
+        self.SILENCE_RMS = 0.005  # Energy-VAD floor (mic idle is 0.000015)
+        self.SPEECH_ONSET_MS = 90  # Speech needed before a session follow-up re-enters listening
+        self.PREROLL_SEC = 1.5  # Max audio before the listening transition seeded into the utterance
+        self.PARTIAL_INTERVAL_MS = 300  # Starting partial interval; adapts to measured decode time
+        self.ECHO_OVERLAP = 0.6  # Final transcript mostly made of TTS words while speaking = our own echo
+        self.NEAR_END_BLOCKS = 4  # AEC double-talk flag this recent (~120ms) = the user, not echo
         self.SESSION_TIMEOUT_SEC = 15.0
         self.session_expiry_time = 0.0
 
@@ -78,9 +120,88 @@ class VoicePipeline:
         self.session_active = False
         self.session_timeout = 0.0
         self.SESSION_WINDOW_SEC = 10.0  # 10 seconds after last command
-        self.SESSION_REENTRY_RMS = 0.04  # Much higher than silence — requires real speech
-        self.session_speech_count = 0  # Consecutive loud chunks needed to re-enter
-        self.SESSION_SPEECH_REQUIRED = 3  # Need 3 consecutive loud chunks
+
+        # Semantic endpointing: silence window tuned per utterance from the partials
+        self.endpointer = Endpointer(
+            getattr(orchestrator, "arbitration", None),
+            base_ms=self.SILENCE_THRESHOLD_MS,
+            fast_ms=self.FAST_ENDPOINT_MS,
+            extended_ms=self.EXTENDED_ENDPOINT_MS
+        )
+        self._partial_covered = 0  # Utterance samples the latest partial has seen
+        self._partial_tasks = set()  # In-flight partial decodes (kept referenced until done)
+        self.speculation = getattr(orchestrator, "speculation", None)  # Acts on partials early
+
+        # Tracing: one interaction id per wake, stage spans from wake to action
+        self.interaction_id = None
+        self._interaction_span = None
+        self._listen_span = None
+
+        # All Whisper decodes run on one dedicated thread: finals pre-empt partials
+        self.stt = SttScheduler(initial_interval_ms=self.PARTIAL_INTERVAL_MS)
+
+        # Long-form dictation: VAD segments decoded in batches, typed as they finish
+        self.dictation = None
+        self.DICTATION_SEGMENT_SILENCE_MS = 700  # Sentence pause that closes a segment
+        self.DICTATION_MAX_SEGMENT_SEC = 25.0  # Stay inside Whisper's 30s window
+        self.DICTATION_BATCH = 8
+        self.DICTATION_IDLE_SEC = 20.0  # Silence that ends dictation mode
+        self._typed_any = False
+
+        # Unsure / CLARIFY-band finals get a wider-beam second decode
+        self.ESCALATION_BEAM = ESCALATION_BEAM
+        self.escalator = BeamEscalator(self.whisper, self.stt, getattr(orchestrator, "arbitration", None),
+                                       beam_size=self.ESCALATION_BEAM)
+
+        # Speaker verification (memory.json voice_auth_enabled + an enrolled profile):
+        # the start of each wake/session utterance is scored before Whisper decodes it
+        self.SPEAKER_VERIFY_SEC = 0.5
+        self.SPEAKER_VERIFY_TRIES = 3  # Windows tried when one has too little voicing to judge
+        self.verifier = self._create_verifier()
+        self._verify_at = 0  # Utterance length (samples) of the next check; 0 = verified / not needed
+        self._verify_tries = 0
+
+        # One VAD for every state: session re-entry (speech start) and end of
+        # utterance (speech end) share framing, hysteresis and the noise floor
+        self.vad = VoiceActivityDetector(
+            sample_rate=self.stream.sample_rate,
+            onset_ms=self.SPEECH_ONSET_MS,
+            hangover_ms=self.SILENCE_THRESHOLD_MS,
+            min_rms=self.SILENCE_RMS
+        )
+
+    def _create_whisper(self):
+        """In-process model, or the shared STT server process (JARVIS_STT_MODE=server)."""
+        if os.environ.get("JARVIS_STT_MODE", "inprocess").lower() == "server":
+            try:
+                from brain.input.stt_server import RemoteWhisperEngine  # type: ignore
+                return RemoteWhisperEngine()
+            except Exception as e:
+                print(f"[WARN] STT server unavailable ({e}), loading Whisper in-process.")
+        from brain.input.whisper_engine import WhisperEngine  # type: ignore
+        return WhisperEngine()
+
+    def _create_verifier(self):
+        """SpeakerVerifier when voice auth is enabled in memory.json and a profile is enrolled."""
+        try:
+            with open(_resolve_path("memory.json"), "r", encoding="utf-8") as f:
+                enabled = bool(json.load(f).get("voice_auth_enabled", False))
+        except (OSError, ValueError):
+            enabled = False
+        if not enabled:
+            return None
+        path = default_profile_path()
+        if not os.path.exists(path):
+            print(f"[WARN] Voice auth enabled but no voice profile at {path} "
+                  "(enroll: python -m brain.input.speaker_verify enroll <wavs>)")
+            return None
+        try:
+            verifier = SpeakerVerifier(SpeakerProfile.load(path), self.stream.sample_rate, self.SPEAKER_VERIFY_SEC)
+            print(f"[OK] Speaker verification on (threshold {verifier.profile.threshold:.2f})")
+            return verifier
+        except Exception as e:
+            print(f"[WARN] Voice profile load failed ({e}); speaker verification off.")
+            return None
 
     async def force_listen(self):
         """Force-enter listening mode — bypasses wake word (triggered by UI Key 2)."""
@@ -88,73 +209,147 @@ class VoicePipeline:
             return  # Already listening
 
         print("[FORCE] Bypassing wake word — entering LISTENING mode")
+        self._begin_interaction("force_key")
         await self.orchestrator.bus.emit("WAKE_WORD_DETECTED", {"word": "force_key"})
-
-        self.state = LISTENING_STREAMING
-        self.audio_buffer = []
-        self.vad_buffer.clear()
-        self.silence_start_time = 0.0
-        self.wake_time = time.time()
-        self.last_partial_time = time.time()
-        self.stream.enable_stt()
+        self._enter_listening(verify=False)  # A key press is the user
 
         # Start/extend session window
         self.session_active = True
         self.session_timeout = time.time() + self.SESSION_WINDOW_SEC
 
+    def _begin_interaction(self, trigger):
+        """New interaction id (bound to this task's context) and its top-level spans."""
+        self._end_interaction()
+        self.interaction_id = new_interaction_id()
+        set_interaction_id(self.interaction_id)
+        self._interaction_span = tracer.span("interaction", trigger=trigger)
+        self._listen_span = tracer.span("listen")
+
+    async def _finish_interaction(self):
+        """Close the interaction's spans and publish the rolling stage percentiles."""
+        self._end_interaction()
+        await tracer.publish(self.orchestrator.bus)
+
+    def _end_interaction(self):
+        if self._listen_span is not None:
+            self._listen_span.end(cause="abandoned")
+            self._listen_span = None
+        if self._interaction_span is not None:
+            self._interaction_span.end()
+            self._interaction_span = None
+
+    def _preroll_start(self, lag_samples):
+        """
+        Bus position to seed the utterance from: `lag_samples` before the wake reader's
+        cursor (i.e. where the keyword ended / speech started), at most PREROLL_SEC back.
+        """
+        cursor = self.stream.wake_reader.cursor
+        limit = int(self.PREROLL_SEC * self.stream.sample_rate)
+        return cursor - min(lag_samples, limit)
+
+    def _enter_listening(self, start=None, verify=True):
+        """
+        Common IDLE -> LISTENING_STREAMING transition (wake word, session, force key).
+        `start` seeds the utterance with already-captured audio from that bus position.
+        `verify` scores the speaker once SPEAKER_VERIFY_SEC of audio is in (if enabled).
+        """
+        self.state = LISTENING_STREAMING
+        self._verify_at = self.verifier.verify_samples if verify and self.verifier else 0
+        self._verify_tries = 0
+        self.audio_buffer.reset()
+        self.transcript = self.whisper.start_stream()
+        # Treat the user as already talking: SILENCE_THRESHOLD_MS of quiet ends the utterance
+        self.vad.reset(in_speech=True)
+        self.vad.set_hangover(self.endpointer.reset())
+        self._partial_covered = 0
+        if self.speculation:
+            self.speculation.cancel()
+        self.wake_time = time.time()
+        self.stt.restart_partials()
+        self.stream.enable_stt(start)
+        if start is not None:
+            seeded = self.stream.stt_reader.available()
+            print(f"[PREROLL] Seeded {seeded * 1000 // self.stream.sample_rate}ms of captured audio")
+
     async def run(self):
         print("[START] Voice Pipeline Starting (2056 Mode - Streaming)...")
+        self._attach_envelope_stream()
+        self.stream.attach_loop(asyncio.get_running_loop())
         self.stream.start_stream()
+        if self.recorder:
+            self.recorder.start()
 
+        # Event-driven: sleep until the audio thread hands over blocks (or a timer
+        # such as the listening failsafe is due), then drain everything buffered.
         while True:
-            if self.state == IDLE:
-                await self._handle_idle()
-            elif self.state == LISTENING_STREAMING:
-                await self._handle_listening_streaming()
-            elif self.state == PROCESSING_FINAL:
-                await self._handle_processing_final()
-            await asyncio.sleep(0.01)
+            await self.stream.wait_for_audio(self._next_timeout())
+            if self.interaction_id is not None:
+                set_interaction_id(self.interaction_id)  # force_listen binds it from another task
+            self._publish_mic_envelope()
+            while await self._step():
+                pass
+
+    async def _step(self):
+        """Run one state-machine step. Returns False once the buffered audio is consumed."""
+        if self.state == IDLE:
+            return await self._handle_idle()
+        elif self.state == LISTENING_STREAMING:
+            return await self._handle_listening_streaming()
+        elif self.state == PROCESSING_FINAL:
+            await self._handle_processing_final()
+            return True
+        elif self.state == DICTATING:
+            return await self._handle_dictating()
+        return False
+
+    def _next_timeout(self):
+        """Seconds until the next timer-driven transition, or None to wait for audio only."""
+        if self.state == LISTENING_STREAMING and self.wake_time > 0:
+            return max(0.0, self.wake_time + 10.0 - time.time())
+        if self.state == DICTATING and self.dictation is not None:
+            return max(0.0, self.dictation.last_speech + self.DICTATION_IDLE_SEC - time.time())
+        return None
+
+    def _attach_envelope_stream(self):
+        """Stream mic and TTS amplitude envelopes to the UI as binary frames."""
+        publisher = getattr(self.orchestrator, "ws_publisher", None)
+        if publisher is None:
+            return
+        self._publisher = publisher
+        if tts is not None:
+            tts.on_envelope = publisher.envelope_sink(SOURCE_TTS)
+
+    def _publish_mic_envelope(self):
+        """Visualizer consumer of the audio bus: one envelope frame per wake-up."""
+        reader = self.stream.visual_reader
+        if self._publisher is None or not self._publisher.has_subscribers(ENVELOPE_TOPIC):
+            reader.seek_to_now()
+            return
+        samples = reader.read_available()
+        if len(samples):
+            self._publisher.send_envelope(SOURCE_MIC, compute_envelope(samples))
 
     async def _handle_idle(self):
+        """Consume one wake-word block. Returns False when no audio is buffered."""
         try:
             chunk = self.stream.get_wake_word_chunk(block=False)
+        except queue.Empty:
+            return False
+        try:
             if chunk is not None:
                 # Check for session window — if active, detect speech without wake word
                 if self.session_active and time.time() < self.session_timeout:
-                    is_speech = False
-                    
-                    if getattr(self, 'use_webrtc', False):
-                        self.vad_buffer.extend(chunk.tobytes())
-                        while len(self.vad_buffer) >= 960:
-                            frame = bytes(self.vad_buffer[:960])  # type: ignore
-                            self.vad_buffer = self.vad_buffer[960:]  # type: ignore
-                            try:
-                                if self.vad.is_speech(frame, 16000):
-                                    is_speech = True
-                            except Exception:
-                                pass
-                    else:
-                        chunk_float = chunk.astype(np.float32) / 32768.0
-                        rms = np.sqrt(np.mean(chunk_float ** 2))
-                        if rms > self.SESSION_REENTRY_RMS:
-                            is_speech = True
-
-                    if is_speech:
-                        self.session_speech_count += 1
-                        if self.session_speech_count >= self.SESSION_SPEECH_REQUIRED:
-                            print(f"[SESSION] Re-entering listening (WebRTC Speech Detected)")
-                            await self.orchestrator.bus.emit("WAKE_WORD_DETECTED", {"word": "session"})
-                            self.state = LISTENING_STREAMING
-                            self.audio_buffer = []
-                            self.vad_buffer.clear()
-                            self.silence_start_time = 0.0
-                            self.wake_time = time.time()
-                            self.last_partial_time = time.time()
-                            self.stream.enable_stt()
-                            self.session_speech_count = 0
-                            return
-                    else:
-                        self.session_speech_count = 0  # Reset — need consecutive chunks
+                    started = SPEECH_START in self.vad.process(chunk)
+                    if started and self._echo_only():
+                        self.vad.reset()  # Residual TTS echo, not the user: let the next onset fire
+                    elif started:
+                        print("[SESSION] Re-entering listening (VAD speech start)")
+                        self._begin_interaction("session")
+                        await self.orchestrator.bus.emit("WAKE_WORD_DETECTED", {"word": "session"})
+                        # Include the onset the VAD needed to confirm speech (+1 frame margin)
+                        onset = (self.SPEECH_ONSET_MS + self.vad.frame_ms) * self.stream.sample_rate // 1000
+                        self._enter_listening(self._preroll_start(onset + self.vad.pending_samples))
+                        return True
 
                 # Check session timeout
                 if self.session_active and time.time() >= self.session_timeout:
@@ -165,30 +360,33 @@ class VoicePipeline:
                 prediction = self.wake_detector.detect(chunk)
                 if prediction >= 0:
                     print(f"[WAKE] State: IDLE -> WAKE_DETECTED (Wake Word: {prediction})")
+                    self._barge_in()
+                    if self.recorder:
+                        keyword_end = self.stream.wake_reader.cursor - self.wake_detector.detection_lag
+                        self.recorder.mark("wake", keyword_end, word=prediction)
+                    self._begin_interaction(prediction)
                     await self.orchestrator.bus.emit("WAKE_WORD_DETECTED", {"word": prediction})
-
-                    self.state = LISTENING_STREAMING
-                    self.audio_buffer = []
-                    self.vad_buffer.clear()
-                    self.silence_start_time = 0.0
-                    self.wake_time = time.time()
-                    self.last_partial_time = time.time()
-                    self.stream.enable_stt()
+                    # Speech right after the keyword ("Jarvis open chrome") is already on
+                    # the bus: start the utterance at the keyword end instead of "now"
+                    self._enter_listening(self._preroll_start(self.wake_detector.detection_lag))
 
                     # Start/extend session window
                     self.session_active = True
                     self.session_timeout = time.time() + self.SESSION_WINDOW_SEC
         except Exception:
             pass
+        return True
 
     async def _handle_listening_streaming(self):
+        """Consume one STT block. Returns False when no audio is buffered."""
         # Failsafe: Max listen timeout of 10 seconds to prevent getting stuck
-        # Must be checked on every loop iteration, even if chunk is None
+        # Must be checked on every step, even if chunk is None (run() wakes up for it)
         if self.wake_time > 0 and (time.time() - self.wake_time) > 10.0:
             print("[TIMEOUT] Max 10s listening limit reached -> PROCESSING_FINAL")
             self.state = PROCESSING_FINAL
             self.stream.disable_stt()
-            return
+            await self._emit_endpoint("timeout")
+            return True
 
         try:
             chunk = self.stream.get_stt_chunk(block=False)
@@ -199,80 +397,146 @@ class VoicePipeline:
             chunk = None
 
         if chunk is not None:
-            chunk_float = chunk.astype(np.float32) / 32768.0
-            self.audio_buffer.append(chunk_float)
-
-            is_speaking = False
-
-            # VAD Check (WebRTC or RMS Fallback)
-            if getattr(self, 'use_webrtc', False):
-                self.vad_buffer.extend(chunk.tobytes())
-                # WebRTC strictly operates on 10, 20 or 30ms (16000Hz 30ms = 960 bytes)
-                while len(self.vad_buffer) >= 960:
-                    frame = bytes(self.vad_buffer[:960])  # type: ignore
-                    self.vad_buffer = self.vad_buffer[960:]  # type: ignore
-                    try:
-                        if self.vad.is_speech(frame, 16000):
-                            is_speaking = True
-                    except Exception:
-                        pass
-                
-                if len(self.audio_buffer) % 10 == 0:
-                    print(f"[DEBUG VAD] WebRTC Speaking: {is_speaking}")
-            else:
-                rms = np.sqrt(np.mean(chunk_float ** 2))
-                if len(self.audio_buffer) % 10 == 0:
-                    print(f"[DEBUG VAD] Current RMS: {rms:.6f} | Target Silence < {self.SILENCE_RMS}")
-                if rms >= self.SILENCE_RMS:
-                    is_speaking = True
-
-            # Fast VAD Silence check
-            if not is_speaking:
-                if self.silence_start_time == 0.0:
-                    self.silence_start_time = time.time()
-
-                if (time.time() - self.silence_start_time) > (self.SILENCE_THRESHOLD_MS / 1000.0):
-                    print("[SILENCE] Silence Detected -> PROCESSING_FINAL")
-                    self.state = PROCESSING_FINAL
-                    self.stream.disable_stt()
-                    self.vad_buffer.clear()
-                    return
-            else:
-                self.silence_start_time = 0.0
-
-                # Periodic Partial Transcription
-                if (time.time() - self.last_partial_time) > (self.PARTIAL_INTERVAL_MS / 1000.0):
-                    self.last_partial_time = time.time()
-
-                    current_audio = np.concatenate(self.audio_buffer)
+            self.audio_buffer.append_int16(chunk)
+
+            # Someone else talking: stop before any Whisper decode of this utterance
+            if self._verify_at and len(self.audio_buffer) >= self._verify_at:
+                if not await self._verify_speaker():
+                    await self._finish_interaction()
+                    return True
+
+            if SPEECH_END in self.vad.process(chunk):
+                self.endpointer.record_endpoint()
+                print(f"[SILENCE] {self.vad.silence_ms}ms silence ({self.endpointer.state}: "
+                      f"{self.endpointer.reason or 'fixed window'}) -> PROCESSING_FINAL")
+                self.state = PROCESSING_FINAL
+                self.stream.disable_stt()
+                await self._emit_endpoint(self.endpointer.state)
+                return True
+
+            # Periodic Partial Transcription (never blocks audio consumption). Once the
+            # user pauses, one immediate partial covering all speech feeds the endpointer.
+            # No decode at all until the speaker is verified (a quiet start defers the check).
+            if self.vad.in_speech and not self._verify_at:
+                speaking = self.vad.silence_ms == 0
+                speech_end = len(self.audio_buffer) - self.vad.silence_ms * self.stream.sample_rate // 1000
+                probe = not speaking and self._partial_covered < speech_end
+                if (speaking or probe) and self.stt.partial_due(force=probe):
+                    current_audio = self.audio_buffer.view()
                     if len(current_audio) > 8000:
-                        loop = asyncio.get_event_loop()
-                        partial_text = await loop.run_in_executor(None, self.whisper.transcribe_partial, current_audio)
-
-                        if partial_text:
-                            par_lower = partial_text.lower()
-                            if "stop" in par_lower.split()[-2:] or "enough jarvis" in par_lower or "shut up" in par_lower:
-                                print(f"[INTERRUPT] INTERRUPT DETECTED: '{partial_text}'")
-                                await self.orchestrator.bus.emit("INTERRUPT_SIGNAL", {})
-                                self.state = IDLE
-                                self.stream.disable_stt()
-                                return
-
-                            await self.orchestrator.bus.emit("PARTIAL_TRANSCRIPT", {"text": partial_text})
-        
-        # Always sleep a tiny bit to prevent 100% CPU loops if empty
-        await asyncio.sleep(0.01)
+                        self._partial_covered = len(current_audio)
+                        self._spawn_partial(self._run_partial(self.transcript, current_audio, probe))
+
+        return chunk is not None
+
+    async def _emit_endpoint(self, cause):
+        """End of utterance: which rule ended it and where (bus position) for timing."""
+        if self._listen_span is not None:
+            self._listen_span.end(cause=cause, utterance_ms=len(self.audio_buffer) * 1000 // self.stream.sample_rate)
+            self._listen_span = None
+        await self.orchestrator.bus.emit("ENDPOINT", {
+            "cause": cause,
+            "reason": self.endpointer.reason,
+            "silence_ms": self.vad.silence_ms,
+            "utterance_ms": len(self.audio_buffer) * 1000 // self.stream.sample_rate,
+            "position": self.stream.stt_reader.cursor,
+        })
+
+    async def _verify_speaker(self, final=False):
+        """
+        Score the latest SPEAKER_VERIFY_SEC of the utterance. Returns False (and drops
+        the utterance) on a mismatch. A window with too little voicing is retried on
+        the next one, up to SPEAKER_VERIFY_TRIES, then the utterance is let through.
+        """
+        audio = self.audio_buffer.view()
+        end = min(self._verify_at, len(audio))
+        accepted, distance = self.verifier.check(audio[max(0, end - self.verifier.verify_samples):end])
+        self._verify_tries += 1
+        if distance is None and not final and self._verify_tries < self.SPEAKER_VERIFY_TRIES:
+            self._verify_at += self.verifier.verify_samples
+            return True
+        self._verify_at = 0
+        if accepted:
+            return True
+
+        print(f"[VOICE-AUTH] Speaker mismatch (distance {distance:.2f} > {self.verifier.profile.threshold:.2f}) "
+              f"-> utterance dropped before decoding")
+        self.state = IDLE
+        self.stream.disable_stt()
+        self.stream.clear_wake_word_queue()  # Don't scan (or wake on) the stranger's buffered audio
+        self.transcript = None
+        if self.speculation:
+            self.speculation.cancel()
+        # Wait for this speaker to pause before a session follow-up can re-enter
+        self.vad.reset(in_speech=True)
+        if self._listen_span is not None:
+            self._listen_span.end(cause="speaker_rejected")
+            self._listen_span = None
+        await self.orchestrator.bus.emit("SPEAKER_REJECTED", {
+            "distance": round(distance, 3),
+            "threshold": round(self.verifier.profile.threshold, 3),
+            "utterance_ms": len(audio) * 1000 // self.stream.sample_rate,
+            **self.verifier.stats,
+        })
+        return False
+
+    def _spawn_partial(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._partial_tasks.add(task)
+        task.add_done_callback(self._partial_done)
+
+    def _partial_done(self, task):
+        self._partial_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[STT] Partial failed: {task.exception()!r}")
+
+    async def _run_partial(self, transcript, audio, probe=False):
+        with tracer.span("stt.partial", probe=probe):
+            partial_text = await self.stt.partial(transcript.update, audio)
+
+        # Superseded, or the utterance already ended while decoding
+        if not partial_text or transcript is not self.transcript or self.state != LISTENING_STREAMING:
+            return
+
+        if _is_interrupt(partial_text):
+            print(f"[INTERRUPT] INTERRUPT DETECTED: '{partial_text}'")
+            self._barge_in()
+            await self.orchestrator.bus.emit("INTERRUPT_SIGNAL", {})
+            self.state = IDLE
+            self.vad.reset()
+            self.stream.disable_stt()
+            if self.speculation:
+                self.speculation.cancel()
+            await self._finish_interaction()
+            return
+
+        # Shorten the silence window for complete commands, extend it for unfinished ones
+        self.vad.set_hangover(self.endpointer.update(partial_text))
+
+        # Speculate: prepare the skill / warm or pre-dispatch the LLM. A probe partial
+        # (taken at a pause) that doesn't look unfinished is stable enough to dispatch on.
+        if self.speculation:
+            self.speculation.on_partial(partial_text, stable=probe and self.endpointer.state != INCOMPLETE)
+
+        await self.orchestrator.bus.emit("PARTIAL_TRANSCRIPT", {"text": partial_text})
 
     async def _handle_processing_final(self):
+        try:
+            await self._process_final()
+        finally:
+            await self._finish_interaction()
+
+    async def _process_final(self):
         print("[THINKING] Processing Final Audio...")
+        self.vad.reset()  # Session follow-ups need a fresh speech onset
 
-        if not self.audio_buffer:
+        if len(self.audio_buffer) == 0:
             print("[WARN] Empty Buffer. Resetting.")
             self.state = IDLE
             return
 
-        # Concatenate buffer
-        full_audio = np.concatenate(self.audio_buffer)
+        # Zero-copy view of the whole utterance
+        full_audio = self.audio_buffer.view()
 
         # Skip very short audio (< 0.5s at 16kHz) — likely noise
         if len(full_audio) < 4800:
@@ -280,27 +544,62 @@ class VoicePipeline:
             self.state = IDLE
             return
 
-        # Run Whisper
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(None, self.whisper.transcribe, full_audio)
+        # Utterance ended before the verification window filled: judge what there is
+        if self._verify_at and not await self._verify_speaker(final=True):
+            return
+
+        # Run Whisper — only the tail after the committed prefix is decoded again
+        transcript = self.transcript or self.whisper.start_stream()
+        with tracer.span("stt.final", audio_sec=round(len(full_audio) / self.stream.sample_rate, 2)):
+            text = await self.stt.final(transcript.finish, full_audio) or ""
+        print(f"[STT] {transcript.decodes} decodes, {transcript.decoded_seconds:.1f}s audio "
+              f"for a {len(full_audio) / self.stream.sample_rate:.1f}s utterance "
+              f"(queued {self.stt.final_wait_ms:.0f}ms, partial interval {self.stt.partial_interval * 1000:.0f}ms)")
+        # Fast path unless the greedy decode is unsure or would end in CLARIFY
+        result = await self.escalator.refine(transcript.result or TranscriptResult(text), full_audio)
+        text = result.text
+        await self.orchestrator.bus.emit("FINAL_TRANSCRIPT", {
+            "text": text.strip(),
+            **result.to_dict(),
+            "escalation_rate": round(self.escalator.stats["escalated"] / self.escalator.stats["finals"], 3),
+            "decodes": transcript.decodes,
+            "decoded_sec": round(transcript.decoded_seconds, 2),
+            "queued_ms": round(self.stt.final_wait_ms, 1),
+        })
 
         if text.strip():
             safe_text = text.encode('ascii', errors='replace').decode('ascii')
             print(f"[USER] User said (Final): '{safe_text}'")
 
-            # Pause mic stream so TTS can output cleanly
-            self.stream.pause_stream()
+            # The mic stays open while JARVIS talks (echo cancelled): residual echo that
+            # still got transcribed is mostly JARVIS's own words — drop it
+            if tts is not None and tts.is_speaking and \
+                    _echo_overlap(text, tts.current_text) >= self.ECHO_OVERLAP:
+                print("[ECHO] Transcript matches current TTS output. Ignoring.")
+                self.stream.clear_wake_word_queue()
+                self.state = IDLE
+                return
+
+            mode = _dictation_mode(text)
+            if mode:
+                self._barge_in()
+                await self._enter_dictation(live=mode == "live")
+                return
+
+            if _is_interrupt(text):
+                print(f"[INTERRUPT] Barge-in: '{safe_text}'")
+                self._barge_in()
+                await self.orchestrator.bus.emit("INTERRUPT_SIGNAL", {})
+                self.stream.clear_wake_word_queue()
+                self.state = IDLE
+                return
+
+            # A new command replaces whatever JARVIS is still saying
+            self._barge_in()
 
             # Send to orchestrator (which may speak via TTS)
-            await self.orchestrator.handle_input(text, {})
-
-            # Resume mic stream after TTS
-            self.stream.resume_stream()
-
-            # Mandatory Deaf-Period (0.5s) to allow physical room echoes to dissipate 
-            # so JARVIS's microphone does not record his own TTS voice 
-            await asyncio.sleep(0.5)
-            self.stream.clear_wake_word_queue()
+            with tracer.span("respond"):
+                await self.orchestrator.handle_input(text, {"interaction_id": self.interaction_id})
 
             # Extend session window after successful command
             self.session_active = True
@@ -313,14 +612,113 @@ class VoicePipeline:
         self.state = IDLE
         print("[STATE] State: PROCESSING_FINAL -> IDLE")
 
+    async def _enter_dictation(self, live=False):
+        """
+        PROCESSING_FINAL -> DICTATING: no 10s cap. Batch mode types each segment once
+        decoded; live mode types partial hypotheses as the user speaks.
+        """
+        kwargs = dict(
+            sample_rate=self.stream.sample_rate,
+            segment_silence_ms=self.DICTATION_SEGMENT_SILENCE_MS,
+            max_segment_sec=self.DICTATION_MAX_SEGMENT_SEC
+        )
+        self.dictation = None
+        if live:
+            try:
+                from skills.dictation import LiveDictationTyper  # type: ignore
+                self.dictation = LiveDictationSession(self.whisper, self.stt, LiveDictationTyper(),
+                                                      self._publish_dictation, **kwargs)
+            except ImportError as e:
+                print(f"[DICTATION] Live typing unavailable ({e}), using segment mode.")
+        if self.dictation is None:
+            self.dictation = DictationSession(self.whisper, self.stt, self._type_dictation,
+                                              batch_size=self.DICTATION_BATCH, **kwargs)
+        live = isinstance(self.dictation, LiveDictationSession)
+        print(f"[DICTATION] {'Live d' if live else 'D'}ictation mode on. Say 'stop dictation' to finish.")
+        self._typed_any = False
+        self.state = DICTATING
+        self.stream.enable_stt()
+        self.stt.restart_partials()
+        await self.orchestrator.bus.emit("DICTATION_STARTED", {"live": live})
+
+    async def _handle_dictating(self):
+        """Consume one STT block in dictation mode. Returns False when no audio is buffered."""
+        session = self.dictation
+        if session.stopped or time.time() - session.last_speech > self.DICTATION_IDLE_SEC:
+            await self._exit_dictation("stop phrase" if session.stopped else "idle")
+            return True
+        try:
+            chunk = self.stream.get_stt_chunk(block=False)
+        except queue.Empty:
+            return False
+        session.feed(chunk)
+        return True
+
+    async def _type_dictation(self, text):
+        """One decoded dictation segment: type it at the cursor and publish it."""
+        typed = (" " + text) if self._typed_any else text
+        self._typed_any = True
+        print(f"[DICTATION] {text}")
+        try:
+            from skills.dictation import type_text  # type: ignore
+            await asyncio.get_running_loop().run_in_executor(None, type_text, typed)
+        except Exception as e:
+            print(f"[DICTATION] Typing failed: {e}")
+        await self._publish_dictation(text)
+
+    async def _publish_dictation(self, text):
+        """A settled dictation segment (live mode has typed it already)."""
+        await self.orchestrator.bus.emit("DICTATION_SEGMENT", {"text": text})
+
+    async def _exit_dictation(self, reason):
+        self.stream.disable_stt()
+        stats = await self.dictation.finish()  # Type whatever is still queued
+        print(f"[DICTATION] Ended ({reason}): {stats['segments']} segments in {stats['batches']} batches, "
+              f"{stats['audio_sec']:.0f}s audio decoded in {stats['decode_sec']:.1f}s")
+        await self.orchestrator.bus.emit("DICTATION_ENDED", {"reason": reason, **stats})
+        self.dictation = None
+        self.vad.reset()
+        self.stream.clear_wake_word_queue()
+        self.state = IDLE
+
+    def _echo_only(self):
+        """
+        True while TTS plays and the echo canceller hasn't flagged near-end speech
+        in the last NEAR_END_BLOCKS blocks: a VAD onset then is residual echo.
+        """
+        if tts is None or not tts.is_speaking:
+            return False
+        aec = getattr(self.stream, "aec", None)
+        if aec is None or not tts.echo_cancelled:
+            return True
+        return not aec.near_end_recent(self.NEAR_END_BLOCKS)
+
+    def _barge_in(self):
+        """Cut TTS playback (and anything queued) when the user talks over it."""
+        if tts is not None and tts.is_speaking:
+            print("[BARGE-IN] Stopping TTS playback")
+            tts.stop()
+
     def stop(self):
         """Clean shutdown: stop audio stream and wake word engine."""
         print("[VOICE] Stopping pipeline...")
+        if self.recorder:
+            self.recorder.stop()
+        trace_file = os.environ.get("JARVIS_TRACE_FILE")
+        if trace_file:
+            try:
+                tracer.export_chrome_trace(trace_file)
+            except OSError as e:
+                print(f"[TRACE] Export failed: {e}")
         try:
             if self.stream:
                 self.stream.stop_stream()
         except Exception as e:
             print(f"[VOICE] Stream stop error (ok): {e}")
+        if self.stt:
+            self.stt.close()
+        if hasattr(self.whisper, "close"):
+            self.whisper.close()  # Remote engine: disconnect, server stays warm
         try:
             if self.wake_detector:
                 self.wake_detector.cleanup()
@@ -1,72 +1,240 @@
-import pvporcupine # type: ignore
-import struct
 import numpy as np # type: ignore
-import time
 import os
 
+try:
+    import pvporcupine # type: ignore
+except ImportError:
+    pvporcupine = None
+
+
+class PorcupineBackend:
+    """
+    One Porcupine instance (one or more keyword models sharing a sensitivity).
+    Wake-word backends expose: frame_length, keyword_count, process(frame) -> int,
+    reset() (the frames since the last process() call were skipped) and delete().
+    """
+    def __init__(self, access_key, keyword_paths, sensitivity=0.5):
+        self.keyword_paths = keyword_paths
+        self.keyword_count = len(keyword_paths)
+        self.handle = pvporcupine.create(
+            access_key=access_key,
+            keyword_paths=keyword_paths,
+            sensitivities=[sensitivity] * len(keyword_paths)
+        )
+        self.frame_length = self.handle.frame_length # type: ignore
+
+    def process(self, frame):
+        return self.handle.process(frame) # type: ignore
+
+    def reset(self):
+        pass  # Porcupine keeps no state we can (or need to) clear
+
+    def delete(self):
+        self.handle.delete() # type: ignore
+
+
 class WakeWordEngine:
-    def __init__(self, 
+    def __init__(self,
                  access_key,
                  keyword_paths,
-                 sensitivity=0.5):
-        
+                 sensitivity=0.5,
+                 extra_backends=None,
+                 backend=None,
+                 gate_rms=0.004,
+                 gate_hangover_ms=600,
+                 gate_preroll_frames=3):
+
         self.access_key = access_key
         self.keyword_paths = keyword_paths
         self.sensitivity = sensitivity
         self.porcupine = None
-        
+
         # Porcupine expects 512 samples/frame
-        self.frame_length = 512 
-        self.buffer = []
+        self.frame_length = 512
+
+        # Backends run side by side on the same frames; detection indices are
+        # global across them (backend 0 keywords first, then backend 1, ...).
+        self.backends = []
+
+        # Primary backend: "porcupine", "template" (offline, enrolled templates) or
+        # "auto" (Porcupine when it can load, else the templates if enrolled)
+        backend = (backend or os.environ.get("JARVIS_WAKE_BACKEND", "auto")).lower()
+        if backend in ("auto", "porcupine"):
+            self._load_porcupine(required=backend == "porcupine")
+        if backend == "template" or (backend == "auto" and self.porcupine is None):
+            self._load_templates()
+        if not self.backends:
+            self.frame_length = 512 # Default fallback
+
+        for backend in extra_backends or []:
+            self.add_backend(backend)
+
+        # Energy pre-gate: frames that are clearly silent never reach the backends.
+        # The gate opens on the first loud frame (replaying a few skipped frames so the
+        # keyword onset isn't clipped) and stays open for a hangover period.
+        # Compared as a sum of squares per frame (int16 units) to skip sqrt/mean
+        self.gate_threshold = int((gate_rms * 32768.0) ** 2 * self.frame_length)
+        self.gate_hangover_frames = max(1, int(gate_hangover_ms / 1000.0 * 16000 / self.frame_length))
+        self._hangover = 0
+        self._gate_open = False
+        self._history = np.zeros((gate_preroll_frames, self.frame_length), dtype=np.int16)
+        self._history_len = 0
+
+        # Frame staging: incoming blocks are framed in place, only the < 1 frame
+        # remainder is carried over between calls
+        self._staging = np.zeros(self.frame_length * 8, dtype=np.int16)
+        self._fill = 0
+
+        # Samples that followed the keyword-end frame at the last detection
+        # (the rest of the chunk plus any replayed frames), for pre-roll seeding
+        self.detection_lag = 0
+
+        # Counters
+        self.frames_seen = 0
+        self.frames_processed = 0
 
-        print(f"Loading Porcupine with models: {[os.path.basename(p) for p in keyword_paths]}...")
-        
+    def _load_porcupine(self, required):
+        if pvporcupine is None or not all(os.path.exists(p) for p in self.keyword_paths):
+            if required:
+                print("[ERROR] Porcupine Load Failed: pvporcupine or keyword file missing")
+            return
+        print(f"Loading Porcupine with models: {[os.path.basename(p) for p in self.keyword_paths]}...")
         try:
-            self.porcupine = pvporcupine.create(
-                access_key=self.access_key,
-                keyword_paths=self.keyword_paths,
-                sensitivities=[sensitivity] * len(keyword_paths)
-            )
-            print(f"[OK] Porcupine Loaded. Frame Length: {self.porcupine.frame_length}") # type: ignore
-            self.frame_length = self.porcupine.frame_length # type: ignore # Update to actual
-            
+            self.porcupine = PorcupineBackend(self.access_key, self.keyword_paths, self.sensitivity)
+            self.add_backend(self.porcupine)
+            print(f"[OK] Porcupine Loaded. Frame Length: {self.porcupine.frame_length}")
         except Exception as e:
             print(f"[ERROR] Porcupine Load Failed: {e}")
             self.porcupine = None
-            self.frame_length = 512 # Default fallback
+
+    def _load_templates(self):
+        from brain.input.template_wake import TemplateWakeBackend, default_template_path # type: ignore
+        path = default_template_path()
+        if not os.path.exists(path):
+            print(f"[WARN] No wake templates at {path} "
+                  "(enroll: python -m brain.input.template_wake enroll <wavs>)")
+            return
+        try:
+            self.add_backend(TemplateWakeBackend.load(path))  # Calibrated threshold, not Porcupine's sensitivity
+            print(f"[OK] Template wake word loaded from {path}")
+        except Exception as e:
+            print(f"[ERROR] Template wake word load failed: {e}")
+
+    def add_backend(self, backend):
+        """Run another keyword model / engine in parallel on the same frames."""
+        if self.backends and backend.frame_length != self.frame_length:
+            print(f"[WARN] Wake backend frame length {backend.frame_length} != {self.frame_length}; skipped.")
+            return
+        if not self.backends:
+            self.frame_length = backend.frame_length
+        self.backends.append(backend)
 
     def detect(self, audio_chunk):
         """
         Process a chunk of audio (int16 numpy array).
         Returns the index of the detected keyword, or -1.
         """
-        if not self.porcupine: 
+        if not self.backends:
             return -1
-            
-        # 1. Handle Buffering
-        # Porcupine is STRICT: process(pcm) must be exactly 512 samples.
-        # Incoming chunk from StreamHandler might be different (e.g., 4096 or 1024).
-        
-        # Convert numpy int16 to list of ints (what porcupine expects? verify docs: expects list or struct)
-        # Actually, pvporcupine.process(pcm) expects a list/tuple of integers.
-        # But we can pass it list(audio_chunk).
-        
-        self.buffer.extend(audio_chunk.tolist())
-        
+
+        # 1. Stage the chunk behind any carried-over samples
+        n = len(audio_chunk)
+        if self._fill + n > len(self._staging):
+            grown = np.zeros(self._fill + n + self.frame_length, dtype=np.int16)
+            grown[:self._fill] = self._staging[:self._fill]
+            self._staging = grown
+        self._staging[self._fill:self._fill + n] = audio_chunk
+        self._fill += n
+
+        count = self._fill // self.frame_length
+        if count == 0:
+            return -1
+
+        # 2. Frame views + one vectorised energy pass over all complete frames
+        frames = self._staging[:count * self.frame_length].reshape(count, self.frame_length)
+        energy = np.einsum('ij,ij->i', frames, frames, dtype=np.int64)
+        self.frames_seen += count
+
         detected_index = -1
-        
-        # Process in chunks of self.frame_length
-        while len(self.buffer) >= self.frame_length:
-            frame = self.buffer[:self.frame_length]
-            self.buffer = self.buffer[self.frame_length:]
-            
-            result = self.porcupine.process(frame)
+        for i in range(count):
+            detected_index = self._gate_and_process(frames[i], energy[i] >= self.gate_threshold)
+            if detected_index >= 0:
+                self.detection_lag += self._fill - (i + 1) * self.frame_length
+                print(f"[!] Wake Word Detected (Index: {detected_index})")
+                break
+
+        # 3. Carry the partial frame over (drop everything on detection)
+        if detected_index >= 0:
+            self._fill = 0
+            self._history_len = 0
+            self._hangover = 0
+        else:
+            remainder = self._fill - count * self.frame_length
+            self._staging[:remainder] = self._staging[count * self.frame_length:self._fill]
+            self._fill = remainder
+        return detected_index
+
+    def _gate_and_process(self, frame, loud):
+        if loud:
+            if self._hangover == 0:
+                # Gate opening: replay the quiet frames just before the onset
+                for j in range(self._history_len):
+                    result = self._process(self._history[j])
+                    if result >= 0:
+                        # Fired on a replayed frame: the newer history frames and the
+                        # current frame came after the keyword end
+                        self.detection_lag = (self._history_len - j) * self.frame_length
+                        return result
+                self._history_len = 0
+            self._hangover = self.gate_hangover_frames
+            self._gate_open = True
+        elif self._hangover > 0:
+            self._hangover -= 1
+        else:
+            if self._gate_open:
+                # Gate closing: the backends must not stitch the next onset onto this audio
+                self._gate_open = False
+                for backend in self.backends:
+                    backend.reset()
+            self._remember(frame)
+            return -1
+        return self._process(frame)
+
+    def _remember(self, frame):
+        depth = len(self._history)
+        if depth == 0:
+            return
+        if self._history_len == depth:
+            self._history[:-1] = self._history[1:]
+            self._history_len -= 1
+        self._history[self._history_len] = frame
+        self._history_len += 1
+
+    def _process(self, frame):
+        self.detection_lag = 0
+        self.frames_processed += 1
+        offset = 0
+        for backend in self.backends:
+            result = backend.process(frame)
             if result >= 0:
-                print(f"[!] Wake Word Detected (Index: {result})")
-                return result # Return immediately on detection
-                
+                return offset + result
+            offset += backend.keyword_count
         return -1
 
+    def stats(self):
+        gated = self.frames_seen - self.frames_processed
+        return {
+            "frames_seen": self.frames_seen,
+            "frames_processed": self.frames_processed,
+            "gated_ratio": gated / self.frames_seen if self.frames_seen else 0.0,
+        }
+
     def close(self):
-        if self.porcupine:
-            self.porcupine.delete() # type: ignore
+        for backend in self.backends:
+            backend.delete()
+        self.backends = []
+        self.porcupine = None
+
+    def cleanup(self):
+        """Alias used by VoicePipeline.stop()."""
+        self.close()
@@ -1,7 +1,14 @@
 from faster_whisper import WhisperModel # type: ignore
 import numpy as np # type: ignore
-import torch # type: ignore
+from brain.input.model_selector import detect_device, model_kwargs, select_model  # type: ignore
+from brain.input.confidence import TranscriptResult  # type: ignore
 import traceback
+import string
+from bisect import bisect_right
+
+SAMPLE_RATE = 16000
+
+INITIAL_PROMPT = "This conversation is in Indian English accent. Common commands include: open chrome, open instagram, open youtube, shutdown system, restart system, search google, play music. Use English words only."
 
 # Voice correction dictionary — fixes common Indian English misrecognitions
 CORRECTIONS = {
@@ -24,22 +31,240 @@ def apply_corrections(text):
         lower = lower.replace(wrong, correct)
     return lower
 
+
+def _norm_word(word):
+    return word.strip().lower().strip(string.punctuation)
+
+
+class StreamingTranscript:
+    """
+    LocalAgreement-style streaming state for one utterance.
+
+    Each update() decodes only the audio after the last committed word, with the
+    committed text as prompt. Words on which two consecutive hypotheses agree
+    are committed and never decoded again; the rest stays tentative. finish()
+    then only has to decode the uncommitted tail.
+    """
+
+    MIN_TAIL_SEC = 0.5     # Don't decode partial tails shorter than this
+    PROMPT_CHARS = 200     # Committed text fed back as prompt
+    MAX_OVERLAP_WORDS = 5  # Re-emitted committed words trimmed from a new hypothesis
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.committed = []   # [(start_sec, end_sec, word)] with absolute times
+        self.tentative = []   # Last hypothesis after the commit point
+        self.commit_time = 0.0
+        self.decodes = 0
+        self.decoded_seconds = 0.0
+        self.result = None  # TranscriptResult of the final pass (set by finish)
+        self._last = None   # TranscriptResult of the latest tail decode
+
+    @property
+    def committed_text(self):
+        return "".join(w for _, _, w in self.committed).strip()
+
+    def text(self):
+        """Committed + tentative text (what the UI shows as the partial)."""
+        return apply_corrections("".join(w for _, _, w in self.committed + self.tentative).strip())
+
+    def _prompt(self):
+        committed = self.committed_text
+        if not committed:
+            return INITIAL_PROMPT
+        return f"{INITIAL_PROMPT} {committed[-self.PROMPT_CHARS:]}"
+
+    def _tail_samples(self, audio):
+        return len(audio) - int(self.commit_time * SAMPLE_RATE)
+
+    def _decode_tail(self, audio, final=False):
+        start = int(self.commit_time * SAMPLE_RATE)
+        tail = audio[start:]
+        self.decodes += 1
+        self.decoded_seconds += len(tail) / SAMPLE_RATE
+        self._last = self.engine.transcribe_detailed(tail, prompt=self._prompt(), final=final)
+        offset = start / SAMPLE_RATE
+        return self._trim_overlap([(s + offset, e + offset, w) for s, e, w in self._last.words])
+
+    def _trim_overlap(self, words):
+        # Timestamps are approximate: drop a repeat of the last committed words
+        if not self.committed or not words:
+            return words
+        limit = min(self.MAX_OVERLAP_WORDS, len(self.committed), len(words))
+        for k in range(limit, 0, -1):
+            tail = [_norm_word(w) for _, _, w in self.committed[-k:]]
+            head = [_norm_word(w) for _, _, w in words[:k]]
+            if tail == head:
+                return words[k:]
+        return words
+
+    def update(self, audio):
+        """Advance with the utterance so far (float32). Returns the partial text."""
+        if self._tail_samples(audio) < self.MIN_TAIL_SEC * SAMPLE_RATE:
+            return self.text()
+
+        hypothesis = self._decode_tail(audio)
+
+        # Commit the longest prefix this hypothesis shares with the previous one
+        agreed = 0
+        for old, new in zip(self.tentative, hypothesis):
+            if _norm_word(old[2]) != _norm_word(new[2]):
+                break
+            agreed += 1
+        if agreed:
+            self.committed.extend(hypothesis[:agreed])
+            self.commit_time = hypothesis[agreed - 1][1]
+        self.tentative = hypothesis[agreed:]
+        return self.text()
+
+    def finish(self, audio):
+        """
+        Decode the uncommitted tail with final-pass settings. Returns the full text;
+        `result` carries the tail's confidence (committed words are already agreed on).
+        """
+        tail = None
+        if self._tail_samples(audio) >= 0.1 * SAMPLE_RATE:
+            self.tentative = self._decode_tail(audio, final=True)
+            tail = self._last
+        else:
+            self.tentative = []
+        text = self.text()
+        self.result = TranscriptResult(text, self.committed + self.tentative)
+        if tail is not None:
+            self.result.avg_logprob = tail.avg_logprob
+            self.result.no_speech_prob = tail.no_speech_prob
+            self.result.min_word_prob = tail.min_word_prob
+        return text
+
+
 class WhisperEngine:
-    def __init__(self):
-        print("Loading 'medium.en' Whisper Model on cuda (float16)...")
-        self.model = WhisperModel("medium.en", device="cuda", compute_type="float16")
-        # CUDA Warm-Up: Force PyTorch to allocate VRAM on boot
-        print("   [~] Warming up GPU tensors...")
+    def __init__(self, model_name=None, device=None, compute_type=None):
+        # Device straight from CTranslate2 (CUDA float16, else CPU int8)
+        if device is None:
+            device, compute_type = detect_device()
+        compute_type = compute_type or ("float16" if device == "cuda" else "int8")
+        kwargs = model_kwargs(device, compute_type)
+        self.device = device
+
+        # Largest model that fits the real-time budget on this machine (cached)
+        model = None
+        if model_name is None:
+            model_name, model = select_model(lambda name: WhisperModel(name, **kwargs), device, compute_type)
+        self.model_name = model_name
+
+        if model is None:
+            print(f"Loading '{model_name}' Whisper Model on {device} ({compute_type})...")
+            model = WhisperModel(model_name, **kwargs)
+        self.model = model
+        self._batched = None  # BatchedInferencePipeline, created on first dictation batch
+        # Warm-Up: allocate buffers / VRAM on boot instead of on the first command
+        print("   [~] Warming up...")
         self.model.transcribe(np.zeros(16000).astype(np.float32), language="en")
-        print("[OK] Whisper Ready")
+        print(f"[OK] Whisper Ready ({model_name}, {device})")
 
-    def transcribe_partial(self, audio_data: np.ndarray):
+    def start_stream(self):
+        """New incremental transcript for one utterance (see StreamingTranscript)."""
+        return StreamingTranscript(self)
+
+    def transcribe_words(self, audio_data: np.ndarray, prompt=INITIAL_PROMPT, final=False):
+        """
+        Word-level decode used by streaming. Returns [(start_sec, end_sec, word)]
+        relative to audio_data. `final` uses the final-pass VAD settings.
+        """
+        return self.transcribe_detailed(audio_data, prompt=prompt, final=final).words
+
+    def transcribe_detailed(self, audio_data: np.ndarray, prompt=None, beam_size=1, final=True):
+        """
+        Decode with word timestamps and keep Whisper's confidence
+        (avg_logprob / no_speech_prob / word probabilities). Returns a TranscriptResult;
+        beam_size > 1 is the slower escalation pass.
+        """
+        if not self.model: return TranscriptResult(beam_size=beam_size)
+        try:
+            segments, _ = self.model.transcribe(
+                audio_data,
+                beam_size=beam_size,
+                best_of=1,
+                temperature=0.0,
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=300 if final else 400),
+                language="en",
+                task="transcribe",
+                initial_prompt=prompt or INITIAL_PROMPT,
+                condition_on_previous_text=False,
+                no_speech_threshold=0.65,
+                word_timestamps=True
+            )
+            segments = list(segments)
+            text = apply_corrections(" ".join(s.text for s in segments).strip())
+            return TranscriptResult.from_segments(segments, text, beam_size)
+        except Exception as e:
+            print(f"Transcription Error: {e}")
+            return TranscriptResult(beam_size=beam_size)
+
+    def transcribe_batch(self, audio_data: np.ndarray, clips, batch_size=8):
+        """
+        Decode several speech clips of one buffer in a single batched pass
+        (faster-whisper BatchedInferencePipeline). `clips` are (start_sec, end_sec),
+        each under 30s; returns one text per clip. Used by dictation, so no command
+        prompt or command-word corrections.
+        """
+        if not self.model or not clips:
+            return [""] * len(clips)
+        if self._batched is None:
+            try:
+                from faster_whisper import BatchedInferencePipeline  # type: ignore
+                self._batched = BatchedInferencePipeline(model=self.model)
+            except ImportError:
+                print("[WARN] faster-whisper without BatchedInferencePipeline: dictation decodes clip by clip.")
+                self._batched = False
+        if self._batched is not False:
+            try:
+                return self._transcribe_batched(audio_data, clips, batch_size)
+            except Exception as e:
+                # Never lose dictation text to a batched-pipeline problem
+                print(f"[WARN] Batched decode failed ({type(e).__name__}: {e}); decoding clip by clip.")
+        texts = []
+        for start, end in clips:
+            try:
+                segments, _ = self.model.transcribe(
+                    audio_data[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)],
+                    beam_size=1, language="en", task="transcribe",
+                    condition_on_previous_text=False, vad_filter=False
+                )
+                texts.append(" ".join(s.text.strip() for s in segments).strip())
+            except Exception as e:
+                print(f"Transcription Error: {e}")
+                texts.append("")
+        return texts
+
+    def _transcribe_batched(self, audio_data, clips, batch_size):
+        # clip_timestamps are sample offsets (they slice the audio); results come back in seconds
+        segments, _ = self._batched.transcribe(  # type: ignore
+            audio_data,
+            clip_timestamps=[{"start": int(start * SAMPLE_RATE), "end": int(end * SAMPLE_RATE)}
+                             for start, end in clips],
+            vad_filter=False,
+            batch_size=batch_size,
+            beam_size=1,
+            language="en",
+            task="transcribe",
+            without_timestamps=True
+        )
+        # Segment times are absolute within audio_data: map each back to its clip
+        texts = [[] for _ in clips]
+        starts = [start for start, _ in clips]
+        for s in segments:
+            texts[max(0, bisect_right(starts, s.start + 1e-3) - 1)].append(s.text)
+        return [" ".join(t.strip() for t in parts).strip() for parts in texts]
+
+    def transcribe_partial(self, audio_data: np.ndarray, detailed=False):
         """
         Fast transcription for partials (Visuals only).
         Uses aggressive VAD and beam_size=1 for speed.
-        Returns text.
+        Returns text, or a TranscriptResult (with confidence) when `detailed`.
         """
-        if not self.model: return ""
+        if not self.model: return TranscriptResult() if detailed else ""
         try:
             segments, _ = self.model.transcribe(
                 audio_data,
@@ -48,21 +273,22 @@ class WhisperEngine:
                 vad_parameters=dict(min_silence_duration_ms=400),
                 language="en",
                 task="transcribe",
-                initial_prompt="This conversation is in Indian English accent. Common commands include: open chrome, open instagram, open youtube, shutdown system, restart system, search google, play music. Use English words only.",
+                initial_prompt=INITIAL_PROMPT,
                 condition_on_previous_text=False,
                 no_speech_threshold=0.65
             )
-            return apply_corrections(" ".join([s.text for s in segments]).strip())
-        except:
-            return ""
+            result = self._result(segments)
+            return result if detailed else result.text
+        except Exception:
+            return TranscriptResult() if detailed else ""
 
-    def transcribe(self, audio_data: np.ndarray):
+    def transcribe(self, audio_data: np.ndarray, detailed=False):
         """
         Transcribe a complete audio buffer (float32).
-        Returns the full text string.
+        Returns the full text string, or a TranscriptResult (with confidence) when `detailed`.
         """
         if not self.model: 
-            return ""
+            return TranscriptResult() if detailed else ""
 
         try:
             # Word timestamps enabled for better VAD/segmentation if needed
@@ -75,15 +301,20 @@ class WhisperEngine:
                 vad_parameters=dict(min_silence_duration_ms=300),
                 language="en",
                 task="transcribe",
-                initial_prompt="This conversation is in Indian English accent. Common commands include: open chrome, open instagram, open youtube, shutdown system, restart system, search google, play music. Use English words only.",
+                initial_prompt=INITIAL_PROMPT,
                 condition_on_previous_text=False,
                 no_speech_threshold=0.65
             )
             
-            # segments is a generator, must consume it
-            text = " ".join([segment.text for segment in segments]).strip()
-            return apply_corrections(text)
+            result = self._result(segments)
+            return result if detailed else result.text
         except Exception as e:
             print(f"Transcription Error: {e}")
             traceback.print_exc()
-            return ""
+            return TranscriptResult() if detailed else ""
+
+    @staticmethod
+    def _result(segments):
+        """Consume the segment generator into a TranscriptResult (corrected text + confidence)."""
+        segments = list(segments)
+        return TranscriptResult.from_segments(segments, apply_corrections(" ".join(s.text for s in segments).strip()))
@@ -1,6 +1,9 @@
 import requests  # type: ignore
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .tracing import tracer  # type: ignore
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
@@ -9,6 +12,26 @@ OLLAMA_URL = "http://localhost:11434/api/generate"
 GROQ_ACTIVE = True
 LAST_FAIL_TIME = 0
 
+# Keep-alive pool: the TLS handshake to Groq is paid once (or by warm_up), not per
+# reply. requests.Session isn't thread-safe, so every LLM call (warm_up, speculative
+# and real generate_response) runs on this one thread and shares one session: the
+# connection warm_up opened is the one the reply uses. Run them with
+# run_in_executor(loop, fn, ..., executor=LLM_EXECUTOR).
+LLM_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm")
+_SESSION = requests.Session()
+
+
+def warm_up():
+    """Open (or refresh) the pooled Groq connection ahead of a likely LLM request."""
+    if not GROQ_ACTIVE or not GROQ_API_KEY:
+        return False
+    try:
+        _SESSION.get("https://api.groq.com/openai/v1/models",
+                     headers={"Authorization": f"Bearer {GROQ_API_KEY}"}, timeout=3)
+        return True
+    except Exception:
+        return False
+
 
 def ask_groq(messages):
     headers = {
@@ -23,16 +46,17 @@ def ask_groq(messages):
         "max_tokens": 120
     }
 
-    r = requests.post(
-        "https://api.groq.com/openai/v1/chat/completions",
-        headers=headers,
-        json=payload,
-        timeout=6
-    )
+    with tracer.span("llm.groq"):
+        r = _SESSION.post(
+            "https://api.groq.com/openai/v1/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=6
+        )
 
-    r.raise_for_status()
+        r.raise_for_status()
 
-    data = r.json()
+        data = r.json()
     return data["choices"][0]["message"]["content"]
 
 
@@ -43,9 +67,10 @@ def ask_ollama(prompt):
         "stream": False
     }
 
-    r = requests.post(OLLAMA_URL, json=payload, timeout=15)
-    r.raise_for_status()
-    return r.json()["response"]
+    with tracer.span("llm.ollama"):
+        r = _SESSION.post(OLLAMA_URL, json=payload, timeout=15)
+        r.raise_for_status()
+        return r.json()["response"]
 
 
 def generate_response(user_text):
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import struct
+import sys
+import tempfile
+
+# Length-prefixed framing: 4-byte big-endian payload length + 1-byte kind.
+# Text frames carry the same JSON messages as the WebSocket; binary frames carry
+# the same payloads as binary WebSocket messages (audio envelopes).
+FRAME_TEXT = 0
+FRAME_BINARY = 1
+_HEADER = struct.Struct("!IB")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+IS_WINDOWS = sys.platform == "win32"
+
+
+def default_address():
+    """Named pipe on Windows, Unix domain socket in the temp dir elsewhere."""
+    if IS_WINDOWS:
+        return r"\\.\pipe\jarvis_brain"
+    return os.path.join(tempfile.gettempdir(), "jarvis_brain.sock")
+
+
+def encode_frame(message):
+    if isinstance(message, str):
+        data = message.encode("utf-8")
+        return _HEADER.pack(len(data), FRAME_TEXT), data
+    data = bytes(message)
+    return _HEADER.pack(len(data), FRAME_BINARY), data
+
+
+async def read_frame(reader):
+    """Read one frame. Returns str for text frames, bytes for binary ones."""
+    header = await reader.readexactly(_HEADER.size)
+    length, kind = _HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {length} bytes")
+    data = await reader.readexactly(length)
+    return data.decode("utf-8") if kind == FRAME_TEXT else data
+
+
+class LocalConnection:
+    """
+    A framed local peer with the subset of the websocket API the publisher uses:
+    await send(message), async iteration over incoming messages, close().
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, message):
+        self.writer.writelines(encode_frame(message))
+        await self.writer.drain()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await read_frame(self.reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            raise StopAsyncIteration
+
+    async def recv(self):
+        return await read_frame(self.reader)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+
+
+class LocalTransportServer:
+    """Serves LocalConnections on a Unix domain socket or a Windows named pipe."""
+
+    def __init__(self, handler, address=None):
+        self.handler = handler  # async handler(LocalConnection)
+        self.address = address or default_address()
+        self._servers = []
+
+    async def start(self):
+        if IS_WINDOWS:
+            loop = asyncio.get_running_loop()
+            if not hasattr(loop, "start_serving_pipe"):
+                raise RuntimeError("Named pipes need the Proactor event loop")
+            self._servers = await loop.start_serving_pipe(self._protocol_factory, self.address)  # type: ignore
+        else:
+            if os.path.exists(self.address):
+                os.unlink(self.address)  # Stale socket from a previous run
+            server = await asyncio.start_unix_server(self._on_connect, path=self.address)
+            self._servers = [server]
+
+    def _protocol_factory(self):
+        reader = asyncio.StreamReader()
+        return asyncio.StreamReaderProtocol(reader, self._on_connect)
+
+    async def _on_connect(self, reader, writer):
+        connection = LocalConnection(reader, writer)
+        try:
+            await self.handler(connection)
+        finally:
+            await connection.close()
+
+    def close(self):
+        for server in self._servers:
+            server.close()
+        self._servers = []
+        if not IS_WINDOWS and os.path.exists(self.address):
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+
+async def open_local_connection(address=None):
+    """Client side: connect to a LocalTransportServer."""
+    address = address or default_address()
+    if IS_WINDOWS:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        protocol = asyncio.StreamReaderProtocol(reader)
+        transport, _ = await loop.create_pipe_connection(lambda: protocol, address)  # type: ignore
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    else:
+        reader, writer = await asyncio.open_unix_connection(path=address)
+    return LocalConnection(reader, writer)
@@ -5,10 +5,13 @@ from .execution_manager import ExecutionManager # type: ignore
 from .permission_manager import PermissionManager # type: ignore
 from .event_logger import EventLogger # type: ignore
 from .event_bus import EventBus # type: ignore
+from .events import DecisionEvent, new_interaction_id, set_interaction_id, reset_interaction_id # type: ignore
 from .ws_publisher import WebSocketPublisher # type: ignore
 from .confirmation_manager import ConfirmationManager # type: ignore
 from .llm_handler import LLMHandler # type: ignore
-from .intelligence_router import generate_response # type: ignore
+from .intelligence_router import LLM_EXECUTOR, generate_response # type: ignore
+from .speculation import SpeculativeDispatcher # type: ignore
+from .tracing import tracer, run_in_executor # type: ignore
 from .memory.short_term_memory import ShortTermMemory # type: ignore
 from .personality.jarvis_voice import JarvisVoice # type: ignore
 
@@ -41,6 +44,9 @@ class Orchestrator:
         self.bus.subscribe(self.logger.handle_event)
         self.bus.subscribe(self.ws_publisher.subscriber)
 
+        # Acts on partial transcripts; the final decision commits or cancels it
+        self.speculation = SpeculativeDispatcher(self.arbitration, self.skill_registry, self.bus)
+
         self._lock = asyncio.Lock()
 
     async def start(self):
@@ -48,8 +54,13 @@ class Orchestrator:
         await self.ws_publisher.start_server()
 
     async def handle_input(self, text: str, context: dict):
-        async with self._lock:
-            return await self._process_input(text, context)
+        # Every event emitted while handling this input carries the same interaction id
+        token = set_interaction_id(context.get("interaction_id") or new_interaction_id())
+        try:
+            async with self._lock:
+                return await self._process_input(text, context)
+        finally:
+            reset_interaction_id(token)
 
     async def _process_input(self, text: str, context: dict):
         # 1. Check for Pending Confirmation
@@ -123,18 +134,14 @@ class Orchestrator:
                 return "Please confirm or cancel the pending action."
 
         # 2. Normal Arbitration
-        decision = self.arbitration.evaluate(text, context)
+        with tracer.span("arbitration"):
+            decision = self.arbitration.evaluate(text, context)
 
-        # Log Decision
-        await self.bus.emit("DECISION", {
-            "input": text,
-            "action": decision.action,
-            "skill": decision.skill,
-            "confidence": decision.confidence,
-            "margin": decision.scores,
-        })
+        # Log Decision (scores trimmed to the top-k skills)
+        await self.bus.emit(DecisionEvent(text, decision))
 
         if decision.action == "EXECUTE_SKILL":
+            await self.speculation.commit_skill(text, decision.skill)
             skill_instance = self.skill_registry.get_skill(decision.skill)
 
             if skill_instance:
@@ -214,6 +221,7 @@ class Orchestrator:
                 return error_msg
 
         elif decision.action == "CLARIFY":
+            self.speculation.cancel()
             clarify_msg = self.voice.generate("clarify")
             speak(clarify_msg)
             return f"Ambiguous request. Did you mean: {decision.skill}? (Confidence: {decision.confidence:.2f})"
@@ -221,7 +229,13 @@ class Orchestrator:
         elif decision.action == "LLM_FALLBACK":
             print(f"[LLM] Protocol: CONVERSATION_MODE (Confidence: {decision.confidence:.2f})")
 
-            response = generate_response(text)
+            # Reuse the reply pre-dispatched on the stable partial when the text agrees
+            with tracer.span("llm") as span:
+                response = await self.speculation.claim_llm(text)
+                span.args["speculated"] = response is not None
+                if response is None:
+                    response = await run_in_executor(asyncio.get_running_loop(), generate_response, text,
+                                                     executor=LLM_EXECUTOR)
 
             if response:
                 speak(response)
@@ -0,0 +1,141 @@
+import asyncio
+import re
+import time
+
+from .intelligence_router import LLM_EXECUTOR, generate_response, warm_up  # type: ignore
+from .tracing import run_in_executor  # type: ignore
+
+SKILL = "skill"
+LLM = "llm"
+
+_NORMALIZE = re.compile(r"[^\w\s']")
+
+
+def normalize(text):
+    return " ".join(_NORMALIZE.sub(" ", text.lower()).split())
+
+
+class Speculation:
+    __slots__ = ("kind", "text", "skill", "future", "started")
+
+    def __init__(self, kind, text, skill=None, future=None):
+        self.kind = kind
+        self.text = text
+        self.skill = skill
+        self.future = future
+        self.started = time.time()
+        if future is not None:
+            # Discarded speculations must not log "exception was never retrieved"
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+
+class SpeculativeDispatcher:
+    """
+    Acts on partial transcripts before the final one arrives.
+
+    - Partial resolves to a skill  -> skill.prepare() pre-resolves its resources.
+    - Partial looks conversational -> while speaking, warm the LLM connection;
+      once the speech is stable (user paused), dispatch the LLM request itself.
+
+    The final transcript commits a speculation only if it agrees (same skill /
+    same normalised text); anything else is cancelled and counted as a miss.
+    """
+
+    WARM_INTERVAL_SEC = 30.0  # Keep-alive refresh while the user is talking
+
+    def __init__(self, arbitration, skill_registry, bus=None):
+        self.arbitration = arbitration
+        self.skill_registry = skill_registry
+        self.bus = bus
+        self.current = None
+        self._last_warm = 0.0
+        self.stats = {"skill_hits": 0, "skill_misses": 0, "llm_hits": 0, "llm_misses": 0,
+                      "llm_dispatched": 0, "warmups": 0}
+
+    def on_partial(self, text, stable=False):
+        """Called from the voice pipeline (event loop) with each partial transcript."""
+        if not text.strip():
+            return
+        loop = asyncio.get_running_loop()
+        decision = self.arbitration.evaluate(text, {}, verbose=False)
+
+        if decision.action == "EXECUTE_SKILL":
+            skill = self.skill_registry.get_skill(decision.skill)
+            if skill is None:
+                return
+            if self.current and self.current.kind == SKILL and self.current.skill == decision.skill \
+                    and normalize(self.current.text) == normalize(text):
+                return
+            self._replace(Speculation(SKILL, text, decision.skill,
+                                      run_in_executor(loop, skill.prepare, text, {})))
+
+        elif decision.action == "LLM_FALLBACK":
+            if stable:
+                if self.current and self.current.kind == LLM and normalize(self.current.text) == normalize(text):
+                    return
+                print(f"[SPECULATE] Pre-dispatching LLM on stable partial: '{text}'")
+                self.stats["llm_dispatched"] += 1
+                future = run_in_executor(loop, generate_response, text, executor=LLM_EXECUTOR)
+                self._replace(Speculation(LLM, text, future=future))
+            elif time.time() - self._last_warm > self.WARM_INTERVAL_SEC:
+                self._last_warm = time.time()
+                self.stats["warmups"] += 1
+                run_in_executor(loop, warm_up, executor=LLM_EXECUTOR)
+
+    def _replace(self, speculation):
+        self.cancel()
+        self.current = speculation
+
+    def cancel(self):
+        """Drop the pending speculation (new utterance, interrupt, disagreement)."""
+        if self.current and self.current.future is not None:
+            # A running worker can't be interrupted; its result is simply discarded
+            self.current.future.cancel()
+        self.current = None
+
+    async def commit_skill(self, text, skill_name):
+        """Final decision is EXECUTE_SKILL: record hit/miss, wait for a matching prepare()."""
+        spec, self.current = self.current, None
+        if spec is None or spec.kind != SKILL:
+            if spec:
+                await self._record(spec, False)
+            return False
+        hit = spec.skill == skill_name
+        if hit:
+            try:
+                await spec.future  # Usually done already; execute() reuses what it resolved
+            except Exception:
+                pass
+        elif spec.future is not None:
+            spec.future.cancel()
+        await self._record(spec, hit)
+        return hit
+
+    async def claim_llm(self, text):
+        """Final decision is LLM_FALLBACK: the pre-dispatched response if the text agrees, else None."""
+        spec, self.current = self.current, None
+        if spec is None:
+            return None
+        if spec.kind != LLM or normalize(spec.text) != normalize(text):
+            if spec.future is not None:
+                spec.future.cancel()
+            await self._record(spec, False)
+            return None
+        try:
+            response = await spec.future
+        except Exception:
+            response = None
+        await self._record(spec, response is not None)
+        return response
+
+    async def _record(self, spec, hit):
+        key = f"{spec.kind}_{'hits' if hit else 'misses'}"
+        self.stats[key] += 1
+        if self.bus is not None:
+            await self.bus.emit("SPECULATION_RESULT", {
+                "kind": spec.kind,
+                "hit": hit,
+                "skill": spec.skill,
+                "lead_ms": round((time.time() - spec.started) * 1000.0, 1),
+                "stats": dict(self.stats),
+            })
@@ -0,0 +1,142 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextvars import copy_context
+
+from .events import current_interaction_id  # type: ignore
+
+LATENCY_TOPIC = "LATENCY_SUMMARY"
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+class Span:
+    """One timed stage. Use as a context manager, or call end() explicitly."""
+    __slots__ = ("tracer", "name", "interaction_id", "start", "duration", "thread", "args")
+
+    def __init__(self, tracer, name, interaction_id, args):
+        self.tracer = tracer
+        self.name = name
+        self.interaction_id = interaction_id
+        self.args = args
+        self.thread = threading.get_ident()
+        self.duration = None
+        self.start = time.perf_counter()
+
+    def end(self, **args):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.start
+            self.args.update(args)
+            self.tracer._record(self)
+        return self.duration
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.end()
+        return False
+
+
+class Tracer:
+    """
+    Per-interaction stage spans on the monotonic clock.
+
+    Spans pick up the interaction id bound to the current context (set at wake
+    by the voice pipeline, carried into tasks automatically and into executor
+    threads by `run_in_executor` below). Finished spans are kept in a bounded
+    buffer for Chrome trace export, and each stage keeps a rolling window of
+    durations for the LATENCY_SUMMARY percentiles.
+    """
+
+    def __init__(self, max_spans=20000, window=200):
+        self.enabled = os.environ.get("JARVIS_TRACE", "1") != "0"
+        self._spans = deque(maxlen=max_spans)
+        self._stages = {}
+        self._window = window
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def span(self, name, interaction_id=None, **args):
+        """Start a span now. `interaction_id` overrides the context (e.g. the TTS thread)."""
+        if interaction_id is None:
+            interaction_id = current_interaction_id()
+        return Span(self, name, interaction_id, args)
+
+    def _record(self, span):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._spans.append(span)
+            stage = self._stages.get(span.name)
+            if stage is None:
+                stage = self._stages[span.name] = deque(maxlen=self._window)
+            stage.append(span.duration)
+
+    def summary(self):
+        """Rolling p50/p90/p99 (ms) per stage."""
+        with self._lock:
+            stages = {name: sorted(values) for name, values in self._stages.items() if values}
+        return {
+            name: {
+                "p50": round(_percentile(values, 50) * 1000.0, 1),
+                "p90": round(_percentile(values, 90) * 1000.0, 1),
+                "p99": round(_percentile(values, 99) * 1000.0, 1),
+                "n": len(values),
+            }
+            for name, values in stages.items()
+        }
+
+    async def publish(self, bus):
+        """Emit the current per-stage percentiles on the bus."""
+        if self.enabled and self._stages:
+            await bus.emit(LATENCY_TOPIC, {"stages": self.summary()})
+
+    def export_chrome_trace(self, path):
+        """
+        Write the buffered spans as Chrome trace-event JSON (open in Perfetto or
+        chrome://tracing). Each interaction gets its own track.
+        """
+        with self._lock:
+            spans = list(self._spans)
+        pid = os.getpid()
+        tracks = {}
+        events = []
+        for span in spans:
+            key = span.interaction_id or "background"
+            tid = tracks.get(key)
+            if tid is None:
+                tid = tracks[key] = len(tracks) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                               "args": {"name": f"interaction {key}" if span.interaction_id else key}})
+            args = {"interaction_id": span.interaction_id, "thread": span.thread}
+            args.update(span.args)
+            events.append({
+                "name": span.name,
+                "cat": span.name.split(".")[0],
+                "ph": "X",
+                "ts": round((span.start - self._origin) * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        print(f"[TRACE] Wrote {len(spans)} spans to {path}")
+        return len(spans)
+
+
+def run_in_executor(loop, fn, *args, executor=None):
+    """loop.run_in_executor(executor, ...) that keeps the caller's context (interaction id)."""
+    return loop.run_in_executor(executor, functools.partial(copy_context().run, fn, *args))
+
+
+tracer = Tracer()
@@ -0,0 +1,41 @@
+import struct
+import numpy as np  # type: ignore
+
+# Envelope sources (byte 3 of every frame header)
+SOURCE_MIC = 0
+SOURCE_TTS = 1
+
+# Binary frame layout: b"ENV" + source byte, then little-endian float32 values.
+# The 4-byte header keeps the payload aligned for a Float32Array view in the renderer.
+FRAME_MAGIC = b"ENV"
+_HEADER = struct.Struct("<3sB")
+
+ENVELOPE_WINDOW = 160  # 10ms windows at 16kHz
+
+
+def compute_envelope(samples, window=ENVELOPE_WINDOW, scale=32768.0):
+    """
+    Vectorised RMS over fixed, non-overlapping windows.
+    `samples` is a 1-D int16 (or float) array; a trailing partial window is dropped.
+    Returns float32 amplitudes, normalised by `scale`.
+    """
+    count = len(samples) // window
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    blocks = samples[:count * window].reshape(count, window)
+    power = np.mean(np.square(blocks, dtype=np.float32), axis=1)
+    return np.sqrt(power) / np.float32(scale)
+
+
+def pack_envelope_frame(source, envelope):
+    """Pack an envelope into a binary WebSocket frame."""
+    values = np.asarray(envelope, dtype="<f4")
+    return _HEADER.pack(FRAME_MAGIC, source) + values.tobytes()
+
+
+def unpack_envelope_frame(frame):
+    """Inverse of pack_envelope_frame. Returns (source, float32 array)."""
+    magic, source = _HEADER.unpack_from(frame)
+    if magic != FRAME_MAGIC:
+        raise ValueError("Not an envelope frame")
+    return source, np.frombuffer(frame, dtype="<f4", offset=_HEADER.size)
@@ -1,6 +1,19 @@
 import pyttsx3  # type: ignore
 import queue
 import threading
+import tempfile
+import wave
+import os
+import time
+import numpy as np  # type: ignore
+from brain.utils.audio_envelope import compute_envelope  # type: ignore
+from brain.events import current_interaction_id  # type: ignore
+from brain.tracing import tracer  # type: ignore
+
+try:
+    import sounddevice as sd  # type: ignore
+except ImportError:
+    sd = None
 
 engine = pyttsx3.init()
 engine.setProperty('rate', 175)
@@ -14,24 +27,143 @@ for v in voices:
         break
 
 is_speaking = False
+echo_cancelled = False  # Current playback feeds the echo canceller (mic may stay open)
 speech_queue = queue.Queue()
+current_text = ""  # What is being spoken right now (lets the pipeline spot its own echo)
+
+# Speech is rendered to samples and played through sounddevice at the mic rate,
+# block by block. Every played block is also pushed to `echo_reference`, which the
+# mic's echo canceller subtracts, so the mic can stay open while JARVIS talks.
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 480
+echo_reference = None
+if sd is not None:
+    from brain.input.aec import EchoReference  # type: ignore
+    echo_reference = EchoReference(SAMPLE_RATE, BLOCK_SIZE)
+
+# Barge-in generation: stop() bumps it, and anything queued or playing under an
+# older generation is dropped. (A flag cleared by the worker could wipe a stop()
+# that landed between dequeuing an item and starting it.)
+_generation = 0
+_generation_lock = threading.Lock()
+
+# Optional visualizer hook: called from the TTS thread with a float32 envelope.
+# Measured from the played samples; the word-boundary pulses below are only used
+# by the fallback path where pyttsx3 plays audio itself and never exposes PCM.
+on_envelope = None
+_WORD_PULSE = np.linspace(0.8, 0.2, 8, dtype=np.float32)
+_SILENCE = np.zeros(8, dtype=np.float32)
+_rendering = False  # save_to_file also fires word callbacks: ignore those
+
+
+def _emit_envelope(envelope):
+    if on_envelope is not None:
+        try:
+            on_envelope(envelope)
+        except Exception as e:
+            print(f"[TTS] Envelope hook error: {e}")
+
+
+def _on_word(name, location, length):
+    if not _rendering:
+        _emit_envelope(_WORD_PULSE)
+
+
+def _on_utterance_end(name, completed):
+    if not _rendering:
+        _emit_envelope(_SILENCE)
+
+
+engine.connect('started-word', _on_word)
+engine.connect('finished-utterance', _on_utterance_end)
+
+
+def _render(text):
+    """Synthesize `text` to int16 samples at SAMPLE_RATE, or None if rendering fails."""
+    global _rendering
+    fd, path = tempfile.mkstemp(suffix=".wav", prefix="jarvis_tts_")
+    os.close(fd)
+    try:
+        _rendering = True
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+        with wave.open(path, "rb") as wav:
+            rate = wav.getframerate()
+            channels = wav.getnchannels()
+            if wav.getsampwidth() != 2:
+                return None
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if channels > 1:
+            samples = samples.reshape(-1, channels)[:, 0]
+        if len(samples) == 0:
+            return None
+        if rate != SAMPLE_RATE:
+            # Linear resampling is plenty for a speech reference / playback
+            positions = np.arange(0, len(samples), rate / SAMPLE_RATE)
+            samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+        return samples
+    except Exception as e:
+        print(f"[TTS] Render failed ({e}), using direct playback.")
+        return None
+    finally:
+        _rendering = False
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _stopped(generation):
+    return generation != _generation
+
+
+def _play(samples, generation):
+    """Blocking playback in BLOCK_SIZE blocks; stops early on stop()."""
+    with sd.OutputStream(samplerate=SAMPLE_RATE, blocksize=BLOCK_SIZE, channels=1,  # type: ignore
+                         dtype='int16', latency='low') as stream:
+        for start in range(0, len(samples), BLOCK_SIZE):
+            if _stopped(generation):
+                break
+            block = samples[start:start + BLOCK_SIZE]
+            if len(block) < BLOCK_SIZE:
+                block = np.pad(block, (0, BLOCK_SIZE - len(block)))
+            echo_reference.push(block)  # type: ignore
+            _emit_envelope(compute_envelope(block))
+            stream.write(block.reshape(-1, 1))  # Blocks until the device takes it
+    _emit_envelope(_SILENCE)
 
 
 def _tts_worker():
-    global is_speaking
+    global is_speaking, echo_cancelled, current_text
     while True:
-        text = speech_queue.get()
-        if text is None:
+        item = speech_queue.get()
+        if item is None:
             break
+        text, interaction_id, queued, generation = item
+        if _stopped(generation):
+            continue  # Queued before a barge-in
         try:
             print(f"[JARVIS] {text}")
+            current_text = text
+            with tracer.span("tts.render", interaction_id, queued_ms=round((time.perf_counter() - queued) * 1000.0, 1)):
+                samples = _render(text) if sd is not None else None
+            if _stopped(generation):
+                continue
+            echo_cancelled = samples is not None
             is_speaking = True
-            engine.say(text)
-            engine.runAndWait()
-            is_speaking = False
+            with tracer.span("tts.playback", interaction_id, chars=len(text)) as span:
+                if samples is not None:
+                    _play(samples, generation)
+                else:
+                    engine.say(text)
+                    engine.runAndWait()
+                span.args["interrupted"] = _stopped(generation)
         except Exception as e:
             print(f"[TTS] Error: {e}")
+        finally:
             is_speaking = False
+            echo_cancelled = False
+            current_text = ""
 
 
 threading.Thread(target=_tts_worker, daemon=True).start()
@@ -39,7 +171,24 @@ threading.Thread(target=_tts_worker, daemon=True).start()
 
 def speak(text):
     """Queue text to be spoken. Non-blocking, sequential, no overlaps."""
-    speech_queue.put(text)
+    speech_queue.put((text, current_interaction_id(), time.perf_counter(), _generation))
+
+
+def stop():
+    """Barge-in: cut the current sentence and drop anything queued."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+    try:
+        while True:
+            speech_queue.get_nowait()
+    except queue.Empty:
+        pass
+    if is_speaking and not echo_cancelled:
+        try:
+            engine.stop()  # Fallback path: pyttsx3 is playing itself
+        except Exception:
+            pass
 
 
 def init_tts():
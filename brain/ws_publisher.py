@@ -3,48 +3,141 @@ import json
 import sys
 import os
 import websockets # type: ignore
+from fnmatch import fnmatchcase
+from brain.events import Event  # type: ignore
+from brain.local_transport import LocalTransportServer, default_address  # type: ignore
+from brain.utils.audio_envelope import pack_envelope_frame  # type: ignore
+
+
+TRANSPORTS = ("websocket", "local", "both")
+
+# Topic used for binary audio-envelope frames in SUBSCRIBE messages
+ENVELOPE_TOPIC = "AUDIO_ENVELOPE"
+
+
+class TopicFilter:
+    """
+    Per-client event filter. Topics are event types with shell-style wildcards
+    ("*", "EXECUTION_*"). Unsubscribing from a topic covered only by a wildcard
+    records an exclusion. Match results are cached per event type.
+    """
+    __slots__ = ("included", "excluded", "_cache")
+
+    def __init__(self, topics=("*",)):
+        self.included = set(topics)
+        self.excluded = set()
+        self._cache = {}
+
+    def subscribe(self, topics, replace=False):
+        if replace:
+            self.included.clear()
+            self.excluded.clear()
+        self.included.update(topics)
+        self.excluded.difference_update(topics)
+        self._cache.clear()
+
+    def unsubscribe(self, topics):
+        for topic in topics:
+            if topic in self.included:
+                self.included.discard(topic)
+            else:
+                self.excluded.add(topic)
+        self._cache.clear()
+
+    def matches(self, topic):
+        hit = self._cache.get(topic)
+        if hit is None:
+            hit = (any(fnmatchcase(topic, p) for p in self.included)
+                   and not any(fnmatchcase(topic, p) for p in self.excluded))
+            self._cache[topic] = hit
+        return hit
+
+    def to_dict(self):
+        return {"topics": sorted(self.included), "excluded": sorted(self.excluded)}
 
 
 class WebSocketPublisher:
 
-    def __init__(self, host="localhost", port=8765):
+    def __init__(self, host="localhost", port=8765, transport=None, local_address=None):
         self.host = host
         self.port = port
+        # "websocket" (default), "local" (Unix socket / named pipe) or "both"
+        self.transport = (transport or os.getenv("JARVIS_UI_TRANSPORT", "websocket")).lower()
+        if self.transport not in TRANSPORTS:
+            print(f"[WARN] Unknown UI transport '{self.transport}', using websocket.")
+            self.transport = "websocket"
+        self.local_address = local_address or os.getenv("JARVIS_UI_SOCKET") or default_address()
         self.clients = set()
+        self.filters = {}  # client -> TopicFilter (new clients receive everything)
         self.server = None
+        self.local_server = None
         self._voice_pipeline = None  # Set after init for shutdown access
+        self._envelope_inflight = set()  # Clients with an envelope frame still sending
 
     def set_voice_pipeline(self, pipeline):
         """Called by run_brain.py to give shutdown access to the pipeline."""
         self._voice_pipeline = pipeline
 
     async def start_server(self):
-        if self.server:
+        if self.server or self.local_server:
             return
 
-        print(f"Starting WebSocket Server on ws://{self.host}:{self.port}")
-
-        async def handler(websocket):
-            self.clients.add(websocket)
-            try:
-                async for message in websocket:
-                    try:
-                        data = json.loads(message)
-                        if data.get("type") == "SHUTDOWN":
-                            print("[SHUTDOWN] Received from UI")
-                            await self._clean_shutdown()
-                        elif data.get("type") == "FORCE_LISTEN":
-                            print("[FORCE] Listen triggered from UI (Key 2)")
-                            if self._voice_pipeline:
-                                await self._voice_pipeline.force_listen()
-                    except json.JSONDecodeError:
-                        pass
-            except Exception:
-                print("[WS] Client disconnected cleanly.")
-            finally:
-                self.clients.discard(websocket)
-
-        self.server = await websockets.serve(handler, self.host, self.port)
+        if self.transport in ("websocket", "both"):
+            print(f"Starting WebSocket Server on ws://{self.host}:{self.port}")
+            self.server = await websockets.serve(self._serve_client, self.host, self.port)
+
+        if self.transport in ("local", "both"):
+            print(f"Starting local UI transport on {self.local_address}")
+            self.local_server = LocalTransportServer(self._serve_client, self.local_address)
+            await self.local_server.start()
+
+    async def _serve_client(self, client):
+        """Connection handler shared by the WebSocket and local transports."""
+        self.filters[client] = TopicFilter()
+        self.clients.add(client)
+        try:
+            async for message in client:
+                try:
+                    data = json.loads(message)
+                    if isinstance(data, dict):
+                        await self._handle_message(client, data)
+                except json.JSONDecodeError:
+                    pass
+        except Exception:
+            print("[WS] Client disconnected cleanly.")
+        finally:
+            self.clients.discard(client)
+            self.filters.pop(client, None)
+
+    async def _handle_message(self, client, data):
+        """Handle a control message from a client."""
+        msg_type = data.get("type")
+        if msg_type == "SHUTDOWN":
+            print("[SHUTDOWN] Received from UI")
+            await self._clean_shutdown()
+        elif msg_type == "FORCE_LISTEN":
+            print("[FORCE] Listen triggered from UI (Key 2)")
+            if self._voice_pipeline:
+                await self._voice_pipeline.force_listen()
+        elif msg_type in ("SUBSCRIBE", "UNSUBSCRIBE"):
+            # {"type": "SUBSCRIBE", "topics": ["EXECUTION_*", "AUDIO_ENVELOPE"], "replace": true}
+            topics = data.get("topics") or []
+            if isinstance(topics, str):
+                topics = [topics]
+            topic_filter = self.filters.get(client)
+            if topic_filter is None:
+                return
+            if msg_type == "SUBSCRIBE":
+                topic_filter.subscribe(topics, replace=bool(data.get("replace")))
+            else:
+                topic_filter.unsubscribe(topics)
+            await client.send(json.dumps({"type": "SUBSCRIPTIONS", "payload": topic_filter.to_dict()}))
+
+    def has_subscribers(self, topic):
+        return any(f.matches(topic) for f in self.filters.values())
+
+    def _recipients(self, topic):
+        return [c for c in self.clients if c in self.filters and self.filters[c].matches(topic)]
 
     async def _clean_shutdown(self):
         """Clean shutdown: stop voice, close server, exit."""
@@ -57,6 +150,8 @@ class WebSocketPublisher:
 
         print("[SHUTDOWN] Closing WebSocket server...")
         try:
+            if self.local_server:
+                self.local_server.close()
             if self.server:
                 self.server.close()  # type: ignore
                 await self.server.wait_closed()  # type: ignore
@@ -73,20 +168,55 @@ class WebSocketPublisher:
         os._exit(0)
 
     async def broadcast(self, event_type, payload):
-        if not self.clients:
+        await self.broadcast_event(Event(event_type, payload))
+
+    async def broadcast_event(self, event):
+        # Filter first: events nobody subscribed to are never serialized
+        recipients = self._recipients(event.type)
+        if not recipients:
             return
 
-        message = json.dumps({
-            "type": event_type,
-            "payload": payload
-        })
+        # Serialized once (and shared with the EventLogger)
+        message = event.to_text()
+
+        await asyncio.gather(
+            *[client.send(message) for client in recipients],
+            return_exceptions=True
+        )
+
+    def send_envelope(self, source, envelope):
+        """
+        Broadcast a binary audio-envelope frame. Must be called on the event loop.
+        A client whose previous frame is still in flight skips this one, so a slow
+        renderer never builds a backlog.
+        """
+        recipients = self._recipients(ENVELOPE_TOPIC)
+        if not recipients:
+            return
+
+        frame = pack_envelope_frame(source, envelope)
+        for client in recipients:
+            if client in self._envelope_inflight:
+                continue
+            self._envelope_inflight.add(client)
+            task = asyncio.ensure_future(client.send(frame))
+            task.add_done_callback(lambda t, c=client: self._envelope_sent(c, t))
+
+    def _envelope_sent(self, client, task):
+        self._envelope_inflight.discard(client)
+        if not task.cancelled():
+            task.exception()  # Disconnects are handled by the connection handler
+
+    def envelope_sink(self, source, loop=None):
+        """Return a thread-safe callable that forwards envelopes from audio threads."""
+        loop = loop or asyncio.get_running_loop()
+
+        def sink(envelope):
+            if self.clients:
+                loop.call_soon_threadsafe(self.send_envelope, source, envelope)
 
-        if self.clients:
-            await asyncio.gather(
-                *[client.send(message) for client in self.clients],
-                return_exceptions=True
-            )
+        return sink
 
     async def subscriber(self, event):
         """Subscriber callback matching EventBus signature."""
-        await self.broadcast(event["type"], event["payload"])
+        await self.broadcast_event(event)
@@ -17,6 +17,18 @@ const CONFIG = {
     ws: { url: 'ws://localhost:8765', reconnectInterval: 5000 }
 };
 
+// Brain events this renderer reacts to (wildcards allowed); everything else is never sent
+const WS_TOPICS = [
+    'AUDIO_ENVELOPE',
+    'WAKE_WORD_DETECTED',
+    'PARTIAL_TRANSCRIPT',
+    'INTERRUPT_SIGNAL',
+    'DECISION',
+    'EXECUTION_*',
+    'CONFIRMATION_*',
+    'PERMISSION_DENIED'
+];
+
 // ====================================================================
 // ENGINE STATE — single source of truth
 // ====================================================================
@@ -161,11 +173,19 @@ function connectWebSocket() {
 
         window.socket = new WebSocket(CONFIG.ws.url);
         socket = window.socket; // Sync local reference
+        socket.binaryType = 'arraybuffer'; // Audio envelopes arrive as binary frames
 
-        socket.onopen = () => console.log('[JARVIS] WebSocket connected');
+        socket.onopen = () => {
+            console.log('[JARVIS] WebSocket connected');
+            socket.send(JSON.stringify({ type: 'SUBSCRIBE', topics: WS_TOPICS, replace: true }));
+        };
 
         socket.onmessage = (event) => {
             if (isShuttingDown) return;
+            if (event.data instanceof ArrayBuffer) {
+                handleEnvelopeFrame(event.data);
+                return;
+            }
             try {
                 const data = JSON.parse(event.data);
 
@@ -321,6 +341,22 @@ function connectWebSocket() {
     }
 }
 
+// Binary audio-envelope frame: "ENV" + source byte, then float32 RMS values
+// (10ms windows). Source 0 = microphone, 1 = TTS playback.
+function handleEnvelopeFrame(buffer) {
+    if (buffer.byteLength < 8) return;
+    const header = new Uint8Array(buffer, 0, 4);
+    if (header[0] !== 0x45 || header[1] !== 0x4E || header[2] !== 0x56) return;
+
+    const envelope = new Float32Array(buffer, 4, (buffer.byteLength - 4) >> 2);
+    let peak = 0;
+    for (let i = 0; i < envelope.length; i++) {
+        if (envelope[i] > peak) peak = envelope[i];
+    }
+    // Mic RMS sits far below TTS pulses; boost it so speech visibly moves the sphere
+    stateManager.setAudio(header[3] === 0 ? peak * 8.0 : peak);
+}
+
 function scheduleReconnect() {
     if (reconnectTimer) clearTimeout(reconnectTimer);
     if (isShuttingDown) return;
@@ -0,0 +1,158 @@
+"""
+Replay recorded sessions / WAV files through the real voice pipeline and report
+end-to-end timings: wake -> endpoint -> final transcript -> decision -> action.
+
+Record a session:  set JARVIS_RECORD_DIR=recordings, then run the brain as usual
+                   (wake-word detections are stored as labels in the session file)
+WAV corpus:        <clip>.wav + optional <clip>.labels.json {"wake": [sec], "text": ["..."]}
+
+Usage: python replay_voice.py [--speed X] [--no-execute] <session.jsess.gz | clip.wav> ...
+       --speed 1 (default) replays in real time, --speed 0 as fast as possible
+       (wall-clock timers such as the session window are not scaled with --speed)
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from brain.input.replay import ReplayStreamHandler, LabelledWakeEngine  # type: ignore
+from brain.input.voice_pipeline import VoicePipeline, IDLE  # type: ignore
+from brain.tracing import tracer  # type: ignore
+
+STAGES = ("wake", "endpoint", "transcript", "decision", "action")
+ACTION_EVENTS = {"EXECUTION_SUCCESS", "EXECUTION_FAILURE", "LLM_RESPONSE", "CONFIRMATION_REQUIRED",
+                 "PERMISSION_DENIED", "REGISTRY_ERROR"}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+class TimingCollector:
+    """Bus subscriber that stamps each stage of every utterance."""
+
+    def __init__(self):
+        self.turns = []
+
+    async def handle_event(self, event):
+        if event.type == "WAKE_WORD_DETECTED":
+            self.turns.append({"wake": event.monotonic, "word": event.payload.get("word")})
+            return
+        if not self.turns:
+            return
+        turn = self.turns[-1]
+        if event.type == "ENDPOINT" and "endpoint" not in turn:
+            turn["endpoint"] = event.monotonic
+            turn["cause"] = event.payload.get("cause")
+        elif event.type == "SPEAKER_REJECTED" and "endpoint" not in turn:
+            turn["endpoint"] = event.monotonic
+            turn["cause"] = "rejected"
+        elif event.type == "FINAL_TRANSCRIPT" and "transcript" not in turn:
+            turn["transcript"] = event.monotonic
+            turn["text"] = event.payload.get("text", "")
+        elif event.type == "DECISION" and "decision" not in turn:
+            turn["decision"] = event.monotonic
+            turn["action_name"] = event.payload.get("skill") or event.payload.get("action")
+        elif event.type in ACTION_EVENTS and "action" not in turn:
+            turn["action"] = event.monotonic
+
+    def report(self, expected):
+        print("\n" + "-" * 108)
+        print(f"{'#':>2} {'heard':<34} {'end':<10}" + "".join(f"{s + ' ms':>14}" for s in STAGES[1:]) + f"{'total':>10}")
+        print("-" * 108)
+        gaps = {s: [] for s in STAGES[1:]}
+        totals = []
+        expected = iter(expected)  # One per labelled wake; session follow-ups have no label
+        for i, turn in enumerate(self.turns):
+            cells = []
+            previous = turn["wake"]
+            for stage in STAGES[1:]:
+                if stage in turn:
+                    gap = (turn[stage] - previous) * 1000.0
+                    gaps[stage].append(gap)
+                    cells.append(f"{gap:14.0f}")
+                    previous = turn[stage]
+                else:
+                    cells.append(f"{'-':>14}")
+            last = max(turn.get(s, turn["wake"]) for s in STAGES)
+            totals.append((last - turn["wake"]) * 1000.0)
+            heard = turn.get("text", "")[:32]
+            print(f"{i:>2} {heard:<34} {str(turn.get('cause', '-')):<10}" + "".join(cells) + f"{totals[-1]:10.0f}")
+            want = next(expected, "") if turn["word"] != "session" else ""
+            if want and want.lower() not in heard.lower():
+                print(f"   expected: {want}")
+        print("-" * 108)
+        for stage, values in gaps.items():
+            if values:
+                print(f"{stage:<11} p50 {percentile(values, 50):7.0f}ms  p90 {percentile(values, 90):7.0f}ms  "
+                      f"n={len(values)}")
+        if totals:
+            print(f"{'total':<11} p50 {percentile(totals, 50):7.0f}ms  p90 {percentile(totals, 90):7.0f}ms  "
+                  f"n={len(totals)}")
+
+
+class DryRunOrchestrator:
+    """Arbitration only: emits DECISION without executing skills or calling the LLM."""
+
+    def __init__(self):
+        from brain.event_bus import EventBus  # type: ignore
+        from brain.skill_registry import SkillRegistry  # type: ignore
+        from brain.arbitration_engine import ArbitrationEngine  # type: ignore
+        self.bus = EventBus()
+        self.skill_registry = SkillRegistry()
+        self.arbitration = ArbitrationEngine(self.skill_registry)
+
+    async def handle_input(self, text, context):
+        from brain.events import DecisionEvent  # type: ignore
+        decision = self.arbitration.evaluate(text, context, verbose=False)
+        await self.bus.emit(DecisionEvent(text, decision))
+        return decision
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+")
+    parser.add_argument("--speed", type=float, default=1.0, help="multiple of real time, 0 = max speed")
+    parser.add_argument("--no-execute", action="store_true", help="stop at the decision (no skills / LLM)")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace (Perfetto) of every span")
+    args = parser.parse_args()
+
+    if args.no_execute:
+        orchestrator = DryRunOrchestrator()
+    else:
+        from brain.orchestrator import Orchestrator  # type: ignore
+        orchestrator = Orchestrator()  # WebSocket server not started: nothing to display to
+    collector = TimingCollector()
+    orchestrator.bus.subscribe(collector.handle_event)
+
+    stream = ReplayStreamHandler(args.sources, speed=args.speed)
+    wake = LabelledWakeEngine(stream.wake_positions, stream.wake_reader)
+    pipeline = VoicePipeline(orchestrator, stream=stream, wake_detector=wake)
+    expected = [l.get("text", "") for l in stream.labels if l.get("label") == "wake"]
+
+    started = time.perf_counter()
+    runner = asyncio.create_task(pipeline.run())
+    while not (stream.finished.is_set() and pipeline.state == IDLE):
+        await asyncio.sleep(0.05)
+        if runner.done():
+            runner.result()  # Surface a crash
+    elapsed = time.perf_counter() - started
+    runner.cancel()
+    pipeline.stop()
+
+    print(f"\nReplayed {stream.duration:.1f}s of audio in {elapsed:.1f}s "
+          f"({stream.duration / elapsed:.1f}x real time)")
+    print(f"Wake labels: {wake.stats()}")
+    collector.report(expected)
+    if args.trace:
+        tracer.export_chrome_trace(args.trace)
+    print(f"\nStage spans: {tracer.summary()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,3 +11,11 @@ class BaseSkill(ABC):
     @abstractmethod
     async def execute(self, text: str, context: dict):
         pass
+
+    def prepare(self, text: str, context: dict):
+        """
+        Optional speculative warm-up, called from a worker thread on a partial
+        transcript that already resolves to this skill. Must be side-effect free
+        (resolve paths, warm caches); execute() still runs only on the final text.
+        """
+        return None
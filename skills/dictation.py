@@ -13,6 +13,66 @@ import time
 _last_dictated = ""
 
 
+def type_text(content):
+    """Type `content` at the cursor (clipboard paste for Unicode). Blocking."""
+    global _last_dictated
+    pyperclip.copy(content)
+    pyautogui.hotkey('ctrl', 'v')
+    _last_dictated = content.strip()
+
+
+class LiveDictationTyper:
+    """
+    Keeps the text typed at the cursor equal to the latest dictation hypothesis.
+
+    Each update() diffs the new hypothesis against what is already on screen and
+    sends only the changed suffix: backspaces over the part that changed, then the
+    new characters, as one pyautogui.write() key sequence. commit() marks the
+    current text final (end of a segment) so later diffs never touch it and the
+    typed state stays small for arbitrarily long sessions.
+    """
+
+    def __init__(self):
+        self.typed = ""  # Uncommitted text currently on screen
+        self.keystrokes = 0
+        self.updates = 0
+
+    @staticmethod
+    def diff(old, new):
+        """(backspaces, insert) turning `old` into `new` by editing the shortest suffix."""
+        k = 0
+        limit = min(len(old), len(new))
+        while k < limit and old[k] == new[k]:
+            k += 1
+        return len(old) - k, new[k:]
+
+    def update(self, text):
+        """Make the uncommitted screen text equal `text`. Returns keystrokes sent."""
+        backspaces, insert = self.diff(self.typed, text)
+        if not backspaces and not insert:
+            return 0
+        keys = ["backspace"] * backspaces
+        if insert.isascii() and insert.isprintable():
+            pyautogui.write(keys + list(insert), interval=0)
+        else:
+            # pyautogui can't type non-ASCII: paste the inserted part instead
+            if keys:
+                pyautogui.write(keys, interval=0)
+            pyperclip.copy(insert)
+            pyautogui.hotkey('ctrl', 'v')
+        self.typed = text
+        self.updates += 1
+        self.keystrokes += backspaces + len(insert)
+        return backspaces + len(insert)
+
+    def commit(self):
+        """The text on screen is final: later updates start after it."""
+        global _last_dictated
+        if self.typed.strip():
+            _last_dictated = self.typed.strip()
+        self.typed = ""
+
+
 class DictationSkill(BaseSkill):
     name = "dictation"
     keywords = {
@@ -47,9 +107,8 @@ class DictationSkill(BaseSkill):
         if clean.startswith("correct"):
             target = clean.replace("correct that", "").replace("correct ", "").strip()
             if not target and _last_dictated:
-                # Select last dictated text
-                for _ in range(len(_last_dictated)):
-                    pyautogui.press('backspace')
+                # Erase the last dictated text in one batched key sequence
+                pyautogui.write(['backspace'] * len(_last_dictated), interval=0)
                 return f"Cleared '{_last_dictated}'. Speak the correction."
             return "Nothing to correct."
 
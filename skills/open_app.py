@@ -1,6 +1,8 @@
 from .base_skill import BaseSkill  # type: ignore
 import subprocess
 import webbrowser
+import shutil
+import sys
 import re
 
 
@@ -68,6 +70,37 @@ PROCESS_MAP = {
 }
 
 
+def resolve_executable(mapped):
+    """Full path for an app name via PATH or the Windows 'App Paths' registry, else None."""
+    path = shutil.which(mapped)
+    if path or sys.platform != "win32":
+        return path
+    try:
+        import winreg  # type: ignore
+        exe = mapped if mapped.lower().endswith(".exe") else mapped + ".exe"
+        key_path = rf"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\{exe}"
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, key_path) as key:
+                    return winreg.QueryValue(key, None).strip('"')
+            except OSError:
+                continue
+    except ImportError:
+        pass
+    return None
+
+
+def _launch_detached(path):
+    """Start `path` without a console/stdio tie to the brain process."""
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL,
+              "stderr": subprocess.DEVNULL, "close_fds": True}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP  # type: ignore
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen([path], **kwargs)
+
+
 class OpenAppSkill(BaseSkill):
     name = "open_app"
     keywords = {
@@ -81,7 +114,31 @@ class OpenAppSkill(BaseSkill):
     ]
     dangerous = False
 
+    def __init__(self):
+        self._resolved = {}  # mapped app name -> executable path (or None)
+
+    def prepare(self, text: str, context: dict):
+        """Resolve the executable while the user is still talking."""
+        is_close, target = self._parse(text)
+        mapped = APP_MAP.get(target, target)
+        if is_close or not target or mapped.startswith("http") or mapped.startswith("ms-"):
+            return None
+        return self._resolve(mapped)
+
+    def _resolve(self, mapped):
+        if mapped not in self._resolved:
+            self._resolved[mapped] = resolve_executable(mapped)
+        return self._resolved[mapped]
+
     async def execute(self, text: str, context: dict):
+        is_close, target = self._parse(text)
+
+        if is_close:
+            return self._close_app(target)
+        else:
+            return self._open_app(target)
+
+    def _parse(self, text: str):
         clean = text.lower().strip()
         clean = re.sub(r'[^\w\s]', '', clean)
 
@@ -99,12 +156,7 @@ class OpenAppSkill(BaseSkill):
                     clean = clean[len(prefix):]
                     break
 
-        target = clean.strip()
-
-        if is_close:
-            return self._close_app(target)
-        else:
-            return self._open_app(target)
+        return is_close, clean.strip()
 
     def _open_app(self, target: str) -> str:
         mapped = APP_MAP.get(target, target)
@@ -114,7 +166,14 @@ class OpenAppSkill(BaseSkill):
             webbrowser.open(mapped)
             return f"Opening {target}."
         else:
-            subprocess.Popen(f'start "" "{mapped}"', shell=True)
+            path = self._resolve(mapped)
+            if path and path.lower().endswith(".exe"):
+                # Resolved (often speculatively, during the partial): skip the shell,
+                # but detach like `start` does so the app doesn't share our console
+                _launch_detached(path)
+            else:
+                # .cmd/.bat shims and unresolved names keep the shell's `start` semantics
+                subprocess.Popen(f'start "" "{path or mapped}"', shell=True)
             return f"Launching {target}."
 
     def _close_app(self, target: str) -> str: